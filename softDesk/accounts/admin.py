@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Contributor
+from .models import User, Contributor, PrivacyJob
 
 
 @admin.register(User)
@@ -15,4 +15,13 @@ class CustomUserAdmin(UserAdmin):
 @admin.register(Contributor)
 class ContributorAdmin(admin.ModelAdmin):
     list_display = ('user', 'project')
+    # Contributor.__str__ reads user.username and project.name
+    list_select_related = ('user', 'project')
     list_filter = ('project',)
+
+
+@admin.register(PrivacyJob)
+class PrivacyJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'user', 'processed', 'total', 'created_time')
+    list_select_related = ('user',)
+    list_filter = ('kind', 'status')
@@ -1,11 +1,16 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import authenticate
+from softDesk import metrics
+from softDesk.throttling import LoginRateThrottle, RegisterRateThrottle
+from .backends import touch_last_login
+from .gdpr import age_gate
 from .serializers import UserSerializer
 
 
@@ -15,6 +20,9 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
         
+        # SIMPLE_JWT['UPDATE_LAST_LOGIN'] is off: bursts of logins are coalesced
+        touch_last_login(self.user)
+        
         # Add user data to the response
         data['user'] = {
             'id': self.user.id,
@@ -30,12 +38,31 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 class CustomTokenObtainPairView(TokenObtainPairView):
     """Custom JWT login view"""
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = [LoginRateThrottle]
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    """JWT refresh view counting refreshes and rotation blacklists"""
+
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            metrics.JWT_REFRESH.inc()
+            if jwt_settings.ROTATE_REFRESH_TOKENS and jwt_settings.BLACKLIST_AFTER_ROTATION:
+                metrics.JWT_BLACKLIST.inc(reason='rotation')
+        return response
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterRateThrottle])
 def register_view(request):
     """Register a new user and return JWT tokens"""
+    # GDPR age check on the body parsed once by DRF, reused by the serializer
+    error = age_gate(request.data)
+    if error is not None:
+        return error
+
     serializer = UserSerializer(data=request.data)
     
     if serializer.is_valid():
@@ -71,6 +98,7 @@ def logout_view(request):
         if refresh_token:
             token = RefreshToken(refresh_token)
             token.blacklist()
+            metrics.JWT_BLACKLIST.inc(reason='logout')
             return Response({'message': 'Successfully logged out'}, status=status.HTTP_200_OK)
         else:
             # If no valid refresh token is provided, still return a success
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+UserModel = get_user_model()
+
+
+def touch_last_login(user):
+    """
+    Update ``last_login`` at most once per ``LAST_LOGIN_UPDATE_INTERVAL`` seconds.
+
+    Bursts of logins from the same account are coalesced into a single UPDATE
+    touching only the ``last_login`` column.
+    """
+    now = timezone.now()
+    interval = timedelta(seconds=getattr(settings, 'LAST_LOGIN_UPDATE_INTERVAL', 0))
+    if user.last_login is not None and now - user.last_login < interval:
+        return False
+    UserModel._default_manager.filter(pk=user.pk).update(last_login=now)
+    user.last_login = now
+    return True
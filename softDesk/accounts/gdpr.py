@@ -0,0 +1,30 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+
+MINIMUM_AGE = 15
+MINIMUM_AGE_MESSAGE = "Minimum age required is 15 years for GDPR compliance reasons."
+
+
+def age_gate(data):
+    """
+    Reject registrations below the GDPR minimum age before any other validation.
+
+    Works on the body already parsed by DRF (``request.data``) so the payload is
+    only decoded once, whatever its content type. Returns an error Response, or
+    None when registration may proceed; malformed ages are left to UserSerializer.
+    """
+    age = data.get('age')
+    if age in (None, ''):
+        return None
+    try:
+        age = int(age)
+    except (TypeError, ValueError):
+        return None
+
+    if age < MINIMUM_AGE:
+        return Response({
+            'error': 'RGPD Compliance Error',
+            'detail': MINIMUM_AGE_MESSAGE,
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return None
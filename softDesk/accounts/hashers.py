@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher whose iteration count comes from ``PASSWORD_PBKDF2_ITERATIONS``.
+
+    Keeps the ``pbkdf2_sha256`` algorithm name, so existing hashes still verify
+    and are re-encoded with the configured iterations on the next login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,38 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import privacy
+
+
+class Command(BaseCommand):
+    help = "Run pending GDPR erasure and data export jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Keep polling for new jobs instead of exiting when the queue is empty",
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help="Seconds to wait between polls with --loop",
+        )
+        parser.add_argument('--batch-size', type=int, help="Rows handled per transaction")
+
+    def handle(self, *args, **options):
+        if not apps.is_installed('django.contrib.admin'):
+            # Erasures delete users, which must cascade to their admin log entries
+            raise CommandError(
+                "process_privacy_jobs needs the admin app: run it with DJANGO_SETTINGS_MODULE=softDesk.settings."
+            )
+        while True:
+            job = privacy.claim_next()
+            if job is None:
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+                continue
+            privacy.run(job, options['batch_size'])
+            style = self.style.SUCCESS if job.status == 'DONE' else self.style.ERROR
+            self.stdout.write(style(f"{job.kind} job {job.pk}: {job.status} ({job.processed}/{job.total} rows)"))
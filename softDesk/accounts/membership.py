@@ -0,0 +1,63 @@
+"""
+Single write path for project memberships.
+
+Every addition or removal of contributors, one at a time or in bulk, goes
+through these functions so that validation, the ``unique_together`` guard
+and the invalidation of the request-scoped membership cache stay in one place.
+Contributor counts are annotated at read time and need no maintenance.
+"""
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Contributor, User
+from .permissions import forget_memberships
+
+
+def check_users(project, user_ids):
+    """
+    Split user IDs into (new, already contributors, unknown) with one query
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    rows = dict(
+        User.objects.filter(pk__in=user_ids).annotate(
+            is_contributor=Exists(Contributor.objects.filter(project=project, user_id=OuterRef('pk')))
+        ).values_list('pk', 'is_contributor')
+    )
+    new = [pk for pk in user_ids if rows.get(pk) is False]
+    existing = [pk for pk in user_ids if rows.get(pk) is True]
+    unknown = [pk for pk in user_ids if pk not in rows]
+    return new, existing, unknown
+
+
+def add_contributors(request, project, user_ids):
+    """Add known users as contributors, ignoring those who already are; returns the IDs actually added"""
+    if not user_ids:
+        return []
+    with transaction.atomic(savepoint=False):
+        if connection.features.has_select_for_update:
+            # Serialize the membership writes of the project, so the rows
+            # found below are exactly those this call does not insert
+            list(type(project).objects.select_for_update().filter(pk=project.pk).values_list('pk'))
+        # A concurrent request may have added some of them since check_users()
+        existing = set(Contributor.objects.filter(project=project, user_id__in=user_ids).values_list('user_id', flat=True))
+        added = [pk for pk in user_ids if pk not in existing]
+        Contributor.objects.bulk_create(
+            [Contributor(project=project, user_id=pk, role='CONTRIBUTOR') for pk in added],
+            batch_size=500,
+            # Without row locks (SQLite), a conflicting insert is still skipped
+            ignore_conflicts=True,
+        )
+    forget_memberships(request, project.pk)
+    return added
+
+
+def remove_contributors(request, project, user_ids):
+    """Remove contributors, never the project author; returns the removed user IDs"""
+    if not user_ids:
+        return []
+    with transaction.atomic():
+        removable = Contributor.objects.filter(project=project, user_id__in=user_ids).exclude(role='AUTHOR')
+        removed = list(removable.values_list('user_id', flat=True))
+        Contributor.objects.filter(project=project, user_id__in=removed).delete()
+    forget_memberships(request, project.pk)
+    return removed
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_user_username_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='privacyjob',
+            name='claimed_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
 
 
 class User(AbstractUser):
@@ -8,6 +10,13 @@ class User(AbstractUser):
     can_be_contacted = models.BooleanField(default=False)
     can_data_be_shared = models.BooleanField(default=False)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive username prefix search of the user directory;
+            # the id breaks ties between case variants ("Bob" and "bob")
+            models.Index(Lower('username'), F('id'), name='user_username_lower_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -29,3 +38,49 @@ class Contributor(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.project.name} ({self.role})"
+
+
+class PrivacyJob(models.Model):
+    """GDPR erasure or personal data export, processed in batches by a worker"""
+    KIND_CHOICES = [
+        ('EXPORT', 'Export'),
+        ('ERASURE', 'Erasure'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    # Kept (as NULL) once an erasure has deleted the user
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='privacy_jobs')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    file_name = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    # Set when a worker claims the job and refreshed after every batch; running
+    # jobs left without heartbeat for PRIVACY_JOB_CLAIM_TIMEOUT are taken over
+    claimed_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_time']
+        indexes = [
+            models.Index(fields=['status', 'created_time'], name='privacy_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def progress(self):
+        """Completion percentage"""
+        if self.status == 'DONE':
+            return 100
+        if not self.total:
+            return 0
+        return min(99, self.processed * 100 // self.total)
@@ -1,8 +1,42 @@
 from rest_framework import permissions
 from django.shortcuts import get_object_or_404
+from softDesk import metrics
 from .models import Contributor
 
 
+def is_project_contributor(request, project_id, user=None):
+    """
+    Check that a user (the request user by default) contributes to a project.
+    
+    Results are cached on the underlying HttpRequest for its lifetime, so
+    repeated permission checks of one request, and the sub-requests of a
+    batch which share their parent's cache, hit the database once per pair.
+    """
+    user = user or request.user
+    http_request = getattr(request, '_request', request)
+    cache = getattr(http_request, '_membership_cache', None)
+    if cache is None:
+        cache = http_request._membership_cache = {}
+    
+    key = (getattr(user, 'pk', user), int(project_id))
+    if key in cache:
+        metrics.record_cache('membership', hit=True)
+        return cache[key]
+    
+    metrics.record_cache('membership', hit=False)
+    cache[key] = Contributor.objects.filter(project_id=key[1], user_id=key[0]).exists()
+    return cache[key]
+
+
+def forget_memberships(request, project_id):
+    """Drop the cached membership checks of a project after its contributors changed"""
+    http_request = getattr(request, '_request', request)
+    cache = getattr(http_request, '_membership_cache', None)
+    if cache:
+        for key in [key for key in cache if key[1] == int(project_id)]:
+            del cache[key]
+
+
 class IsAuthorOrReadOnly(permissions.BasePermission):
     """
     Custom permission that only allows authors of an object to edit it.
@@ -45,10 +79,7 @@ class IsProjectContributor(permissions.BasePermission):
         # For actions that require a project_pk
         project_id = view.kwargs.get('project_pk')
         if project_id:
-            return Contributor.objects.filter(
-                project_id=project_id,
-                user=request.user
-            ).exists()
+            return is_project_contributor(request, project_id)
         
         return True
 
@@ -62,10 +93,7 @@ class IsProjectContributor(permissions.BasePermission):
             # If the object is a Project
             project = obj
 
-        return Contributor.objects.filter(
-            project=project,
-            user=request.user
-        ).exists()
+        return is_project_contributor(request, project.pk)
 
 
 class IsProjectAuthorForContributors(permissions.BasePermission):
@@ -79,6 +107,10 @@ class IsProjectAuthorForContributors(permissions.BasePermission):
         
         project_id = view.kwargs.get('project_pk')
         if project_id:
+            if hasattr(view, 'get_project'):
+                # Reuse the project the view fetches anyway
+                project = view.get_project()
+                return project is not None and project.author_id == request.user.pk
             from projects.models import Project
             try:
                 project = Project.objects.get(id=project_id)
@@ -109,10 +141,7 @@ class CanAssignToProjectContributors(permissions.BasePermission):
             
             if assigned_to_id and project_id:
                 # Check that the assigned user is a project contributor
-                return Contributor.objects.filter(
-                    project_id=project_id,
-                    user_id=assigned_to_id
-                ).exists()
+                return is_project_contributor(request, project_id, user=int(assigned_to_id))
         
         return True
 
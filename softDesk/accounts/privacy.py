@@ -0,0 +1,238 @@
+"""
+Right-to-erasure and personal data export jobs.
+
+Both run off the request path: the API only records a PrivacyJob, which the
+``process_privacy_jobs`` command picks up. Work is done in batches of
+``PRIVACY_JOB_BATCH_SIZE`` rows, each batch in its own short transaction, and
+the job's ``processed`` counter is saved after every batch so that clients can
+poll its progress and a heavy user never holds locks for long.
+"""
+import json
+import logging
+import os
+from collections import Counter
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Contributor, PrivacyJob, User
+
+logger = logging.getLogger(__name__)
+
+USER_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'age',
+    'can_be_contacted', 'can_data_be_shared', 'date_joined', 'last_login',
+)
+
+
+def schedule(user, kind):
+    """Record a job for the worker, reusing a pending or running one of the same kind"""
+    job = PrivacyJob.objects.filter(user=user, kind=kind, status__in=['PENDING', 'RUNNING']).first()
+    if job is None:
+        job = PrivacyJob.objects.create(user=user, kind=kind)
+    return job
+
+
+def claimable(now):
+    """Pending jobs, and running jobs whose worker stopped sending heartbeats"""
+    expired = now - timedelta(seconds=settings.PRIVACY_JOB_CLAIM_TIMEOUT)
+    return PrivacyJob.objects.filter(
+        Q(status='PENDING')
+        | Q(status='RUNNING') & (Q(claimed_time__isnull=True) | Q(claimed_time__lte=expired))
+    )
+
+
+def claim_next(now=None):
+    """Mark the oldest claimable job as running and return it, or None"""
+    now = now or timezone.now()
+    for job in claimable(now).order_by('created_time')[:5]:
+        # Conditional update so concurrent workers never claim the same job
+        if claimable(now).filter(pk=job.pk).update(status='RUNNING', claimed_time=now, processed=0):
+            if job.status == 'RUNNING':
+                logger.warning("Taking over privacy job %s from a stopped worker", job.pk)
+            job.status, job.claimed_time, job.processed = 'RUNNING', now, 0
+            return job
+    return None
+
+
+def run(job, batch_size=None):
+    """Process a claimed job to completion, recording failures on the job"""
+    batch_size = batch_size or settings.PRIVACY_JOB_BATCH_SIZE
+    try:
+        if job.kind == 'ERASURE':
+            erase(job, batch_size)
+        else:
+            export(job, batch_size)
+    except Exception as exc:
+        logger.exception("Privacy job %s failed", job.pk)
+        job.status = 'FAILED'
+        job.error = str(exc)
+        job.save(update_fields=['status', 'error', 'updated_time'])
+        return job
+    job.status = 'DONE'
+    job.processed = job.total
+    job.save(update_fields=['status', 'processed', 'updated_time'])
+    return job
+
+
+def _report(job, count):
+    # Also the heartbeat keeping the job claimed by this worker
+    job.processed += count
+    job.claimed_time = timezone.now()
+    job.save(update_fields=['processed', 'claimed_time', 'updated_time'])
+
+
+# Erasure
+
+def erasure_steps(user):
+    """
+    Querysets removing everything owned by a user, leaves first, so that
+    deleting one batch never cascades to an unbounded number of rows.
+    Each step is (queryset, action) where action is 'delete' or 'unassign'.
+    """
+    # Import here to avoid circular imports
+    from projects.models import ArchivedComment, ArchivedIssue, Comment, Issue, Notification, Project
+
+    owned_issues = Q(author=user) | Q(project__author=user)
+    return [
+        (Notification.objects.filter(recipient=user), 'delete'),
+        (ArchivedComment.objects.filter(
+            Q(author=user) | Q(issue__author=user) | Q(issue__project__author=user)
+        ), 'delete'),
+        (ArchivedIssue.objects.filter(owned_issues), 'delete'),
+        (Comment.objects.filter(
+            Q(author=user) | Q(issue__author=user) | Q(issue__project__author=user)
+        ), 'delete'),
+        (Issue.objects.filter(owned_issues), 'delete'),
+        (Issue.objects.filter(assignee=user).exclude(owned_issues), 'unassign'),
+        (Contributor.objects.filter(Q(user=user) | Q(project__author=user)), 'delete'),
+        (Project.objects.filter(author=user), 'delete'),
+    ]
+
+
+def erase(job, batch_size):
+    user = job.user
+    if user is None:
+        return
+    steps = erasure_steps(user)
+    job.total = sum(queryset.count() for queryset, _ in steps) + 1
+    job.save(update_fields=['total', 'updated_time'])
+
+    for queryset, action in steps:
+        while True:
+            with transaction.atomic():
+                count = _erase_batch(queryset, action, batch_size)
+            if not count:
+                break
+            _report(job, count)
+
+    # Only the user row and its few remaining dependents are left
+    user.delete()
+    job.user = None
+    _report(job, 1)
+
+
+def _erase_batch(queryset, action, batch_size):
+    # Import here to avoid circular imports
+    from projects import history, stats, threads
+    from projects.models import ArchivedComment, Comment, Issue
+
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+    if not pks:
+        return 0
+    batch = queryset.model.objects.filter(pk__in=pks)
+    if queryset.model in (Comment, ArchivedComment):
+        # Replies, possibly by other users, are kept and move up one level.
+        # The bulk delete bypasses Comment.delete(): recount the threads the
+        # erased comments belonged to
+        for pk in set(queryset.model.objects.filter(parent_id__in=pks).values_list('parent_id', flat=True)):
+            threads.detach(queryset.model, pk)
+        thread_ids = set(batch.exclude(thread=None).values_list('thread_id', flat=True))
+        batch.delete()
+        threads.rebuild(queryset.model, thread_ids)
+        return len(pks)
+    if queryset.model is not Issue:
+        batch.delete()
+        return len(pks)
+
+    # Bulk changes bypass Issue.save()/delete(): keep the statistics and
+    # the history in step
+    deltas = Counter()
+    rows = list(batch.values_list('pk', *stats.BUCKET_FIELDS))
+    for pk, *bucket in rows:
+        deltas[tuple(bucket)] -= 1
+        if action == 'unassign':
+            deltas[(bucket[0], None, *bucket[2:])] += 1
+    if action == 'unassign':
+        batch.update(assignee=None)
+        history.record_bulk([(pk, project_id) for pk, project_id, *_ in rows], {'assignee_id': None})
+    else:
+        batch.delete()
+    stats.bump_many(deltas)
+    return len(pks)
+
+
+# Export
+
+def export_path(job):
+    return os.path.join(settings.PRIVACY_EXPORT_DIR, job.file_name)
+
+
+def export_sections(user):
+    """(name, queryset of dicts) pairs making up the personal data of a user"""
+    # Import here to avoid circular imports
+    from projects.models import ArchivedComment, ArchivedIssue, Comment, Issue, Project
+
+    return [
+        ('projects', Project.objects.filter(author=user).order_by('pk').values(
+            'id', 'name', 'description', 'type', 'created_time')),
+        ('contributions', Contributor.objects.filter(user=user).order_by('pk').values(
+            'project_id', 'role')),
+        ('issues', Issue.objects.filter(author=user).order_by('pk').values(
+            'id', 'project_id', 'title', 'description', 'tag', 'priority', 'status', 'assignee_id', 'created_time')),
+        ('assigned_issues', Issue.objects.filter(assignee=user).order_by('pk').values_list('id', flat=True)),
+        ('comments', Comment.objects.filter(author=user).order_by('pk').values(
+            'id', 'issue_id', 'parent_id', 'description', 'created_time')),
+        ('archived_issues', ArchivedIssue.objects.filter(author=user).order_by('pk').values(
+            'id', 'project_id', 'title', 'description', 'tag', 'priority', 'status', 'assignee_id', 'created_time')),
+        ('archived_comments', ArchivedComment.objects.filter(author=user).order_by('pk').values(
+            'id', 'issue_id', 'parent_id', 'description', 'created_time')),
+    ]
+
+
+def export(job, batch_size):
+    """Stream the personal data of a user to a JSON file, one batch of rows at a time"""
+    user = job.user
+    sections = export_sections(user)
+    job.total = sum(queryset.count() for _, queryset in sections) + 1
+    if job.file_name:
+        # Partial file of a worker that stopped before finishing the job
+        with suppress(FileNotFoundError):
+            os.remove(export_path(job))
+    job.file_name = f"export-{job.pk}-{timezone.now():%Y%m%d%H%M%S}.json"
+    job.save(update_fields=['total', 'file_name', 'updated_time'])
+
+    os.makedirs(settings.PRIVACY_EXPORT_DIR, exist_ok=True)
+    encoder = DjangoJSONEncoder()
+    with open(export_path(job), 'w', encoding='utf-8') as output:
+        profile = User.objects.filter(pk=user.pk).values(*USER_FIELDS).get()
+        output.write('{"user": ' + encoder.encode(profile))
+        _report(job, 1)
+
+        for name, queryset in sections:
+            output.write(f', {json.dumps(name)}: [')
+            written = 0
+            for row in queryset.iterator(chunk_size=batch_size):
+                output.write((', ' if written else '') + encoder.encode(row))
+                written += 1
+                if written % batch_size == 0:
+                    _report(job, batch_size)
+            output.write(']')
+            if written % batch_size:
+                _report(job, written % batch_size)
+        output.write('}\n')
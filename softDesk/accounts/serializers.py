@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from django.urls import reverse
 from django.contrib.auth.password_validation import validate_password
-from .models import User, Contributor
+from softDesk.fastserializers import ValuesSerializer
+from .gdpr import MINIMUM_AGE, MINIMUM_AGE_MESSAGE
+from .models import User, Contributor, PrivacyJob
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -31,8 +34,8 @@ class UserSerializer(serializers.ModelSerializer):
                     self.fields[field_name].required = False
     
     def validate_age(self, value):
-        if value is not None and value < 15:
-            raise serializers.ValidationError("Minimum age required is 15 years for GDPR compliance reasons.")
+        if value is not None and value < MINIMUM_AGE:
+            raise serializers.ValidationError(MINIMUM_AGE_MESSAGE)
         return value
     
     def validate_can_be_contacted(self, value):
@@ -57,11 +60,9 @@ class UserSerializer(serializers.ModelSerializer):
         return value
     
     def create(self, validated_data):
+        # create_user hashes the password, so it is hashed exactly once
         password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        return User.objects.create_user(password=password, **validated_data)
     
     def validate(self, data):
         """Global validation to check GDPR data consistency"""
@@ -123,11 +124,70 @@ class ContributorSerializer(serializers.ModelSerializer):
     def get_username(self, obj):
         return obj.user.username if obj.user else None
         
+    # Notes about the fields to help users understand
+    NOTES = {
+        "contributor_id": "Use this 'id' value when removing a contributor",
+        "user_id": "Use this 'user_id' value when assigning issues to this contributor"
+    }
+        
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        # Add notes about the fields to help users understand
-        representation['notes'] = {
-            "contributor_id": "Use this 'id' value when removing a contributor",
-            "user_id": "Use this 'user_id' value when assigning issues to this contributor"
-        }
+        representation['notes'] = dict(self.NOTES)
         return representation
+
+
+class ContributorListSerializer(ValuesSerializer):
+    """Fast-path list rendering of ContributorSerializer"""
+    model = Contributor
+    fields = [
+        ('id', 'id'), ('user', 'user__username'), ('username', 'user__username'),
+        ('project', 'project__name'), ('role', 'role'), ('user_id', 'user_id'),
+    ]
+    constants = {'notes': ContributorSerializer.NOTES}
+
+
+class ContributorBulkSerializer(serializers.Serializer):
+    """User IDs to add to and remove from a project"""
+    add = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list, max_length=1000)
+    remove = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list, max_length=1000)
+
+    def validate(self, data):
+        if not data['add'] and not data['remove']:
+            raise serializers.ValidationError("Provide user IDs to 'add' and/or 'remove'.")
+        return data
+
+
+class EmbeddedContributorSerializer(serializers.ModelSerializer):
+    """Compact contributor representation embedded with ?include=contributors"""
+    username = serializers.CharField(source='user.username', read_only=True)
+    
+    class Meta:
+        model = Contributor
+        fields = ['id', 'user_id', 'username', 'role']
+
+
+class UserDirectorySerializer(serializers.ModelSerializer):
+    """Minimal user representation for assignment pickers"""
+
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+
+
+class PrivacyJobSerializer(serializers.ModelSerializer):
+    """Status and progress of a GDPR erasure or export job"""
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PrivacyJob
+        fields = ['id', 'kind', 'status', 'total', 'processed', 'progress', 'error',
+                  'download_url', 'created_time', 'updated_time']
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.kind != 'EXPORT' or obj.status != 'DONE':
+            return None
+        path = reverse('accounts:privacy-job-download', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(path) if request else path
@@ -1,6 +1,5 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 from . import views
 from . import auth_views
 
@@ -9,13 +8,16 @@ app_name = 'accounts'
 # Router for main endpoints
 router = DefaultRouter()
 router.register(r'users', views.UserViewSet)
+router.register(r'privacy-jobs', views.PrivacyJobViewSet, basename='privacy-job')
 
 urlpatterns = [
+    # Before the router, whose users/<pk>/ route would capture it
+    path('users/directory/', views.UserDirectoryView.as_view(), name='user-directory'),
     path('', include(router.urls)),
     
     # JWT Authentication URLs
     path('auth/login/', auth_views.CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/refresh/', auth_views.CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('auth/register/', auth_views.register_view, name='register'),
     path('auth/logout/', auth_views.logout_view, name='logout'),
     
@@ -23,6 +25,9 @@ urlpatterns = [
     path('projects/<int:project_pk>/users/', 
          views.ContributorViewSet.as_view({'get': 'list', 'post': 'create'}), 
          name='project-contributors-list'),
+    path('projects/<int:project_pk>/users/bulk/', 
+         views.ContributorViewSet.as_view({'post': 'bulk'}), 
+         name='project-contributors-bulk'),
     path('projects/<int:project_pk>/users/<int:pk>/', 
          views.ContributorViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), 
          name='project-contributors-detail'),
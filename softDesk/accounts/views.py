@@ -1,11 +1,23 @@
-from rest_framework import viewsets, status
+from rest_framework import generics, viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from django.http import FileResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from .models import User, Contributor
-from .serializers import UserSerializer, ContributorSerializer
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, Value
+from django.db.models.functions import Lower
+from softDesk.fastserializers import FastListMixin
+from softDesk.pagination import UsernameCursorPagination
+from softDesk.throttling import RegisterRateThrottle
+from . import membership, privacy
+from .gdpr import age_gate
+from .models import User, Contributor, PrivacyJob
+from .serializers import (
+    UserSerializer, UserDirectorySerializer, ContributorSerializer, ContributorListSerializer,
+    ContributorBulkSerializer, PrivacyJobSerializer
+)
 from .permissions import IsOwnerOrReadOnly, IsProjectAuthorForContributors
 
 
@@ -17,22 +29,114 @@ class UserViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action == 'create':
             permission_classes = [AllowAny]
-        elif self.action in ['retrieve', 'update', 'partial_update', 'destroy']:
+        elif self.action in ['retrieve', 'update', 'partial_update', 'destroy', 'export']:
             permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
     
+    def get_throttles(self):
+        # POST /api/users/ is a registration endpoint too
+        if self.action == 'create':
+            return [RegisterRateThrottle()]
+        return super().get_throttles()
+    
     def get_queryset(self):
         # Users can see all other users (for assignment)
         # but can only modify their own profile (managed by IsOwnerOrReadOnly)
         return User.objects.all()
 
+    def create(self, request, *args, **kwargs):
+        # GDPR age check on the body parsed once by DRF, reused by the serializer
+        error = age_gate(request.data)
+        if error is not None:
+            return error
+        return super().create(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        # Deleting a heavy user cascades to all their projects, issues and
+        # comments: hand it to the erasure worker instead of doing it inline
+        job = privacy.schedule(self.get_object(), 'ERASURE')
+        return Response(
+            PrivacyJobSerializer(job, context=self.get_serializer_context()).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(detail=True, methods=['post'])
+    def export(self, request, pk=None):
+        """Schedule an export of the user's personal data"""
+        job = privacy.schedule(self.get_object(), 'EXPORT')
+        return Response(
+            PrivacyJobSerializer(job, context=self.get_serializer_context()).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class UserDirectoryView(generics.ListAPIView):
+    """
+    Type-ahead search of the users sharing a project with the caller.
+
+    ?search=<username prefix>  ?project=<id> to list one project's contributors
+    """
+    serializer_class = UserDirectorySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = UsernameCursorPagination
+
+    def get_queryset(self):
+        project_id = self.request.query_params.get('project')
+        projects = Contributor.objects.filter(user=self.request.user).values('project_id')
+        if project_id:
+            if not project_id.isdigit():
+                raise ValidationError({'project': "Must be a project ID."})
+            projects = projects.filter(project_id=int(project_id))
+
+        queryset = User.objects.annotate(username_lower=Lower('username')).only('id', 'username')
+        prefix = self.request.query_params.get('search', '').strip()
+        if not prefix:
+            # Bounded by the number of co-contributors, sorted in memory
+            return queryset.filter(
+                pk__in=Contributor.objects.filter(project_id__in=projects).values('user_id')
+            )
+
+        # A range on lower(username) walks user_username_lower_idx in order
+        # (SQLite's case-insensitive LIKE cannot use an index) and each
+        # candidate is checked against the (user, project) unique index,
+        # so a page stops after `limit` matches without any sort
+        return queryset.filter(
+            Exists(Contributor.objects.filter(user_id=OuterRef('pk'), project_id__in=projects)),
+            # Lower-cased by the database, whose LOWER() may differ from str.lower()
+            username_lower__gte=Lower(Value(prefix)),
+            username_lower__lt=Lower(Value(prefix + '\U0010ffff')),
+        )
+
+
+class PrivacyJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Progress of the GDPR jobs of the current user"""
+    serializer_class = PrivacyJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return PrivacyJob.objects.filter(user=self.request.user)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Stream a finished export file"""
+        job = self.get_object()
+        if job.kind != 'EXPORT' or job.status != 'DONE':
+            return Response({"detail": "Export is not ready."}, status=status.HTTP_409_CONFLICT)
+        try:
+            export = open(privacy.export_path(job), 'rb')
+        except FileNotFoundError:
+            # Cleaned up, or written to another volume: request a new export
+            return Response({"detail": "Export file is no longer available."}, status=status.HTTP_410_GONE)
+        return FileResponse(export, as_attachment=True, filename=job.file_name, content_type='application/json')
 
-class ContributorViewSet(viewsets.ModelViewSet):
+
+class ContributorViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for managing contributors"""
     queryset = Contributor.objects.all()
     serializer_class = ContributorSerializer
+    fast_serializer_class = ContributorListSerializer
     permission_classes = [IsAuthenticated, IsProjectAuthorForContributors]
     
     def get_queryset(self):
@@ -52,11 +156,18 @@ class ContributorViewSet(viewsets.ModelViewSet):
         ).distinct()
         return base_queryset.filter(project__in=user_projects)
     
+    def get_project(self):
+        """The project of the URL, fetched once per request"""
+        if not hasattr(self, '_project'):
+            # Import here to avoid circular imports
+            from projects.models import Project
+            self._project = Project.objects.filter(id=self.kwargs.get('project_pk')).first()
+        return self._project
+    
     def perform_create(self, serializer):
-        project_id = self.kwargs.get('project_pk')
-        # Import here to avoid circular imports
-        from projects.models import Project
-        project = get_object_or_404(Project, id=project_id)
+        project = self.get_project()
+        if project is None:
+            raise NotFound()
         
         # Explicit verification that the user is the project author
         if project.author != self.request.user:
@@ -64,38 +175,55 @@ class ContributorViewSet(viewsets.ModelViewSet):
         
         # user_id is now validated by the serializer
         user_id = serializer.validated_data.get('user_id')
-        user = get_object_or_404(User, id=user_id)
+        new, existing, unknown = membership.check_users(project, [user_id])
+        if unknown:
+            raise NotFound()
+        if existing:
+            raise ValidationError({"detail": "This user is already a contributor to this project."})
         
-        # Check that the user is not already a contributor
-        if Contributor.objects.filter(user=user, project=project).exists():
+        if not membership.add_contributors(self.request, project, new):
             raise ValidationError({"detail": "This user is already a contributor to this project."})
-            
-        # Create the contributor
-        serializer.save(project=project, user=user, role='CONTRIBUTOR')
+        serializer.instance = Contributor.objects.select_related('user', 'project').get(
+            project=project, user_id=user_id
+        )
         
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         
-        # Prevent deletion of the project author (who is also a contributor)
+        # Prevent deletion of the project author (who is also a contributor),
+        # which also guarantees the project keeps at least one contributor
         if instance.role == 'AUTHOR':
             raise ValidationError({"detail": "Cannot remove the project author."})
             
         # Additional check that the user is the project author
         if instance.project.author != request.user:
             raise ValidationError({"detail": "Only the project author can remove contributors."})
-            
-        # Make sure we're not removing the last contributor
-        if instance.project.contributors.count() <= 1:
-            raise ValidationError({"detail": "Cannot remove the last contributor from the project."})
-            
-        # Capture username for the response message
-        username = instance.user.username
-        project_name = instance.project.name
         
-        # Delete the contributor
-        instance.delete()
+        membership.remove_contributors(request, instance.project, [instance.user_id])
         
         # Return a success message
         return Response({
-            "detail": f"Contributor '{username}' removed from project '{project_name}'"
+            "detail": f"Contributor '{instance.user.username}' removed from project '{instance.project.name}'"
+        }, status=status.HTTP_200_OK)
+
+    def bulk(self, request, *args, **kwargs):
+        """Add and remove many contributors at once"""
+        serializer = ContributorBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        project = self.get_project()
+        
+        new, existing, unknown = membership.check_users(project, serializer.validated_data['add'])
+        if unknown:
+            raise ValidationError({"add": f"Unknown user ID(s): {', '.join(map(str, unknown))}."})
+        
+        with transaction.atomic():
+            added = membership.add_contributors(request, project, new)
+            removed = membership.remove_contributors(request, project, serializer.validated_data['remove'])
+        
+        return Response({
+            "added": added,
+            # Including those a concurrent request added in the meantime
+            "already_contributors": existing + [pk for pk in new if pk not in added],
+            "removed": removed,
+            "not_removed": [pk for pk in serializer.validated_data['remove'] if pk not in removed],
         }, status=status.HTTP_200_OK)
@@ -0,0 +1,65 @@
+"""
+Micro-benchmarks for the SoftDesk API.
+
+Run from the ``softDesk/`` directory, e.g. ``python -m benchmarks.age_gate``.
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+def setup_django(settings_module='softDesk.settings'):
+    """Configure Django for a standalone benchmark script"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Create a throwaway database for the duration of a benchmark.
+
+    A file-backed SQLite database is used so concurrent threads each get their
+    own connection without the table locks of the shared in-memory database.
+    """
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = os.path.join(directory, 'bench.sqlite3')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+
+def measure(func, number=10000, repeat=5):
+    """Return the best mean duration of ``func`` in microseconds over ``repeat`` runs"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter() - start) / number * 1e6)
+    return min(runs)
+
+
+def percentile(samples, pct):
+    """Return the ``pct`` percentile of a list of durations"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(title, rows):
+    """Print ``(label, value)`` rows under a title"""
+    print(title)
+    width = max(len(label) for label, _ in rows)
+    for label, value in rows:
+        print(f"  {label.ljust(width)}  {value}")
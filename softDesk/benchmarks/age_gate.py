@@ -0,0 +1,74 @@
+"""
+Per-request cost of the GDPR age gate.
+
+Compares the former ``AgeValidationMiddleware`` (path check on every request,
+plus a ``json.loads`` of the body before DRF parses it again) with the gate
+running on ``request.data`` inside the registration views.
+"""
+import json
+
+from benchmarks import measure, report, setup_django
+
+setup_django()
+
+from django.test import RequestFactory  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+
+from accounts.gdpr import age_gate  # noqa: E402
+
+
+def legacy_process_request(request):
+    """Body of the removed AgeValidationMiddleware.process_request"""
+    if (request.path in ['/api/auth/register/', '/api/users/'] and
+            request.method == 'POST'):
+        try:
+            if request.body:
+                data = json.loads(request.body.decode('utf-8'))
+                age = data.get('age')
+                if age is not None and age < 15:
+                    return True
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return None
+
+
+def main():
+    factory = RequestFactory()
+    payload = json.dumps({
+        'username': 'bench', 'email': 'bench@test.com', 'password': 'securepass123',
+        'first_name': 'Bench', 'last_name': 'User', 'age': 30,
+        'can_be_contacted': True, 'can_data_be_shared': False,
+    })
+    other = factory.get('/api/projects/1/issues/')
+
+    def register_request():
+        return factory.post('/api/auth/register/', payload, content_type='application/json')
+
+    def legacy_registration():
+        request = register_request()
+        legacy_process_request(request)
+        Request(request, parsers=[JSONParser()]).data
+
+    def single_parse_registration():
+        request = Request(register_request(), parsers=[JSONParser()])
+        age_gate(request.data)
+
+    def build_only():
+        Request(register_request(), parsers=[JSONParser()])
+
+    baseline = measure(build_only)
+    legacy_other = measure(lambda: legacy_process_request(other), number=100000)
+    legacy_register = measure(legacy_registration) - baseline
+    single_register = measure(single_parse_registration) - baseline
+
+    report('GDPR age gate overhead (microseconds per request)', [
+        ('non-registration route, middleware', f"{legacy_other:.3f}"),
+        ('non-registration route, view gate', '0.000 (not on the request path)'),
+        ('registration, middleware + DRF parse', f"{legacy_register:.2f}"),
+        ('registration, single DRF parse', f"{single_register:.2f}"),
+    ])
+
+
+if __name__ == '__main__':
+    main()
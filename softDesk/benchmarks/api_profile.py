@@ -0,0 +1,63 @@
+"""
+Per-request overhead of the full stack (softDesk.settings) vs the API-only
+profile (softDesk.settings_api): middleware chain, authentication classes
+and renderers, for JWT-authenticated requests.
+
+Usage: python -m benchmarks.api_profile [--number 500]
+"""
+import argparse
+
+from benchmarks import measure, report, setup_django, test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from rest_framework.settings import api_settings  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from projects.models import Issue, Project  # noqa: E402
+from softDesk import settings_api  # noqa: E402
+
+PROFILES = [
+    ('full stack', {}),
+    ('API profile', {
+        'ROOT_URLCONF': settings_api.ROOT_URLCONF,
+        'MIDDLEWARE': settings_api.MIDDLEWARE,
+        'REST_FRAMEWORK': settings_api.REST_FRAMEWORK,
+    }),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=500)
+    args = parser.parse_args()
+
+    results = []
+    with test_database():
+        user = User.objects.create_user(username='bench', password='securepass123')
+        project = Project.objects.create(name='Bench', type='BACK_END', author=user)
+        Issue.objects.create(title='Bench', description='Bench', tag='BUG', priority='LOW', project=project, author=user)
+        token = f'Bearer {AccessToken.for_user(user)}'
+        urls = [('project detail', f'/api/projects/{project.id}/'), ('issue list', f'/api/projects/{project.id}/issues/')]
+
+        for label, overrides in PROFILES:
+            with override_settings(**overrides):
+                # DRF copies its defaults into APIView when it is imported
+                APIView.authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+                APIView.renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+                client = Client(HTTP_AUTHORIZATION=token)
+                for name, url in urls:
+                    assert client.get(url).status_code == 200
+                    duration = measure(lambda: client.get(url), number=args.number, repeat=3)
+                    results.append((f'{label:12} {name}', f'{duration:8.1f} us'))
+                results.append((f'{label:12} middleware', f'{len(settings.MIDDLEWARE)} classes'))
+
+    report(f'Per-request cost, {args.number} JWT requests', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Comment insert throughput and primary key index size with uuid4 vs uuid7 ids.
+
+Inserts comments one per transaction, as the API does, into the real
+projects_comment table of a throwaway database, then reads the size of the
+primary key index from SQLite's dbstat table.
+
+Usage: python -m benchmarks.comment_ids [--rows 20000] [--cache-pages 50]
+"""
+import argparse
+import time
+import uuid
+
+from benchmarks import report, setup_django, test_database
+
+setup_django()
+
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from projects.models import Comment, Issue, Project  # noqa: E402
+from softDesk.ids import uuid7  # noqa: E402
+
+GENERATORS = [('uuid4 (random)', uuid.uuid4), ('uuid7 (time-ordered)', uuid7)]
+
+
+def index_stats():
+    """(pages, bytes, average fill) of the primary key index of projects_comment"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'projects_comment' "
+            "AND name LIKE 'sqlite_autoindex_%'"
+        )
+        name = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat WHERE name = %s", [name])
+        pages, size, unused = cursor.fetchone()
+    return pages, size, 1 - unused / size
+
+
+def run(generator, rows, issue, author, cache_pages):
+    Comment.objects.all().delete()
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM')
+        # A small page cache stands in for an index much larger than memory
+        cursor.execute(f'PRAGMA cache_size = {cache_pages}')
+    sql = (
+        'INSERT INTO projects_comment (id, description, issue_id, author_id, created_time) '
+        'VALUES (%s, %s, %s, %s, %s)'
+    )
+    now = timezone.now()
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        for index in range(rows):
+            with transaction.atomic():
+                cursor.execute(sql, [generator().hex, f'Comment {index}', issue.pk, author.pk, now])
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--cache-pages', type=int, default=50, help='SQLite page cache size')
+    args = parser.parse_args()
+
+    results = []
+    with test_database():
+        author = User.objects.create_user(username='bench', password='securepass123')
+        project = Project.objects.create(name='Bench', type='BACK_END', author=author)
+        issue = Issue.objects.create(
+            title='Bench', description='Bench', tag='BUG', priority='LOW', project=project, author=author
+        )
+        for label, generator in GENERATORS:
+            throughput = run(generator, args.rows, issue, author, args.cache_pages)
+            pages, size, fill = index_stats()
+            results.append((label, (
+                f"{throughput:8.0f} inserts/s  "
+                f"pk index {pages:5d} pages, {size / 1024:7.0f} KiB, {fill:4.0%} full"
+            )))
+
+    report(f'Comment primary key, {args.rows} single-row inserts, {args.cache_pages} cached pages', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Comment pages of an issue with long threads: flat chronological page vs threads.
+
+The flat page is what the comment list served before threading: every
+comment in creation order, with the issue title and project name joined and
+repeated on each row. The threaded endpoints serve the top-level comments
+with their descendant counts, and one page of a thread's replies, with the
+issue and project once in the envelope. Each side runs its queries and
+renders the JSON body, without the HTTP stack.
+
+Usage: python -m benchmarks.comment_threads [--threads 40] [--replies 50] [--number 500]
+"""
+import argparse
+
+from benchmarks import measure, report, setup_django, test_database
+
+setup_django()
+
+from accounts.models import User  # noqa: E402
+from projects import threads  # noqa: E402
+from projects.models import Comment, Issue, Project  # noqa: E402
+from projects.serializers import CommentListSerializer  # noqa: E402
+from softDesk.fastserializers import _datetime_field  # noqa: E402
+from softDesk.renderers import FastJSONRenderer  # noqa: E402
+
+# Rows of the list before threading: issue and project joined on every comment
+FLAT_LOOKUPS = (
+    'id', 'description', 'issue_id', 'issue__title', 'issue__project__name', 'author__username', 'created_time',
+)
+
+TEXT = 'A comment of a few words. ' * 4
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=40, help='top-level comments')
+    parser.add_argument('--replies', type=int, default=50, help='replies per thread')
+    parser.add_argument('--number', type=int, default=500)
+    args = parser.parse_args()
+
+    with test_database():
+        author = User.objects.create_user(username='bench', password='securepass123')
+        project = Project.objects.create(name='Customer portal (back-end)', type='BACK_END', author=author)
+        issue = Issue.objects.create(
+            title='Saving a project with a long description fails', description='Test', tag='BUG', priority='LOW', project=project, author=author
+        )
+        for _ in range(args.threads):
+            root = Comment.objects.create(description=TEXT, issue=issue, author=author)
+            for _ in range(args.replies):
+                Comment.objects.create(description=TEXT, issue=issue, author=author, parent=root)
+        comments = Comment.objects.filter(issue=issue)
+        root = comments.filter(thread=None).order_by('created_time').first()
+        renderer = FastJSONRenderer()
+
+        def envelope():
+            row = Issue.objects.filter(pk=issue.pk).values('id', 'title', 'project_id', 'project__name').first()
+            return {
+                'issue': {'id': row['id'], 'title': row['title']},
+                'project': {'id': row['project_id'], 'name': row['project__name']},
+            }
+
+        def flat():
+            rows = comments.order_by('created_time').values(*FLAT_LOOKUPS)[:20]
+            results = [{
+                'id': str(row['id']), 'description': row['description'], 'issue': row['issue_id'],
+                'issue_title': row['issue__title'], 'project_name': row['issue__project__name'],
+                'author': row['author__username'],
+                'created_time': _datetime_field.to_representation(row['created_time']),
+            } for row in rows]
+            return renderer.render({'count': comments.count(), 'results': results})
+
+        def top_level():
+            page = comments.filter(thread=None).order_by('created_time').values(*CommentListSerializer.lookups())
+            results = CommentListSerializer.serialize(page[:20])
+            return renderer.render({**envelope(), 'count': comments.filter(thread=None).count(), 'results': results})
+
+        def replies():
+            page = threads.replies(Comment.objects.all(), root).order_by('id').values(*CommentListSerializer.lookups())
+            return renderer.render({**envelope(), 'results': CommentListSerializer.serialize(page[:20])})
+
+        results = [
+            (label, f'{measure(func, number=args.number, repeat=3):7.0f} us, {len(func()):5d} bytes per page of 20')
+            for label, func in [
+                ('flat page (before)', flat), ('top-level comments', top_level), ('page of a thread', replies),
+            ]
+        ]
+
+    report(f'{args.threads} threads of {args.replies} replies on one issue, query + rendering', results)
+
+
+if __name__ == '__main__':
+    main()
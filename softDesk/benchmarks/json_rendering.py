@@ -0,0 +1,67 @@
+"""
+JSON rendering and parsing cost of a page of issues and comments.
+
+Serializes real Issue and Comment rows with the API serializers, then times
+DRF's JSONRenderer/JSONParser against the orjson-backed FastJSONRenderer and
+FastJSONParser on the same data.
+
+Usage: python -m benchmarks.json_rendering [--rows 100] [--number 500]
+"""
+import argparse
+import io
+
+from benchmarks import measure, report, setup_django, test_database
+
+setup_django()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from projects.models import Comment, Issue, Project  # noqa: E402
+from projects.serializers import CommentSerializer, IssueSerializer  # noqa: E402
+from softDesk.renderers import FastJSONParser, FastJSONRenderer  # noqa: E402
+
+
+def payloads(rows):
+    author = User.objects.create_user(username='bench', password='securepass123')
+    project = Project.objects.create(name='Bench', type='BACK_END', author=author)
+    Issue.objects.bulk_create(
+        Issue(
+            title=f'Issue {index}', description='Description é ✓ ' * 10, tag='BUG', priority='LOW',
+            project=project, author=author
+        )
+        for index in range(rows)
+    )
+    issue = Issue.objects.filter(project=project).first()
+    for index in range(rows):
+        Comment.objects.create(description=f'Comment {index} ' * 10, issue=issue, author=author)
+    return [
+        ('issues', IssueSerializer(Issue.objects.filter(project=project), many=True).data),
+        ('comments', CommentSerializer(Comment.objects.filter(issue=issue), many=True).data),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100, help='objects per page')
+    parser.add_argument('--number', type=int, default=500)
+    args = parser.parse_args()
+
+    results = []
+    with test_database():
+        for name, data in payloads(args.rows):
+            body = JSONRenderer().render(data)
+            for label, renderer in (('JSONRenderer', JSONRenderer()), ('FastJSONRenderer', FastJSONRenderer())):
+                duration = measure(lambda: renderer.render(data), number=args.number)
+                results.append((f'{name} render {label}', f'{duration:8.1f} us'))
+            for label, json_parser in (('JSONParser', JSONParser()), ('FastJSONParser', FastJSONParser())):
+                duration = measure(lambda: json_parser.parse(io.BytesIO(body)), number=args.number)
+                results.append((f'{name} parse {label}', f'{duration:8.1f} us'))
+            results.append((f'{name} body', f'{len(body) / 1024:8.1f} KiB'))
+
+    report(f'JSON rendering, {args.rows} objects per page', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Serialization cost of a page of issues: DRF IssueSerializer vs IssueListSerializer.
+
+Both sides start from the database (select_related instances for DRF,
+``values()`` rows for the fast path) and stop before JSON rendering.
+
+Usage: python -m benchmarks.list_serializers [--rows 20] [--number 500]
+"""
+import argparse
+
+from benchmarks import measure, report, setup_django, test_database
+
+setup_django()
+
+from accounts.models import User  # noqa: E402
+from projects.models import Issue, Project  # noqa: E402
+from projects.serializers import IssueListSerializer, IssueSerializer  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20, help='issues per page')
+    parser.add_argument('--number', type=int, default=500)
+    args = parser.parse_args()
+
+    with test_database():
+        author = User.objects.create_user(username='bench', password='securepass123')
+        project = Project.objects.create(name='Bench', type='BACK_END', author=author)
+        Issue.objects.bulk_create(
+            Issue(
+                title=f'Issue {index}', description='Description', tag='BUG', priority='LOW',
+                project=project, author=author, assignee=author if index % 2 else None
+            )
+            for index in range(args.rows)
+        )
+        queryset = Issue.objects.filter(project=project).order_by('-created_time')
+
+        def regular():
+            return IssueSerializer(queryset.select_related('author', 'assignee', 'project'), many=True).data
+
+        def fast():
+            return IssueListSerializer.serialize(queryset.values(*IssueListSerializer.lookups()))
+
+        assert regular() == fast()
+        results = [
+            ('IssueSerializer', f'{measure(regular, number=args.number):8.1f} us'),
+            ('IssueListSerializer', f'{measure(fast, number=args.number):8.1f} us'),
+        ]
+
+    report(f'Issue list page of {args.rows}, query + serialization', results)
+
+
+if __name__ == '__main__':
+    main()
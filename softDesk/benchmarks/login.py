@@ -0,0 +1,84 @@
+"""
+Login latency under concurrent load for each password hashing configuration.
+
+Usage: python -m benchmarks.login [--threads 8] [--logins 8]
+"""
+import argparse
+import threading
+import time
+
+from benchmarks import percentile, report, setup_django, test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+
+CONFIGURATIONS = [
+    ('default hasher', {
+        'PASSWORD_HASHERS': settings.PASSWORD_HASHER_PROFILES['default'],
+    }),
+    ('default hasher, 100k PBKDF2 iterations', {
+        'PASSWORD_HASHERS': settings.PASSWORD_HASHER_PROFILES['default'], 'PASSWORD_PBKDF2_ITERATIONS': 100_000,
+    }),
+    ('fast hasher (tests only)', {
+        'PASSWORD_HASHERS': settings.PASSWORD_HASHER_PROFILES['fast'],
+    }),
+]
+
+
+def run(threads, logins):
+    """Log every user in ``logins`` times from its own thread, return latencies and wall time"""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(index):
+        client = APIClient()
+        samples = []
+        for _ in range(logins):
+            start = time.perf_counter()
+            response = client.post('/api/auth/login/', {'username': f'bench{index}', 'password': 'securepass123'})
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.content
+        with lock:
+            latencies.extend(samples)
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--logins', type=int, default=8, help='logins per thread')
+    args = parser.parse_args()
+
+    rows = []
+    with test_database():
+        for label, overrides in CONFIGURATIONS:
+            with override_settings(THROTTLE_ENABLED=False, **overrides):
+                cache.clear()
+                User.objects.all().delete()
+                for index in range(args.threads):
+                    User.objects.create_user(username=f'bench{index}', password='securepass123')
+                latencies, elapsed = run(args.threads, args.logins)
+            rows.append((label, (
+                f"p50 {percentile(latencies, 50) * 1000:7.1f} ms  "
+                f"p99 {percentile(latencies, 99) * 1000:7.1f} ms  "
+                f"{len(latencies) / elapsed:7.1f} logins/s"
+            )))
+
+    report(f'Login latency, {args.threads} concurrent clients x {args.logins} logins', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Cost of notifications on POST /comments/: recording an event vs delivering inline.
+
+The inline variant fans the event out and sends it within the request, as a
+synchronous implementation would (with the in-memory email backend, so no
+network time is counted). Then the worker drains a burst of comments in one
+run, coalescing them into one digest per recipient.
+
+Usage: python -m benchmarks.notifications [--contributors 50] [--number 200]
+"""
+import argparse
+import time
+
+from benchmarks import measure, report, setup_django, test_database
+
+setup_django()
+
+from django.core import mail  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from accounts.models import Contributor, User  # noqa: E402
+from projects import notifications  # noqa: E402
+from projects.models import Issue, Notification, NotificationEvent, Project  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--contributors', type=int, default=50, help='opted-in contributors of the project')
+    parser.add_argument('--number', type=int, default=200, help='comments posted per measure')
+    args = parser.parse_args()
+
+    with test_database(), override_settings(NOTIFICATION_DIGEST_DELAY=0, THROTTLE_ENABLED=False):
+        author = User.objects.create_user(username='bench', password='securepass123', can_be_contacted=True)
+        project = Project.objects.create(name='Bench', type='BACK_END', author=author)
+        users = User.objects.bulk_create(
+            User(username=f'user{index}', email=f'user{index}@bench.local', can_be_contacted=True)
+            for index in range(args.contributors)
+        )
+        Contributor.objects.bulk_create(Contributor(user=user, project=project) for user in users)
+        issue = Issue.objects.create(
+            title='Issue', description='Test', tag='BUG', priority='LOW', project=project, author=author
+        )
+        client = APIClient()
+        client.force_authenticate(user=author)
+        url = f'/api/projects/{project.id}/issues/{issue.id}/comments/'
+
+        def post():
+            client.post(url, {'description': 'Comment'}, format='json')
+
+        def post_and_deliver():
+            post()
+            notifications.fan_out()
+            notifications.deliver()
+
+        def reset():
+            NotificationEvent.objects.all().delete()
+            Notification.objects.all().delete()
+            mail.outbox = []
+
+        recorded = measure(post, number=args.number, repeat=3)
+        reset()
+        inline = measure(post_and_deliver, number=args.number, repeat=3)
+        reset()
+
+        for _ in range(args.number):
+            post()
+        start = time.perf_counter()
+        while notifications.fan_out():
+            pass
+        digests = notifications.deliver()
+        worker = time.perf_counter() - start
+
+        results = [
+            ('record event (off the request path)', f'{recorded / 1000:7.2f} ms per POST'),
+            ('fan out and send inline', f'{inline / 1000:7.2f} ms per POST'),
+            (f'worker, burst of {args.number} comments', f'{worker * 1000:7.0f} ms, {digests} digests'),
+        ]
+
+    report(f'Comment notifications, {args.contributors} opted-in contributors', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Cold start of a worker process for each settings profile.
+
+Each run starts a new interpreter, boots Django, loads the WSGI application
+and resolves a first API URL, as an autoscaled worker does before serving
+its first request. Durations are measured inside the child process.
+
+Usage: python -m benchmarks.startup [--runs 15]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import percentile, report
+from softDesk import startup
+
+PROFILES = [('full stack', 'softDesk.settings'), ('API profile (lean boot)', 'softDesk.settings_api')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args()
+
+    # Interpreter start-up alone, for reference
+    samples = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        samples.append(time.perf_counter() - start)
+    results = [('python -c pass', f'{statistics.median(samples) * 1000:6.0f} ms process')]
+
+    for label, settings_module in PROFILES:
+        runs = [
+            startup.profile_boot(settings_module, '/api/projects/', importtime=False).timings
+            for _ in range(args.runs)
+        ]
+        totals = [sum(timings.values()) for timings in runs]
+        results.append((label, (
+            f"{statistics.median(totals) * 1000:6.0f} ms to first request (p90 {percentile(totals, 90) * 1000:.0f} ms): "
+            f"setup {statistics.median(t['setup'] for t in runs) * 1000:.0f} ms, "
+            f"WSGI {statistics.median(t['wsgi'] for t in runs) * 1000:.0f} ms, "
+            f"URL conf {statistics.median(t['first_request'] for t in runs) * 1000:.0f} ms"
+        )))
+
+    report(f'Worker cold start, median of {args.runs} runs', results)
+
+
+if __name__ == '__main__':
+    main()
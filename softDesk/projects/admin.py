@@ -5,6 +5,7 @@ from .models import Project, Issue, Comment
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ('name', 'type', 'author', 'created_time')
+    list_select_related = ('author',)
     list_filter = ('type', 'created_time')
     search_fields = ('name', 'description')
     readonly_fields = ('created_time',)
@@ -13,6 +14,7 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Issue)
 class IssueAdmin(admin.ModelAdmin):
     list_display = ('title', 'tag', 'priority', 'status', 'project', 'author', 'assignee', 'created_time')
+    list_select_related = ('project', 'author', 'assignee')
     list_filter = ('tag', 'priority', 'status', 'created_time')
     search_fields = ('title', 'description')
     readonly_fields = ('created_time',)
@@ -21,5 +23,7 @@ class IssueAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('author', 'issue', 'created_time')
+    # Comment.__str__ reads issue.title and author.username
+    list_select_related = ('author', 'issue')
     list_filter = ('created_time',)
     readonly_fields = ('created_time',)
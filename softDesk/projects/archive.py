@@ -0,0 +1,97 @@
+"""
+Archival of finished issues.
+
+Issues that are FINISHED and untouched for ``ISSUE_ARCHIVE_AFTER_DAYS`` are
+moved, with their comments and history, from the hot projects_issue and
+projects_comment tables into ArchivedIssue and ArchivedComment. Ids are
+kept, so archived resources stay reachable with ?archived=true. Work is done
+per project and in batches of ``ISSUE_ARCHIVE_BATCH_SIZE`` issues, each
+batch in its own transaction.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import history, notifications, stats
+from .models import (
+    ArchivedComment, ArchivedIssue, Comment, Issue, IssueChange, NotificationEvent, Project,
+)
+
+ISSUE_FIELDS = (
+    'id', 'title', 'description', 'tag', 'priority', 'status',
+    'project_id', 'author_id', 'assignee_id', 'created_time',
+)
+COMMENT_FIELDS = (
+    'id', 'description', 'issue_id', 'author_id', 'created_time',
+    'parent_id', 'thread_id', 'path', 'descendant_count',
+)
+
+
+def candidates(project_id, cutoff):
+    """
+    Finished issues of a project created before ``cutoff`` and unchanged
+    since, without notifications still to send (deleting the issue would
+    cascade to them)
+    """
+    # (project, status, -created_time) index, then the (issue, changed_time) one
+    changed = IssueChange.objects.filter(issue=OuterRef('pk'), changed_time__gte=cutoff)
+    unsent = notifications.undelivered().filter(event__issue=OuterRef('pk'))
+    unfanned = NotificationEvent.objects.filter(issue=OuterRef('pk'), fanned_out=False)
+    return Issue.objects.filter(
+        project_id=project_id, status='FINISHED', created_time__lt=cutoff
+    ).exclude(Exists(changed)).exclude(Exists(unsent)).exclude(Exists(unfanned))
+
+
+def archive_batch(pks, eligible=None):
+    """
+    Move some issues, their comments and history to the archive tables.
+    With ``eligible`` (a queryset such as ``candidates()``), the issues are
+    checked again inside the transaction and those no longer in it, reopened
+    or edited since they were picked, are left in place.
+    """
+    with transaction.atomic():
+        if eligible is not None:
+            pks = list(eligible.select_for_update().filter(pk__in=pks).values_list('pk', flat=True))
+        issues = list(Issue.objects.filter(pk__in=pks).values(*ISSUE_FIELDS))
+        changes = defaultdict(list)
+        for change in IssueChange.objects.filter(issue_id__in=pks).order_by('issue_id', 'changed_time', 'id'):
+            changes[change.issue_id].append(change)
+
+        ArchivedIssue.objects.bulk_create([
+            ArchivedIssue(history=history.pack(changes[row['id']]), **row) for row in issues
+        ], batch_size=500)
+        comments = Comment.objects.filter(issue_id__in=pks)
+        ArchivedComment.objects.bulk_create([
+            ArchivedComment(**row) for row in comments.values(*COMMENT_FIELDS)
+        ], batch_size=500)
+
+        comments.delete()
+        # The bulk delete bypasses Issue.delete(): keep the statistics in step
+        buckets = Counter(tuple(row[field] for field in stats.BUCKET_FIELDS) for row in issues)
+        stats.bump_many({bucket: -count for bucket, count in buckets.items()})
+        Issue.objects.filter(pk__in=pks).delete()
+    return len(issues)
+
+
+def archive(older_than_days=None, batch_size=None, project_ids=None):
+    """Archive every eligible issue, returning how many were moved"""
+    days = settings.ISSUE_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ISSUE_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=days)
+
+    projects = Project.objects.order_by('pk')
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+
+    archived = 0
+    for project_id in projects.values_list('pk', flat=True):
+        while True:
+            pks = list(candidates(project_id, cutoff).order_by().values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            archived += archive_batch(pks, candidates(project_id, cutoff))
+    return archived
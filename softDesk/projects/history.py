@@ -0,0 +1,188 @@
+"""
+Append-only history of issue status, priority and assignee changes.
+
+Each IssueChange row stores only the fields that changed, encoded in a short
+string: one letter per field followed by its new value, e.g. ``sP;a17`` for
+"status became IN_PROGRESS and assignee became user 17" or ``a`` for
+"unassigned". The first row of an issue holds its initial state, so the value
+of a field at any time is the last value written before that time.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+
+TRACKED_FIELDS = ('status', 'priority', 'assignee_id')
+
+CODES = {
+    'status': ('s', {'TO_DO': 'T', 'IN_PROGRESS': 'P', 'FINISHED': 'F'}),
+    'priority': ('p', {'LOW': 'L', 'MEDIUM': 'M', 'HIGH': 'H'}),
+    'assignee_id': ('a', None),
+}
+FIELDS_BY_LETTER = {letter: (field, values) for field, (letter, values) in CODES.items()}
+DECODE = {
+    field: {code: value for value, code in values.items()}
+    for field, (_, values) in CODES.items() if values
+}
+
+
+def encode(changes):
+    """Encode a {field: new value} mapping"""
+    parts = []
+    for field in TRACKED_FIELDS:
+        if field not in changes:
+            continue
+        letter, values = CODES[field]
+        value = changes[field]
+        if values:
+            parts.append(letter + values[value])
+        else:
+            parts.append(letter + ('' if value is None else str(value)))
+    return ';'.join(parts)
+
+
+def decode(delta):
+    """Decode a delta string back into a {field: new value} mapping"""
+    changes = {}
+    for part in delta.split(';') if delta else ():
+        field, values = FIELDS_BY_LETTER[part[0]]
+        code = part[1:]
+        if values:
+            changes[field] = DECODE[field][code]
+        else:
+            changes[field] = int(code) if code else None
+    return changes
+
+
+def state_of(issue):
+    return {field: getattr(issue, field) for field in TRACKED_FIELDS}
+
+
+def diff(previous, current):
+    """Fields of ``current`` whose value differs from ``previous`` (all of them if None)"""
+    if previous is None:
+        return dict(current)
+    return {field: value for field, value in current.items() if previous.get(field) != value}
+
+
+def record(issue, previous, actor=None):
+    """Append the changes of a saved issue since its ``previous`` tracked state"""
+    # Import here to avoid circular imports
+    from .models import IssueChange
+
+    changes = diff(previous, state_of(issue))
+    if not changes:
+        return None
+    return IssueChange.objects.create(
+        issue_id=issue.pk,
+        project_id=issue.project_id,
+        actor=actor,
+        changed_time=issue.created_time if previous is None else timezone.now(),
+        delta=encode(changes),
+    )
+
+
+def record_bulk(rows, changes, actor=None):
+    """
+    Append the same change to many issues, for bulk updates that bypass
+    Issue.save(). ``rows`` are (issue id, project id) pairs.
+    """
+    # Import here to avoid circular imports
+    from .models import IssueChange
+
+    now = timezone.now()
+    delta = encode(changes)
+    IssueChange.objects.bulk_create([
+        IssueChange(issue_id=issue_id, project_id=project_id, actor=actor, changed_time=now, delta=delta)
+        for issue_id, project_id in rows
+    ], batch_size=500)
+
+
+def pack(changes):
+    """Serialize IssueChange rows into one string, stored with archived issues"""
+    return ' '.join(
+        f"{int(change.changed_time.timestamp())}:{change.actor_id or ''}:{change.delta}" for change in changes
+    )
+
+
+def unpack(issue_id, text):
+    """Unsaved IssueChange rows from a string written by pack()"""
+    # Import here to avoid circular imports
+    from .models import IssueChange
+
+    changes = []
+    for entry in text.split():
+        timestamp, actor_id, delta = entry.split(':', 2)
+        changes.append(IssueChange(
+            issue_id=issue_id,
+            actor_id=int(actor_id) if actor_id else None,
+            changed_time=datetime.fromtimestamp(int(timestamp), tz=dt_timezone.utc),
+            delta=delta,
+        ))
+    return changes
+
+
+def issue_history(changes):
+    """The IssueChange rows of an issue, oldest first, with the previous and new value of each field"""
+    state = {}
+    entries = []
+    for change in changes:
+        values = decode(change.delta)
+        entries.append({
+            'changed_time': change.changed_time,
+            'actor_id': change.actor_id,
+            'changes': {
+                field.removesuffix('_id'): {'from': state.get(field), 'to': value}
+                for field, value in values.items()
+            },
+        })
+        state.update(values)
+    return entries
+
+
+def time_in_status(changes, now=None):
+    """
+    Seconds spent in each status from (issue id, changed time, delta) rows
+    ordered by issue then time. Returns ({status: seconds}, {status: issue count}).
+    """
+    now = now or timezone.now()
+    seconds = defaultdict(float)
+    issues = defaultdict(set)
+    current_issue = current_status = since = None
+
+    def close(until):
+        if current_status is not None:
+            seconds[current_status] += (until - since).total_seconds()
+            issues[current_status].add(current_issue)
+
+    for issue_id, changed_time, delta in changes:
+        if issue_id != current_issue:
+            close(now)
+            current_issue, current_status = issue_id, None
+        status = decode(delta).get('status')
+        if status is None:
+            continue
+        close(changed_time)
+        current_status, since = status, changed_time
+    close(now)
+    return dict(seconds), {status: len(ids) for status, ids in issues.items()}
+
+
+def project_time_in_status(project, now=None):
+    """Total and average time in each status over the issues of a project"""
+    # Import here to avoid circular imports
+    from .models import Issue, IssueChange
+
+    # One range scan of the (project, issue, changed_time) index, streamed
+    rows = IssueChange.objects.filter(project=project).order_by('issue_id', 'changed_time', 'id').values_list(
+        'issue_id', 'changed_time', 'delta'
+    ).iterator(chunk_size=2000)
+    seconds, counts = time_in_status(rows, now)
+    return {
+        status: {
+            'total_seconds': round(seconds.get(status, 0)),
+            'issues': counts.get(status, 0),
+            'average_seconds': round(seconds[status] / counts[status]) if counts.get(status) else None,
+        }
+        for status, _ in Issue.STATUS_CHOICES
+    }
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from projects import archive
+
+
+class Command(BaseCommand):
+    help = "Move finished issues untouched for a while, with their comments, to the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int,
+            help="Archive issues unchanged for this many days (default: ISSUE_ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument('--batch-size', type=int, help="Issues moved per transaction")
+        parser.add_argument(
+            '--project', type=int, action='append', dest='projects',
+            help="Only archive this project (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        count = archive.archive(options['older_than_days'], options['batch_size'], options['projects'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {count} issues"))
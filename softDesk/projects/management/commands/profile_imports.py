@@ -0,0 +1,39 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from softDesk import startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot a worker in a fresh process with -X importtime and report its start-up time, "
+        "the slowest module imports and the import time per package"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', default=os.environ.get('DJANGO_SETTINGS_MODULE', 'softDesk.settings'),
+            help="Settings module of the profiled worker (e.g. softDesk.settings_api)",
+        )
+        parser.add_argument('--path', default='/api/projects/', help="URL resolved as the first request ('' to skip)")
+        parser.add_argument('--top', type=int, default=15, help="Number of modules and packages listed")
+
+    def handle(self, *args, **options):
+        boot = startup.profile_boot(options['profile'], options['path'])
+        timings = boot.timings
+        self.stdout.write(
+            f"{options['profile']}: django.setup() {timings['setup'] * 1000:.0f} ms, "
+            f"WSGI application {timings['wsgi'] * 1000:.0f} ms, "
+            f"first request {timings['first_request'] * 1000:.0f} ms "
+            f"({len(boot.imports)} modules imported, "
+            f"{sum(module.self_us for module in boot.imports) / 1000:.0f} ms importing)"
+        )
+
+        self.stdout.write("\nSlowest modules (own time, cumulative time):")
+        for module in sorted(boot.imports, key=lambda module: -module.self_us)[:options['top']]:
+            self.stdout.write(f"  {module.self_us / 1000:7.1f} ms {module.cumulative_us / 1000:8.1f} ms  {module.name}")
+
+        self.stdout.write("\nImport time per package:")
+        for package, self_us in startup.by_package(boot.imports).most_common(options['top']):
+            self.stdout.write(f"  {self_us / 1000:7.1f} ms  {package}")
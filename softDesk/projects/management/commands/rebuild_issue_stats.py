@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from projects import stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the issue statistics summary table from the issues table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project', type=int, action='append', dest='projects',
+            help="Only rebuild this project (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        buckets = stats.rebuild(options['projects'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} issue statistic buckets"))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Replace
+
+from projects.models import Comment, NotificationEvent
+from softDesk.ids import UUID7Generator
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace the random (uuid4) ids of existing comments by time-ordered ids "
+        "derived from their creation time. Comment URLs using the old ids stop working."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Comments updated per transaction")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the comments to rekey")
+
+    def handle(self, *args, **options):
+        # Oldest first with a dedicated generator, so the new ids keep the
+        # creation order even for comments created within one millisecond
+        generator = UUID7Generator()
+        rows = Comment.objects.order_by('created_time', 'id').values_list('id', 'created_time')
+        pending = [
+            (pk, created_time) for pk, created_time in rows.iterator(chunk_size=2000) if pk.version != 7
+        ]
+        if options['dry_run']:
+            self.stdout.write(f"{len(pending)} comments to rekey")
+            return
+
+        # Comments with replies are also referenced by the parent, thread and path of these
+        replied = set(Comment.objects.exclude(parent=None).values_list('parent_id', flat=True).distinct())
+        size = options['batch_size']
+        for start in range(0, len(pending), size):
+            with transaction.atomic():
+                for pk, created_time in pending[start:start + size]:
+                    new_pk = generator(int(created_time.timestamp() * 1000))
+                    Comment.objects.filter(pk=pk).update(id=new_pk)
+                    NotificationEvent.objects.filter(comment_id=pk).update(comment_id=new_pk)
+                    if pk in replied:
+                        Comment.objects.filter(parent_id=pk).update(parent_id=new_pk)
+                        Comment.objects.filter(thread_id=pk).update(thread_id=new_pk)
+                        Comment.objects.filter(path__contains=pk.hex).update(
+                            path=Replace('path', Value(pk.hex), Value(new_pk.hex))
+                        )
+        self.stdout.write(self.style.SUCCESS(f"Rekeyed {len(pending)} comments"))
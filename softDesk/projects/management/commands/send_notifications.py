@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects import notifications
+
+
+class Command(BaseCommand):
+    help = "Fan out assignment and comment events to their recipients and send the due digests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Keep polling for new events instead of exiting when nothing is left to do",
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help="Seconds to wait between polls with --loop",
+        )
+        parser.add_argument('--batch-size', type=int, help="Events fanned out and digests sent per batch")
+
+    def handle(self, *args, **options):
+        while True:
+            events = digests = 0
+            while count := notifications.fan_out(options['batch_size']):
+                events += count
+            while count := notifications.deliver(batch_size=options['batch_size']):
+                digests += count
+            if events or digests:
+                self.stdout.write(self.style.SUCCESS(f"{events} event(s) fanned out, {digests} digest(s) sent"))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_issue_statistics(apps, schema_editor):
+    Issue = apps.get_model('projects', 'Issue')
+    IssueStatistic = apps.get_model('projects', 'IssueStatistic')
+    rows = Issue.objects.order_by().values(
+        'project_id', 'assignee_id', 'status', 'priority', 'tag'
+    ).annotate(total=Count('id'))
+    IssueStatistic.objects.bulk_create([
+        IssueStatistic(count=row.pop('total'), **row) for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_comment_options_alter_issue_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('TO_DO', 'To Do'), ('IN_PROGRESS', 'In Progress'), ('FINISHED', 'Finished')], max_length=15)),
+                ('priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High')], max_length=10)),
+                ('tag', models.CharField(choices=[('BUG', 'Bug'), ('FEATURE', 'Feature'), ('TASK', 'Task')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('assignee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='issue_statistics', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='issue_statistics', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['assignee', 'status'], name='issue_stat_assignee_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'assignee', 'status', 'priority', 'tag'), name='unique_issue_statistic_bucket'), models.UniqueConstraint(condition=models.Q(('assignee__isnull', True)), fields=('project', 'status', 'priority', 'tag'), name='unique_unassigned_issue_statistic_bucket')],
+            },
+        ),
+        migrations.RunPython(populate_issue_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_issuestatistic'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assignee', 'status', '-created_time'], name='issue_assignee_status_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_issue_history(apps, schema_editor):
+    # Existing issues start their history with their current state
+    from projects.history import TRACKED_FIELDS, encode
+    Issue = apps.get_model('projects', 'Issue')
+    IssueChange = apps.get_model('projects', 'IssueChange')
+    rows = Issue.objects.order_by().values('id', 'project_id', 'author_id', 'created_time', *TRACKED_FIELDS)
+    IssueChange.objects.bulk_create([
+        IssueChange(
+            issue_id=row['id'], project_id=row['project_id'], actor_id=row['author_id'],
+            changed_time=row['created_time'],
+            delta=encode({field: row[field] for field in TRACKED_FIELDS}),
+        )
+        for row in rows.iterator(chunk_size=2000)
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_issue_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('changed_time', models.DateTimeField()),
+                ('delta', models.CharField(max_length=32)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('issue', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='projects.issue')),
+                ('project', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='issue_changes', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['issue', 'changed_time'], name='issue_change_issue_idx'), models.Index(fields=['project', 'issue', 'changed_time'], name='issue_change_project_idx')],
+            },
+        ),
+        migrations.RunPython(seed_issue_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:47
+
+import softDesk.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_archived_issues'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='id',
+            field=models.UUIDField(default=softDesk.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
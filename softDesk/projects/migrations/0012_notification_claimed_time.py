@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_comment_replies_outlive_parent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='claimed_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
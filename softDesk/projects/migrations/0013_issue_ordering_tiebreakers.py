@@ -0,0 +1,71 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_notification_claimed_time'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='archivedissue',
+            name='archived_issue_project_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_project_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_project_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_project_priority_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_project_tag_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_project_assignee_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_project_author_idx',
+        ),
+        migrations.AddIndex(
+            model_name='archivedissue',
+            index=models.Index(fields=['project', '-created_time', '-id'], name='archived_issue_project_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', '-created_time', '-id'], name='issue_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'status', '-created_time', '-id'], name='issue_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'priority', '-created_time', '-id'], name='issue_project_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'tag', '-created_time', '-id'], name='issue_project_tag_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'assignee', '-created_time', '-id'], name='issue_project_assignee_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'author', '-created_time', '-id'], name='issue_project_author_idx'),
+        ),
+    ]
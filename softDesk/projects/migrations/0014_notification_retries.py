@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0013_issue_ordering_tiebreakers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='retry_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
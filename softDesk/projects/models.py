@@ -1,6 +1,7 @@
-import uuid
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from softDesk.ids import uuid7
+from . import history, notifications, stats, threads
 
 
 class Project(models.Model):
@@ -70,6 +71,52 @@ class Issue(models.Model):
     
     class Meta:
         ordering = ['-created_time']  # Most recent first
+        indexes = [
+            # "My work": issues of an assignee, optionally by status, newest first
+            models.Index(fields=['assignee', 'status', '-created_time'], name='issue_assignee_status_idx'),
+            # Project issue lists: default ordering, then one index per filter / ordering field,
+            # each ending with the -created_time, -id tiebreakers of IssueOrderingFilter
+            models.Index(fields=['project', '-created_time', '-id'], name='issue_project_created_idx'),
+            models.Index(fields=['project', 'status', '-created_time', '-id'], name='issue_project_status_idx'),
+            models.Index(fields=['project', 'priority', '-created_time', '-id'], name='issue_project_priority_idx'),
+            models.Index(fields=['project', 'tag', '-created_time', '-id'], name='issue_project_tag_idx'),
+            models.Index(fields=['project', 'assignee', '-created_time', '-id'], name='issue_project_assignee_idx'),
+            models.Index(fields=['project', 'author', '-created_time', '-id'], name='issue_project_author_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored bucket so IssueStatistic can be updated incrementally
+        # (deferred loads, e.g. during cascade deletion, don't have every field)
+        if all(field in field_names for field in stats.BUCKET_FIELDS):
+            instance._stats_bucket = stats.bucket_of(instance)
+        return instance
+    
+    def save(self, *args, **kwargs):
+        previous = getattr(self, '_stats_bucket', None)
+        if previous is None and not self._state.adding:
+            previous = stats.stored_bucket_of(self)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            current = stats.bucket_of(self)
+            stats.move(previous, current)
+            # Append status/priority/assignee changes; views set _changed_by
+            actor = getattr(self, '_changed_by', None) or (self.author if previous is None else None)
+            change = history.record(
+                self, None if previous is None else dict(zip(stats.BUCKET_FIELDS, previous)), actor=actor
+            )
+            if change is not None and history.decode(change.delta).get('assignee_id'):
+                notifications.record_assignment(self, actor)
+        self._stats_bucket = current
+    
+    def delete(self, *args, **kwargs):
+        bucket = getattr(self, '_stats_bucket', None) or stats.stored_bucket_of(self)
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            stats.move(bucket, None)
+        self._stats_bucket = None
+        return result
     
     def __str__(self):
         return self.title
@@ -77,14 +124,207 @@ class Issue(models.Model):
 
 class Comment(models.Model):
     """Model for comments"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Time-ordered so inserts append to the primary key index
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     description = models.TextField()
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='authored_comments')
     created_time = models.DateTimeField(auto_now_add=True)
+    # Threading (see projects.threads): the comment replied to, the top-level
+    # comment of the thread (None for top-level comments) and the ids of all
+    # the ancestors, root first. Deleting a comment moves its replies up
+    # (threads.detach), so nothing references it any more when it is deleted
+    parent = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='replies')
+    thread = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='+', db_index=False)
+    path = models.CharField(max_length=threads.MAX_DEPTH * threads.ID_LENGTH, blank=True, editable=False)
+    descendant_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['created_time']  # Oldest first (chronological order)
+        indexes = [
+            # Top-level comments of an issue (thread IS NULL), oldest first
+            models.Index(fields=['issue', 'thread', 'created_time'], name='comment_issue_thread_idx'),
+            # Replies of a thread in id (creation) order, for keyset pagination
+            models.Index(fields=['thread', 'id'], name='comment_thread_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding and self.parent is not None:
+            threads.attach(self, self.parent)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and self.parent_id is not None:
+                threads.added(self)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            threads.removed(self)
+            return super().delete(*args, **kwargs)
+    
+    def __str__(self):
+        return f"Comment on {self.issue.title} by {self.author.username}"
+
+
+class IssueStatistic(models.Model):
+    """
+    Number of issues per (project, assignee, status, priority, tag) bucket.
+    Maintained incrementally by Issue.save() and Issue.delete(); repaired
+    with the rebuild_issue_stats management command.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='issue_statistics')
+    assignee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='issue_statistics')
+    status = models.CharField(max_length=15, choices=Issue.STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=Issue.PRIORITY_CHOICES)
+    tag = models.CharField(max_length=10, choices=Issue.TAG_CHOICES)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'assignee', 'status', 'priority', 'tag'],
+                name='unique_issue_statistic_bucket',
+            ),
+            # NULL assignees are distinct for the constraint above
+            models.UniqueConstraint(
+                fields=['project', 'status', 'priority', 'tag'],
+                condition=models.Q(assignee__isnull=True),
+                name='unique_unassigned_issue_statistic_bucket',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['assignee', 'status'], name='issue_stat_assignee_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.project_id}/{self.assignee_id}/{self.status}/{self.priority}/{self.tag}: {self.count}"
+
+
+class IssueChange(models.Model):
+    """
+    Append-only log of issue status, priority and assignee changes.
+    ``delta`` holds only the changed fields, encoded by projects.history.
+    """
+    # Covered by the composite indexes below
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='changes', db_index=False)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='issue_changes', db_index=False)
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    changed_time = models.DateTimeField()
+    delta = models.CharField(max_length=32)
+    
+    class Meta:
+        indexes = [
+            # History of one issue
+            models.Index(fields=['issue', 'changed_time'], name='issue_change_issue_idx'),
+            # Time in status of a project: one ordered range scan
+            models.Index(fields=['project', 'issue', 'changed_time'], name='issue_change_project_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.issue_id} @ {self.changed_time:%Y-%m-%d %H:%M}: {self.delta}"
+
+
+class ArchivedIssue(models.Model):
+    """
+    Finished issue moved out of projects_issue by projects.archive, keeping
+    its id. Served read-only with ?archived=true.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=128)
+    description = models.TextField()
+    tag = models.CharField(max_length=10, choices=Issue.TAG_CHOICES)
+    priority = models.CharField(max_length=10, choices=Issue.PRIORITY_CHOICES)
+    status = models.CharField(max_length=15, choices=Issue.STATUS_CHOICES)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='archived_issues', db_index=False)
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_authored_issues')
+    assignee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_assigned_issues')
+    created_time = models.DateTimeField()
+    archived_time = models.DateTimeField(auto_now_add=True)
+    # IssueChange rows of the issue, as "<unix time>:<actor id>:<delta>" separated by spaces
+    history = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['-created_time']
+        indexes = [
+            models.Index(fields=['project', '-created_time', '-id'], name='archived_issue_project_idx'),
+        ]
+    
+    def __str__(self):
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """Comment of an archived issue, keeping its id"""
+    id = models.UUIDField(primary_key=True, editable=False)
+    description = models.TextField()
+    issue = models.ForeignKey(ArchivedIssue, on_delete=models.CASCADE, related_name='comments')
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_comments')
+    created_time = models.DateTimeField()
+    parent = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='replies')
+    thread = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='+', db_index=False)
+    path = models.CharField(max_length=threads.MAX_DEPTH * threads.ID_LENGTH, blank=True)
+    descendant_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['created_time']
+        indexes = [
+            models.Index(fields=['issue', 'thread', 'created_time'], name='archived_comment_issue_idx'),
+            models.Index(fields=['thread', 'id'], name='archived_comment_thread_idx'),
+        ]
     
     def __str__(self):
         return f"Comment on {self.issue.title} by {self.author.username}"
+
+
+class NotificationEvent(models.Model):
+    """
+    Assignment or new comment recorded on the request path, fanned out to
+    its recipients by projects.notifications off the request path
+    """
+    KIND_CHOICES = [
+        ('ASSIGNED', 'Assigned'),
+        ('COMMENTED', 'Commented'),
+    ]
+    
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='notification_events')
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    # The user assigned (ASSIGNED) or the new comment (COMMENTED)
+    assignee = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    created_time = models.DateTimeField(auto_now_add=True)
+    fanned_out = models.BooleanField(default=False)
+    
+    class Meta:
+        ordering = ['created_time']
+        indexes = [
+            models.Index(fields=['fanned_out', 'created_time'], name='notification_event_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} on issue #{self.issue_id}"
+
+
+class Notification(models.Model):
+    """Event delivered to one recipient, sent in a digest with the other pending ones"""
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    event = models.ForeignKey(NotificationEvent, on_delete=models.CASCADE, related_name='notifications')
+    # Time of the event, so a burst is coalesced from its first event
+    created_time = models.DateTimeField()
+    # Taken by a worker sending it; reclaimed after NOTIFICATION_CLAIM_TIMEOUT
+    claimed_time = models.DateTimeField(null=True, blank=True)
+    sent_time = models.DateTimeField(null=True, blank=True)
+    # Failed sends so far, and when the next one may be tried; given up after
+    # NOTIFICATION_MAX_ATTEMPTS
+    attempts = models.PositiveSmallIntegerField(default=0)
+    retry_time = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_time']
+        indexes = [
+            # Pending notifications per recipient, oldest first
+            models.Index(fields=['sent_time', 'recipient', 'created_time'], name='notification_pending_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event} for user #{self.recipient_id}"
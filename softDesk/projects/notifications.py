@@ -0,0 +1,268 @@
+"""
+Notifications of issue assignments and new comments.
+
+The request path only inserts a NotificationEvent. The ``send_notifications``
+command then works in two steps:
+
+- ``fan_out()`` turns each event into one Notification per recipient: the
+  assignee of an ASSIGNED event, the project contributors of a COMMENTED
+  event, never the actor and only users with ``can_be_contacted`` at that
+  time;
+- ``deliver()`` sends the pending notifications of a recipient together, as
+  one digest, once the oldest has waited ``NOTIFICATION_DIGEST_DELAY``
+  seconds, so a burst of comments becomes a single message.
+
+A worker first claims the notifications of the digests it sends by setting
+their ``claimed_time``, then marks each digest sent as soon as its message
+has gone out. A worker dying in between leaves claims that the next run
+takes over once they are ``NOTIFICATION_CLAIM_TIMEOUT`` seconds old, so a
+digest may exceptionally be sent twice but is never lost.
+
+Digests go through the ``NOTIFICATION_TRANSPORT`` class, ``EmailTransport``
+by default, which hands them to Django's ``EMAIL_BACKEND`` (see
+``SOFTDESK_EMAIL_BACKEND`` in the settings). A transport is a context
+manager holding the connection, whose ``send(digest)`` raises when the
+message could not be sent.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+Digest = namedtuple('Digest', 'recipient notifications')
+
+EXCERPT_LENGTH = 80
+
+
+def record_assignment(issue, actor=None):
+    """Record that ``issue`` was assigned to its current assignee"""
+    # Import here to avoid circular imports
+    from .models import NotificationEvent
+
+    if issue.assignee_id is None or issue.assignee_id == getattr(actor, 'pk', None):
+        return None
+    return NotificationEvent.objects.create(kind='ASSIGNED', issue_id=issue.pk, actor=actor, assignee_id=issue.assignee_id)
+
+
+def record_comment(comment):
+    """Record a new comment for the contributors of its project"""
+    # Import here to avoid circular imports
+    from .models import NotificationEvent
+
+    return NotificationEvent.objects.create(
+        kind='COMMENTED', issue_id=comment.issue_id, actor_id=comment.author_id, comment=comment
+    )
+
+
+# Fan-out
+
+def recipients(events):
+    """{event id: set of user ids} of the opted-in users to notify of each event"""
+    # Import here to avoid circular imports
+    from accounts.models import Contributor, User
+    from .models import Issue
+
+    assignees = {event.assignee_id for event in events if event.kind == 'ASSIGNED'}
+    contactable = set(User.objects.filter(pk__in=assignees, can_be_contacted=True).values_list('pk', flat=True))
+
+    issue_projects = dict(
+        Issue.objects.filter(pk__in={event.issue_id for event in events if event.kind == 'COMMENTED'})
+        .values_list('pk', 'project_id')
+    )
+    contributors = defaultdict(set)
+    for project_id, user_id in Contributor.objects.filter(
+        project_id__in=set(issue_projects.values()), user__can_be_contacted=True
+    ).values_list('project_id', 'user_id'):
+        contributors[project_id].add(user_id)
+
+    result = {}
+    for event in events:
+        if event.kind == 'ASSIGNED':
+            users = {event.assignee_id} & contactable
+        else:
+            users = set(contributors[issue_projects.get(event.issue_id)])
+        users.discard(event.actor_id)
+        result[event.pk] = users
+    return result
+
+
+def fan_out(batch_size=None):
+    """Create the Notification rows of the oldest pending events, return the number of events handled"""
+    # Import here to avoid circular imports
+    from .models import Notification, NotificationEvent
+
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    with transaction.atomic():
+        events = list(NotificationEvent.objects.filter(fanned_out=False).order_by('created_time')[:batch_size])
+        if not events:
+            return 0
+        ids = [event.pk for event in events]
+        # Conditional update so concurrent workers never fan out the same events
+        if NotificationEvent.objects.filter(pk__in=ids, fanned_out=False).update(fanned_out=True) != len(ids):
+            # Another worker claimed some of them first: leave the batch to it
+            transaction.set_rollback(True)
+            return 0
+        users = recipients(events)
+        Notification.objects.bulk_create([
+            Notification(recipient_id=user_id, event=event, created_time=event.created_time)
+            for event in events
+            for user_id in sorted(users[event.pk])
+        ], batch_size=500)
+    return len(events)
+
+
+# Delivery
+
+def describe(notification):
+    """One line of a digest"""
+    event = notification.event
+    actor = event.actor.username if event.actor else 'Someone'
+    issue = f'"{event.issue.title}" ({event.issue.project.name})'
+    if event.kind == 'ASSIGNED':
+        return f"{actor} assigned you to {issue}"
+    text = ' '.join(event.comment.description.split())
+    if len(text) > EXCERPT_LENGTH:
+        text = text[:EXCERPT_LENGTH - 1] + '…'
+    return f"{actor} commented on {issue}: {text}"
+
+
+def render(digest):
+    """(subject, body) of a digest"""
+    count = len(digest.notifications)
+    subject = f"SoftDesk: {count} new notification{'s' if count > 1 else ''}"
+    lines = [f"Hello {digest.recipient.username},", ""]
+    lines += [f"- {describe(notification)}" for notification in digest.notifications]
+    lines += ["", "You receive these messages because you accepted to be contacted."]
+    return subject, '\n'.join(lines)
+
+
+class EmailTransport:
+    """Send each digest as an email through Django's EMAIL_BACKEND, over one connection"""
+
+    def __enter__(self):
+        self.connection = get_connection()
+        self.connection.open()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.connection.close()
+
+    def send(self, digest):
+        subject, body = render(digest)
+        self.connection.send_messages([EmailMessage(subject, body, to=[digest.recipient.email])])
+
+
+def get_transport():
+    return import_string(settings.NOTIFICATION_TRANSPORT)()
+
+
+def undelivered():
+    """Notifications not sent yet and not given up"""
+    # Import here to avoid circular imports
+    from .models import Notification
+
+    return Notification.objects.filter(sent_time__isnull=True, attempts__lt=settings.NOTIFICATION_MAX_ATTEMPTS)
+
+
+def claimable(now):
+    """Notifications not sent yet, not claimed by a live worker and not waiting for a retry"""
+    expired = now - timedelta(seconds=settings.NOTIFICATION_CLAIM_TIMEOUT)
+    return undelivered().filter(
+        Q(claimed_time__isnull=True) | Q(claimed_time__lte=expired),
+        Q(retry_time__isnull=True) | Q(retry_time__lte=now),
+    )
+
+
+def due_digests(now=None, batch_size=None):
+    """Digests of the recipients whose oldest pending notification has waited long enough"""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    cutoff = now - timedelta(seconds=settings.NOTIFICATION_DIGEST_DELAY)
+    recipient_ids = list(
+        claimable(now).order_by().values('recipient_id')
+        .annotate(oldest=Min('created_time')).filter(oldest__lte=cutoff)
+        .values_list('recipient_id', flat=True)[:batch_size]
+    )
+    pending = defaultdict(list)
+    for notification in claimable(now).filter(recipient_id__in=recipient_ids).select_related(
+        'recipient', 'event__actor', 'event__issue__project', 'event__comment'
+    ).order_by('recipient_id', 'created_time', 'pk'):
+        pending[notification.recipient_id].append(notification)
+    return [Digest(notifications[0].recipient, notifications) for notifications in pending.values()]
+
+
+def claim(digests, now):
+    """Claim the notifications of some digests, return the digests with the notifications obtained"""
+    # Import here to avoid circular imports
+    from .models import Notification
+
+    claimed = []
+    for digest in digests:
+        ids = [notification.pk for notification in digest.notifications]
+        # Conditional update so concurrent workers never send the same notifications
+        count = claimable(now).filter(pk__in=ids).update(claimed_time=now)
+        if count != len(ids):
+            # Another worker claimed some of them first: send only ours
+            ours = set(Notification.objects.filter(pk__in=ids, claimed_time=now).values_list('pk', flat=True))
+            digest = Digest(digest.recipient, [
+                notification for notification in digest.notifications if notification.pk in ours
+            ])
+        if digest.notifications:
+            claimed.append(digest)
+    return claimed
+
+
+def deliver(now=None, batch_size=None, transport=None):
+    """Send the due digests one by one, return the number of digests sent"""
+    # Import here to avoid circular imports
+    from .models import Notification
+
+    now = now or timezone.now()
+    claimed = claim(due_digests(now, batch_size), now)
+    if not claimed:
+        return 0
+    sent = 0
+    try:
+        with transport or get_transport() as connection:
+            for digest in claimed:
+                ids = [notification.pk for notification in digest.notifications]
+                try:
+                    connection.send(digest)
+                except Exception:
+                    # Only this recipient waits: the rest of the batch goes on
+                    logger.exception("Sending the notification digest of user %s failed", digest.recipient.pk)
+                    back_off(digest, now)
+                    continue
+                Notification.objects.filter(pk__in=ids, claimed_time=now).update(sent_time=now, claimed_time=None)
+                sent += 1
+    except Exception:
+        logger.exception("Sending notification digests failed after %d of %d", sent, len(claimed))
+    finally:
+        # Release the ones left unsent for the next run
+        Notification.objects.filter(
+            pk__in=[notification.pk for digest in claimed for notification in digest.notifications],
+            claimed_time=now, sent_time__isnull=True,
+        ).update(claimed_time=None)
+    return sent
+
+
+def back_off(digest, now):
+    """Release a digest that failed, to be retried later or given up after NOTIFICATION_MAX_ATTEMPTS"""
+    # Import here to avoid circular imports
+    from .models import Notification
+
+    attempts = max(notification.attempts for notification in digest.notifications) + 1
+    if attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        logger.warning("Giving up the notification digest of user %s after %d attempts", digest.recipient.pk, attempts)
+    delay = settings.NOTIFICATION_RETRY_DELAY * 2 ** (attempts - 1)
+    Notification.objects.filter(
+        pk__in=[notification.pk for notification in digest.notifications], claimed_time=now
+    ).update(claimed_time=None, attempts=attempts, retry_time=now + timedelta(seconds=delay))
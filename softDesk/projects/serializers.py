@@ -1,6 +1,17 @@
 from rest_framework import serializers
 from django.conf import settings
-from .models import Project, Issue, Comment
+from accounts.serializers import EmbeddedContributorSerializer
+from softDesk.fastserializers import ValuesSerializer
+from .models import Project, Issue, Comment, ArchivedIssue, ArchivedComment
+
+
+class EmbeddedCommentSerializer(serializers.ModelSerializer):
+    """Compact comment representation embedded in an issue with ?include=comments"""
+    author = serializers.StringRelatedField(read_only=True)
+    
+    class Meta:
+        model = Comment
+        fields = ['id', 'description', 'author', 'created_time']
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -15,9 +26,22 @@ class ProjectSerializer(serializers.ModelSerializer):
     def get_contributor_count(self, obj):
         """
         Return the number of contributors instead of loading all contributors data
-        This helps avoid N+1 queries when showing contributor counts
+        Uses the count annotated by ProjectViewSet.get_queryset when available
+        to avoid one COUNT query per project
         """
+        annotated = getattr(obj, 'annotated_contributor_count', None)
+        if annotated is not None:
+            return annotated
         return obj.contributors.count()
+    
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        # Related resources requested with ?include= (prefetched by the view)
+        if 'contributors' in self.context.get('include', ()):
+            representation['contributors'] = EmbeddedContributorSerializer(
+                instance.contributors.all(), many=True
+            ).data
+        return representation
 
 
 class IssueSerializer(serializers.ModelSerializer):
@@ -83,6 +107,18 @@ class IssueSerializer(serializers.ModelSerializer):
         
         return data
     
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        # Related resources requested with ?include= (prefetched by the view)
+        include = self.context.get('include', ())
+        if 'comments' in include:
+            representation['comments'] = EmbeddedCommentSerializer(instance.comments.all(), many=True).data
+        if 'contributors' in include:
+            representation['contributors'] = EmbeddedContributorSerializer(
+                instance.project.contributors.all(), many=True
+            ).data
+        return representation
+    
     class Meta:
         model = Issue
         fields = ['id', 'title', 'description', 'tag', 'priority', 'status', 
@@ -97,5 +133,78 @@ class CommentSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Comment
-        fields = ['id', 'description', 'issue', 'issue_title', 'project_name', 'author', 'created_time']
-        read_only_fields = ['author', 'created_time', 'issue', 'issue_title', 'project_name']
+        fields = [
+            'id', 'description', 'issue', 'issue_title', 'project_name', 'parent', 'descendant_count',
+            'author', 'created_time'
+        ]
+        read_only_fields = ['author', 'created_time', 'issue', 'issue_title', 'project_name', 'descendant_count']
+    
+    def update(self, instance, validated_data):
+        # A reply stays in its thread
+        validated_data.pop('parent', None)
+        return super().update(instance, validated_data)
+
+
+class ThreadCommentSerializer(CommentSerializer):
+    """Comment in a list: the issue and project are in the response envelope"""
+    
+    class Meta(CommentSerializer.Meta):
+        fields = ['id', 'description', 'parent', 'descendant_count', 'author', 'created_time']
+
+
+class ArchivedIssueSerializer(IssueSerializer):
+    """Read-only representation of an issue moved to the archive"""
+    
+    class Meta:
+        model = ArchivedIssue
+        fields = IssueSerializer.Meta.fields + ['archived_time']
+        read_only_fields = fields
+
+
+class ArchivedCommentSerializer(CommentSerializer):
+    """Read-only representation of a comment of an archived issue"""
+    
+    class Meta:
+        model = ArchivedComment
+        fields = CommentSerializer.Meta.fields
+        read_only_fields = fields
+
+
+class ArchivedThreadCommentSerializer(ArchivedCommentSerializer):
+    """Archived comment in a list"""
+    
+    class Meta(ArchivedCommentSerializer.Meta):
+        fields = ThreadCommentSerializer.Meta.fields
+        read_only_fields = fields
+
+
+class ProjectListSerializer(ValuesSerializer):
+    """Fast-path list rendering of ProjectSerializer"""
+    model = Project
+    fields = [
+        ('id', 'id'), ('name', 'name'), ('description', 'description'), ('type', 'type'),
+        ('author', 'author__username'), ('created_time', 'created_time'),
+        ('contributor_count', 'annotated_contributor_count'),
+    ]
+
+
+class IssueListSerializer(ValuesSerializer):
+    """Fast-path list rendering of IssueSerializer"""
+    model = Issue
+    fields = [
+        ('id', 'id'), ('title', 'title'), ('description', 'description'), ('tag', 'tag'),
+        ('priority', 'priority'), ('status', 'status'), ('project', 'project_id'),
+        ('project_name', 'project__name'), ('author', 'author__username'), ('assignee', 'assignee_id'),
+        ('assignee_username', 'assignee__username'), ('created_time', 'created_time'),
+    ]
+    optional = ['assignee_username']
+
+
+class CommentListSerializer(ValuesSerializer):
+    """Fast-path list rendering of ThreadCommentSerializer"""
+    model = Comment
+    fields = [
+        ('id', 'id'), ('description', 'description'), ('parent', 'parent_id'),
+        ('descendant_count', 'descendant_count'), ('author', 'author__username'),
+        ('created_time', 'created_time'),
+    ]
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import stats
+from .models import Issue
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def remember_user_issue_projects(sender, instance, **kwargs):
+    # Deleting a user cascades to authored issues and nulls assignees in SQL,
+    # bypassing Issue.delete() and Issue.save(): remember the affected projects
+    instance._issue_project_ids = set(
+        Issue.objects.filter(Q(author=instance) | Q(assignee=instance))
+        .values_list('project_id', flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def rebuild_user_issue_statistics(sender, instance, **kwargs):
+    project_ids = getattr(instance, '_issue_project_ids', None)
+    if project_ids:
+        stats.rebuild(project_ids)
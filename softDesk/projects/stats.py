@@ -0,0 +1,134 @@
+"""
+Incremental maintenance and reads of the IssueStatistic summary table.
+
+Dashboards read a handful of bucket rows instead of counting issues, so their
+cost depends on the number of (assignee, status, priority, tag) combinations of
+a project rather than on its number of issues.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+BUCKET_FIELDS = ('project_id', 'assignee_id', 'status', 'priority', 'tag')
+
+
+def bucket_of(issue):
+    """Return the statistics bucket an issue is counted in"""
+    return tuple(getattr(issue, field) for field in BUCKET_FIELDS)
+
+
+def stored_bucket_of(issue):
+    """Return the bucket of an issue as currently stored in the database, or None"""
+    return type(issue).objects.filter(pk=issue.pk).values_list(*BUCKET_FIELDS).first()
+
+
+def move(previous, current):
+    """Move one issue from the ``previous`` bucket to the ``current`` one (either may be None)"""
+    if previous == current:
+        return
+    if previous is not None:
+        bump(previous, -1)
+    if current is not None:
+        bump(current, 1)
+
+
+def bump(bucket, delta):
+    """Add ``delta`` to the count of a bucket, creating its row if needed"""
+    # Import here to avoid circular imports
+    from .models import IssueStatistic
+
+    lookup = dict(zip(BUCKET_FIELDS, bucket))
+    if IssueStatistic.objects.filter(**lookup).update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            IssueStatistic.objects.create(count=delta, **lookup)
+    except IntegrityError:
+        # Created concurrently by another request
+        IssueStatistic.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def bump_many(deltas):
+    """Apply a {bucket: delta} mapping, e.g. after a bulk delete or update of issues"""
+    for bucket, delta in deltas.items():
+        if delta:
+            bump(bucket, delta)
+
+
+def rebuild(project_ids=None):
+    """Recompute the summary rows from the issues table, for all or some projects"""
+    from .models import Issue, IssueStatistic
+
+    issues = Issue.objects.all()
+    statistics = IssueStatistic.objects.all()
+    if project_ids is not None:
+        issues = issues.filter(project_id__in=project_ids)
+        statistics = statistics.filter(project_id__in=project_ids)
+
+    rows = issues.order_by().values(*BUCKET_FIELDS).annotate(total=Count('id'))
+    with transaction.atomic():
+        statistics.delete()
+        created = IssueStatistic.objects.bulk_create([
+            IssueStatistic(count=row.pop('total'), **row) for row in rows
+        ], batch_size=500)
+    return len(created)
+
+
+def project_summary(project):
+    """Issue counts of a project by status, priority, tag and assignee"""
+    from .models import Issue, IssueStatistic
+
+    summary = {
+        'total': 0,
+        'by_status': {value: 0 for value, _ in Issue.STATUS_CHOICES},
+        'by_priority': {value: 0 for value, _ in Issue.PRIORITY_CHOICES},
+        'by_tag': {value: 0 for value, _ in Issue.TAG_CHOICES},
+    }
+    by_assignee = defaultdict(lambda: {'open': 0, 'total': 0})
+    buckets = IssueStatistic.objects.filter(project=project, count__gt=0).values_list(
+        'assignee_id', 'assignee__username', 'status', 'priority', 'tag', 'count'
+    )
+    for assignee_id, username, status, priority, tag, count in buckets:
+        summary['total'] += count
+        summary['by_status'][status] += count
+        summary['by_priority'][priority] += count
+        summary['by_tag'][tag] += count
+        entry = by_assignee[(assignee_id, username)]
+        entry['total'] += count
+        if status != 'FINISHED':
+            entry['open'] += count
+
+    summary['by_assignee'] = [
+        {'assignee': assignee_id, 'assignee_username': username, **counts}
+        for (assignee_id, username), counts in sorted(
+            by_assignee.items(), key=lambda item: (item[0][1] is None, item[0][1] or '')
+        )
+    ]
+    return summary
+
+
+def assigned_summary(user):
+    """Open issues assigned to ``user`` per project and status, limited to projects they contribute to"""
+    from .models import IssueStatistic
+
+    buckets = IssueStatistic.objects.filter(
+        assignee=user,
+        project__contributors__user=user,
+        count__gt=0,
+    ).exclude(status='FINISHED').values('project_id', 'project__name', 'status').annotate(
+        total=Sum('count')
+    ).order_by('project__name', 'project_id')
+    projects = {}
+    total = 0
+    for row in buckets:
+        entry = projects.setdefault(row['project_id'], {
+            'project': row['project_id'],
+            'project_name': row['project__name'],
+            'open': 0,
+            'by_status': {},
+        })
+        entry['open'] += row['total']
+        entry['by_status'][row['status']] = entry['by_status'].get(row['status'], 0) + row['total']
+        total += row['total']
+    return {'open': total, 'projects': list(projects.values())}
@@ -0,0 +1,105 @@
+"""
+Threaded comment replies.
+
+A reply stores its ``parent``, the top-level comment of its ``thread`` and a
+``path`` holding the ids of all its ancestors, root first, as 32-character
+hex strings. Each comment keeps the number of replies below it in
+``descendant_count``: adding or deleting a reply updates its ancestors with
+one UPDATE on the ids read from its path, without loading the thread.
+
+Deleting a comment keeps the replies below it, which may belong to other
+users: they move up one level, to the parent of the deleted comment, and the
+direct replies of a deleted top-level comment start threads of their own.
+
+The replies below a comment are the comments of its thread whose path starts
+with the comment's own path and id. They are read in id order, which is
+creation order for uuid7 ids, from the (thread, id) index.
+"""
+import uuid
+from collections import Counter
+
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
+
+# Deepest reply level, and length of one id in a path
+MAX_DEPTH = 8
+
+ID_LENGTH = 32
+
+
+def depth(comment):
+    """0 for a top-level comment, 1 for a reply to it, ..."""
+    return len(comment.path) // ID_LENGTH
+
+
+def ancestor_ids(path):
+    """The comment ids stored in a path, root first"""
+    return [uuid.UUID(path[start:start + ID_LENGTH]) for start in range(0, len(path), ID_LENGTH)]
+
+
+def attach(comment, parent):
+    """Place an unsaved ``comment`` in the thread of ``parent``, as its reply"""
+    comment.parent = parent
+    comment.thread_id = parent.thread_id or parent.pk
+    comment.path = parent.path + parent.pk.hex
+
+
+def bump(model, ids, delta):
+    if ids and delta:
+        model.objects.filter(pk__in=ids).update(descendant_count=F('descendant_count') + delta)
+
+
+def added(comment):
+    """Count a new reply in all its ancestors"""
+    bump(type(comment), ancestor_ids(comment.path), 1)
+
+
+def removed(comment):
+    """Uncount a comment about to be deleted from its ancestors, which keep the replies below it"""
+    model = type(comment)
+    path = detach(model, comment.pk)
+    if path:
+        bump(model, ancestor_ids(path), -1)
+
+
+def detach(model, pk):
+    """
+    Move the replies below a comment about to be deleted up one level.
+
+    Must run in a transaction: the comment row is locked, so a reply to it
+    either commits first and is moved, or fails on the deleted parent.
+    Returns the stored path of the comment, None if it no longer exists.
+    """
+    stored = model.objects.select_for_update().filter(pk=pk).values_list('thread_id', 'parent_id', 'path').first()
+    if stored is None:
+        return None
+    thread_id, parent_id, path = stored
+    prefix = path + pk.hex
+    below = model.objects.filter(thread_id=thread_id or pk, path__startswith=prefix)
+    direct = model.objects.filter(parent_id=pk)
+    if thread_id is None:
+        # Each direct reply becomes the top-level comment of its own thread
+        for reply_id in direct.values_list('pk', flat=True):
+            below.filter(path__startswith=prefix + reply_id.hex).update(
+                thread_id=reply_id, path=Substr('path', len(prefix) + 1)
+            )
+        direct.update(parent=None, thread=None, path='')
+    else:
+        direct.update(parent_id=parent_id)
+        # Drop the id of the deleted comment from the paths below it
+        below.update(path=Concat(Value(path), Substr('path', len(prefix) + 1)))
+    return path
+
+
+def replies(queryset, comment):
+    """The comments below ``comment`` in a queryset of its model"""
+    return queryset.filter(thread_id=comment.thread_id or comment.pk, path__startswith=comment.path + comment.pk.hex)
+
+
+def rebuild(model, thread_ids):
+    """Recompute the descendant counts of some threads, e.g. after a bulk delete of replies"""
+    rows = list(model.objects.filter(Q(pk__in=thread_ids) | Q(thread_id__in=thread_ids)).values_list('pk', 'path'))
+    counts = Counter(ancestor for _, path in rows for ancestor in ancestor_ids(path))
+    model.objects.bulk_update(
+        [model(pk=pk, descendant_count=counts[pk]) for pk, _ in rows], ['descendant_count'], batch_size=500
+    )
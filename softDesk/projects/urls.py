@@ -11,6 +11,11 @@ router.register(r'projects', views.ProjectViewSet, basename='project')
 urlpatterns = [
     path('', include(router.urls)),
     
+    # Issues assigned to the current user, across projects
+    path('issues/assigned/', 
+         views.AssignedIssueViewSet.as_view({'get': 'list'}), 
+         name='assigned-issues-list'),
+    
     # URLs for issues (nested under projects)
     path('projects/<int:project_pk>/issues/', 
          views.IssueViewSet.as_view({'get': 'list', 'post': 'create'}), 
@@ -18,6 +23,9 @@ urlpatterns = [
     path('projects/<int:project_pk>/issues/<int:pk>/', 
          views.IssueViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), 
          name='project-issues-detail'),
+    path('projects/<int:project_pk>/issues/<int:pk>/history/', 
+         views.IssueViewSet.as_view({'get': 'history'}), 
+         name='project-issues-history'),
     
     # URLs for comments (nested under issues)
     path('projects/<int:project_pk>/issues/<int:issue_pk>/comments/', 
@@ -26,4 +34,7 @@ urlpatterns = [
     path('projects/<int:project_pk>/issues/<int:issue_pk>/comments/<str:pk>/', 
          views.CommentViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), 
          name='issue-comments-detail'),
+    path('projects/<int:project_pk>/issues/<int:issue_pk>/comments/<str:pk>/replies/', 
+         views.CommentViewSet.as_view({'get': 'replies'}), 
+         name='issue-comments-replies'),
 ]
@@ -1,19 +1,105 @@
 from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import MethodNotAllowed, NotFound, ValidationError
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from .models import Project, Issue, Comment
-from .serializers import ProjectSerializer, IssueSerializer, CommentSerializer
-from accounts.permissions import IsAuthorOrReadOnly, IsProjectContributor, IsProjectAuthor, CanAssignToProjectContributors
+from django.db import transaction
+from django.db.models import Q, Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from .models import Project, Issue, Comment, ArchivedIssue, ArchivedComment
+from . import history, notifications, stats as issue_stats, threads
+from .filters import IssueFilterBackend, IssueOrderingFilter
+from .serializers import (
+    ProjectSerializer, IssueSerializer, CommentSerializer, ArchivedIssueSerializer, ArchivedCommentSerializer,
+    ThreadCommentSerializer, ArchivedThreadCommentSerializer,
+    ProjectListSerializer, IssueListSerializer, CommentListSerializer
+)
+from softDesk.fastserializers import FastListMixin
+from softDesk.pagination import CreatedTimeCursorPagination, ThreadCursorPagination
+from accounts.permissions import (
+    IsAuthorOrReadOnly, IsProjectContributor, IsProjectAuthor, CanAssignToProjectContributors, is_project_contributor,
+)
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class IncludeMixin:
+    """
+    Embed related resources on demand with ?include=name1,name2.
+    
+    ``get_include_prefetches()`` maps each allowed name to the prefetches
+    loading it, so a page costs one extra query per included resource
+    whatever the number of rows. The parsed names are passed to the
+    serializer context as ``include``.
+    """
+    
+    def get_include_prefetches(self):
+        return {}
+    
+    def get_includes(self):
+        if not hasattr(self, '_includes'):
+            value = self.request.query_params.get('include', '') if self.request.method == 'GET' else ''
+            names = [name for name in value.split(',') if name]
+            allowed = self.get_include_prefetches()
+            invalid = [name for name in names if name not in allowed]
+            if invalid:
+                raise ValidationError({
+                    'include': f"Invalid value(s) {', '.join(invalid)}. Allowed: {', '.join(sorted(allowed))}."
+                })
+            self._includes = frozenset(names)
+        return self._includes
+    
+    def apply_includes(self, queryset):
+        prefetches = self.get_include_prefetches()
+        for name in self.get_includes():
+            queryset = queryset.prefetch_related(*prefetches[name])
+        return queryset
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = self.get_includes()
+        return context
+
+
+class ArchivedMixin:
+    """
+    Serve the archive tables instead of the hot ones with ?archived=true.
+    Archived resources are read-only.
+    """
+    archived_queryset = None
+    archived_serializer_class = None
+    
+    @property
+    def archived(self):
+        return self.request.query_params.get('archived', '').lower() in ('true', '1')
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.archived and request.method not in SAFE_METHODS:
+            raise MethodNotAllowed(request.method, detail="Archived resources are read-only.")
+    
+    def get_base_queryset(self):
+        return (self.archived_queryset if self.archived else self.queryset).all()
+    
+    def get_serializer_class(self):
+        if self.archived:
+            return self.archived_serializer_class
+        return super().get_serializer_class()
+
+
+def contributors_prefetch(lookup):
+    """Prefetch of the contributors (with their user) reached through ``lookup``"""
+    from accounts.models import Contributor
+    return Prefetch(lookup, queryset=Contributor.objects.select_related('user'))
+
+
+class ProjectViewSet(FastListMixin, IncludeMixin, viewsets.ModelViewSet):
     """ViewSet for managing projects"""
     serializer_class = ProjectSerializer
+    fast_serializer_class = ProjectListSerializer
+    
+    def use_fast_list(self):
+        return not self.get_includes()
     
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy']:
@@ -26,13 +112,40 @@ class ProjectViewSet(viewsets.ModelViewSet):
         # Returns projects where the user is author or contributor
         user = self.request.user
         from accounts.models import Contributor
-        return Project.objects.filter(
+        # Count contributors in a subquery: a COUNT over the contributors join
+        # would only see the rows matched by the membership filter
+        contributor_count = Contributor.objects.filter(
+            project=OuterRef('pk')
+        ).order_by().values('project').annotate(count=Count('id')).values('count')
+        return self.apply_includes(Project.objects.filter(
             Q(author=user) | Q(contributors__user=user)
-        ).distinct().select_related('author')
+        ).distinct().select_related('author').annotate(
+            annotated_contributor_count=Coalesce(Subquery(contributor_count), 0)
+        ))
+    
+    def get_include_prefetches(self):
+        return {'contributors': [contributors_prefetch('contributors')]}
     
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
     
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """Issue counts by status, priority, tag and assignee, read from IssueStatistic"""
+        project = self.get_object()
+        return Response(issue_stats.project_summary(project))
+    
+    @action(detail=True, methods=['get'], url_path='time-in-status')
+    def time_in_status(self, request, pk=None):
+        """Total and average time the issues of a project spent in each status"""
+        project = self.get_object()
+        return Response(history.project_time_in_status(project))
+    
+    @action(detail=False, methods=['get'], url_path='assigned-stats')
+    def assigned_stats(self, request):
+        """Open issues assigned to the current user, per project and status"""
+        return Response(issue_stats.assigned_summary(request.user))
+    
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         
@@ -49,11 +162,21 @@ class ProjectViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(FastListMixin, ArchivedMixin, IncludeMixin, viewsets.ModelViewSet):
     """ViewSet for managing issues"""
     queryset = Issue.objects.all()
     serializer_class = IssueSerializer
+    fast_serializer_class = IssueListSerializer
+    archived_queryset = ArchivedIssue.objects.all()
+    archived_serializer_class = ArchivedIssueSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrReadOnly, CanAssignToProjectContributors]
+    filter_backends = [IssueFilterBackend, IssueOrderingFilter]
+    # Only orderings served by the (project, <field>, -created_time) indexes
+    ordering_fields = ['created_time', 'status', 'priority', 'tag']
+    ordering = ['-created_time']
+    
+    def use_fast_list(self):
+        return not self.archived and not self.get_includes()
     
     def handle_exception(self, exc):
         # Customize handling of invalid primary key errors
@@ -69,24 +192,35 @@ class IssueViewSet(viewsets.ModelViewSet):
         # Returns issues from projects where the user is a contributor
         user = self.request.user
         from accounts.models import Contributor
-        user_projects = Project.objects.filter(
-            Q(author=user) | Q(contributors__user=user)
-        ).distinct()
+        # Membership through the (user, project) unique index of Contributor
+        # rather than a DISTINCT join over every project
+        membership = (
+            Q(project__in=Contributor.objects.filter(user=user).values('project_id'))
+            | Q(project__author=user)
+        )
         
         # Use select_related to prefetch related author and assignee
         # and project to avoid N+1 queries
-        base_queryset = self.queryset.select_related('author', 'assignee', 'project')
+        base_queryset = self.get_base_queryset().select_related('author', 'assignee', 'project')
+        
+        base_queryset = self.apply_includes(base_queryset)
         
         project_id = self.kwargs.get('project_pk')
         if project_id:
             # Filter by specific project
-            return base_queryset.filter(
-                project_id=project_id,
-                project__in=user_projects
-            )
+            return base_queryset.filter(membership, project_id=project_id)
         
         # Return all issues from user's projects
-        return base_queryset.filter(project__in=user_projects)
+        return base_queryset.filter(membership)
+    
+    def get_include_prefetches(self):
+        return {
+            'comments': [Prefetch(
+                'comments',
+                queryset=(ArchivedComment if self.archived else Comment).objects.select_related('author')
+            )],
+            'contributors': [contributors_prefetch('project__contributors')],
+        }
     
     def perform_create(self, serializer):
         project_id = self.kwargs.get('project_pk') or self.request.data.get('project')
@@ -113,6 +247,24 @@ class IssueViewSet(viewsets.ModelViewSet):
         else:
             raise ValidationError({"project": "This field is required."})
     
+    def perform_update(self, serializer):
+        # Recorded as the actor of the history entry written by Issue.save()
+        serializer.instance._changed_by = self.request.user
+        serializer.save()
+    
+    def history(self, request, *args, **kwargs):
+        """Status, priority and assignee changes of an issue, with its time in each status"""
+        issue = self.get_object()
+        if self.archived:
+            changes = history.unpack(issue.pk, issue.history)
+        else:
+            changes = list(issue.changes.order_by('changed_time', 'id'))
+        seconds, _ = history.time_in_status((c.issue_id, c.changed_time, c.delta) for c in changes)
+        return Response({
+            'changes': history.issue_history(changes),
+            'time_in_status': {value: round(seconds.get(value, 0)) for value, _ in Issue.STATUS_CHOICES},
+        })
+    
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         
@@ -130,12 +282,74 @@ class IssueViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
-    """ViewSet for managing comments"""
+class AssignedIssueViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
+    """Issues assigned to the current user across all of their projects"""
+    serializer_class = IssueSerializer
+    fast_serializer_class = IssueListSerializer
+    pagination_class = CreatedTimeCursorPagination
+    filter_backends = [IssueFilterBackend]
+    
+    def get_queryset(self):
+        user = self.request.user
+        # One query: the contributor join checks membership, and (user, project)
+        # is unique so no DISTINCT is needed
+        queryset = Issue.objects.filter(
+            assignee=user,
+            project__contributors__user=user,
+        ).select_related('author', 'assignee', 'project')
+        return queryset
+
+
+class CommentViewSet(FastListMixin, ArchivedMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for managing comments.
+    
+    Lists hold the top-level comments of an issue; the replies of a thread are
+    listed by ``replies``. The issue and project are sent once, in the
+    envelope of the page, instead of on every comment.
+    """
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    fast_serializer_class = CommentListSerializer
+    archived_queryset = ArchivedComment.objects.all()
+    archived_serializer_class = ArchivedCommentSerializer
     permission_classes = [IsAuthenticated, IsProjectContributor, IsAuthorOrReadOnly]
     
+    def use_fast_list(self):
+        return not self.archived
+    
+    def get_serializer_class(self):
+        if self.action in ('list', 'replies'):
+            return ArchivedThreadCommentSerializer if self.archived else ThreadCommentSerializer
+        return super().get_serializer_class()
+    
+    def get_paginated_response(self, data, issue=None):
+        response = super().get_paginated_response(data)
+        response.data = {**self.get_envelope(issue), **response.data}
+        return response
+    
+    def get_envelope(self, issue=None):
+        """The issue and project shared by the comments of a list (``issue`` when already loaded)"""
+        if issue is not None:
+            return {
+                'issue': {'id': issue.id, 'title': issue.title},
+                'project': {'id': issue.project.id, 'name': issue.project.name},
+            }
+        project_id = self.kwargs.get('project_pk')
+        issue_model = ArchivedIssue if self.archived else Issue
+        row = issue_model.objects.filter(pk=self.kwargs.get('issue_pk')).values(
+            'id', 'title', 'project_id', 'project__name'
+        ).first()
+        # The membership check is cached from IsProjectContributor
+        if (row is None or project_id is None or row['project_id'] != int(project_id)
+                or not is_project_contributor(self.request, project_id)):
+            # The issue is not in this project, or not in one of the user's
+            raise NotFound()
+        return {
+            'issue': {'id': row['id'], 'title': row['title']},
+            'project': {'id': row['project_id'], 'name': row['project__name']},
+        }
+    
     def handle_exception(self, exc):
         # Customize handling of invalid primary key errors
         if isinstance(exc, ValidationError) and getattr(exc, 'detail', {}).get('assignee'):
@@ -149,19 +363,24 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # Returns comments from issues of projects where the user is a contributor
         user = self.request.user
-        from accounts.models import Contributor
         user_projects = Project.objects.filter(
             Q(author=user) | Q(contributors__user=user)
         ).distinct()
         
         # Use select_related to prefetch related author and issue to avoid N+1 queries
-        base_queryset = self.queryset.select_related('author', 'issue', 'issue__project')
+        # (lists render the issue and project once, in the envelope)
+        if self.action == 'list':
+            # Replies are listed per thread by replies()
+            base_queryset = self.get_base_queryset().select_related('author').filter(thread=None)
+        else:
+            base_queryset = self.get_base_queryset().select_related('author', 'issue', 'issue__project')
         
         issue_id = self.kwargs.get('issue_pk')
         if issue_id:
-            # Filter by specific issue
+            # Filter by specific issue, which must belong to the project of the URL
             return base_queryset.filter(
                 issue_id=issue_id,
+                issue__project_id=self.kwargs.get('project_pk'),
                 issue__project__in=user_projects
             )
         
@@ -171,12 +390,36 @@ class CommentViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         issue_id = self.kwargs.get('issue_pk') or self.request.data.get('issue')
         if issue_id:
-            issue = get_object_or_404(Issue, id=issue_id)
+            issue = get_object_or_404(Issue, id=issue_id, project_id=self.kwargs.get('project_pk'))
+            
+            parent = serializer.validated_data.get('parent')
+            if parent is not None:
+                if parent.issue_id != issue.id:
+                    raise ValidationError({"parent": "The parent comment belongs to another issue."})
+                if threads.depth(parent) >= threads.MAX_DEPTH:
+                    raise ValidationError({
+                        "parent": f"Replies cannot be nested more than {threads.MAX_DEPTH} levels deep."
+                    })
             
-            serializer.save(author=self.request.user, issue=issue)
+            with transaction.atomic():
+                comment = serializer.save(author=self.request.user, issue=issue)
+                # Delivered by `manage.py send_notifications`
+                notifications.record_comment(comment)
         else:
             raise ValidationError({"issue": "This field is required."})
     
+    def replies(self, request, *args, **kwargs):
+        """Replies below a comment, oldest first, with keyset pagination (?cursor=, ?limit=)"""
+        comment = self.get_object()
+        queryset = threads.replies(self.get_base_queryset(), comment)
+        self.pagination_class = ThreadCursorPagination
+        if self.use_fast_list():
+            fast = self.fast_serializer_class
+            page = self.paginate_queryset(queryset.values(*fast.lookups()))
+            return self.get_paginated_response(fast.serialize(page), comment.issue)
+        page = self.paginate_queryset(queryset.select_related('author'))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data, comment.issue)
+    
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         
@@ -0,0 +1,195 @@
+"""
+Batch endpoint multiplexing several API calls in one HTTP round trip.
+
+POST /api/batch/
+    {"requests": [
+        {"id": "projects", "method": "GET", "path": "/api/projects/"},
+        {"id": "issue", "method": "POST", "path": "/api/projects/1/issues/", "body": {...}}
+    ]}
+
+Every sub-request is dispatched straight to the view resolved from its path,
+authenticated as the caller of the batch (credentials are checked once) and
+sharing the batch request's membership cache. Runs of consecutive GET
+requests are executed concurrently; any other method is a barrier executed
+on its own, so writes keep the order in which they were sent.
+
+Sub-requests skip the middleware chain: the metrics of each one are recorded
+under its own route here, while compression and the other middleware apply
+to the batch response as a whole.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, connections
+from django.urls import Resolver404, resolve, reverse
+from rest_framework import permissions, status
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .middleware import record_request
+
+
+ALLOWED_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class BatchCallerAuthentication(BaseAuthentication):
+    """Authenticate a sub-request as the already authenticated caller of its batch"""
+
+    def authenticate(self, request):
+        parent = getattr(request, 'batch_parent', None)
+        if parent is None:
+            return None
+        return parent.user, parent.auth
+
+
+class BatchView(APIView):
+    """Execute a list of API sub-requests and return their results in order"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        entries = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(entries, list) or not entries:
+            return Response(
+                {'detail': "Expected a non-empty 'requests' list."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(entries) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'detail': f"A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        errors = {}
+        for index, entry in enumerate(entries):
+            error = self.validate_entry(entry)
+            if error:
+                errors[index] = error
+        if errors:
+            return Response({'detail': 'Invalid sub-requests.', 'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not hasattr(request._request, '_membership_cache'):
+            request._request._membership_cache = {}
+        results = [None] * len(entries)
+        for group in self.group_reads(entries):
+            if len(group) > 1 and self.can_run_concurrently():
+                with ThreadPoolExecutor(max_workers=settings.BATCH_MAX_WORKERS) as executor:
+                    outcomes = executor.map(lambda i: self.run_in_thread(request, entries[i]), group)
+                    for index, outcome in zip(group, outcomes):
+                        results[index] = outcome
+            else:
+                for index in group:
+                    results[index] = self.run(request, entries[index])
+
+        return Response({
+            'responses': [
+                {'id': entry.get('id', index), 'status': status_code, 'body': body}
+                for index, (entry, (status_code, body)) in enumerate(zip(entries, results))
+            ]
+        })
+
+    def validate_entry(self, entry):
+        if not isinstance(entry, dict):
+            return 'Each sub-request must be an object.'
+        if str(entry.get('method', 'GET')).upper() not in ALLOWED_METHODS:
+            return f"Method must be one of {', '.join(ALLOWED_METHODS)}."
+        path = entry.get('path')
+        if not isinstance(path, str) or not path.startswith('/api/'):
+            return "Path must start with /api/."
+        if path.split('?', 1)[0] == reverse('batch'):
+            return 'Batches cannot be nested.'
+        return None
+
+    @staticmethod
+    def group_reads(entries):
+        """Split the indexes into runs of consecutive GETs and single writes"""
+        groups = []
+        for index, entry in enumerate(entries):
+            is_read = str(entry.get('method', 'GET')).upper() == 'GET'
+            if is_read and groups and groups[-1][0]:
+                groups[-1][1].append(index)
+            else:
+                groups.append((is_read, [index]))
+        return [indexes for _, indexes in groups]
+
+    @staticmethod
+    def can_run_concurrently():
+        # Other threads use their own connection and would not see the
+        # uncommitted changes of an open transaction (e.g. inside tests)
+        return settings.BATCH_MAX_WORKERS > 1 and not connection.in_atomic_block
+
+    def run_in_thread(self, request, entry):
+        try:
+            return self.run(request, entry)
+        finally:
+            connections.close_all()
+
+    def run(self, request, entry):
+        """Dispatch one sub-request and return (status code, body)"""
+        path, _, query_string = entry['path'].partition('?')
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return status.HTTP_404_NOT_FOUND, {'detail': 'Not found.'}
+
+        sub_request = self.build_request(request, entry, path, query_string)
+        sub_request.resolver_match = match
+        view = batch_view(match.func)
+        response = record_request(sub_request, lambda sub: view(sub, *match.args, **match.kwargs))
+        if sub_request.method != 'GET':
+            # A write may have changed memberships seen by later sub-requests
+            sub_request._membership_cache.clear()
+
+        if hasattr(response, 'data'):
+            return response.status_code, response.data
+        content = response.content.decode(response.charset or 'utf-8')
+        if response.get('Content-Type', '').startswith('application/json') and content:
+            content = json.loads(content)
+        return response.status_code, content
+
+    @staticmethod
+    def build_request(request, entry, path, query_string):
+        parent = request._request
+        body = b''
+        if entry.get('body') is not None:
+            body = json.dumps(entry['body']).encode()
+
+        environ = {
+            key: value for key, value in parent.META.items()
+            if not key.startswith('wsgi.') and key not in ('CONTENT_TYPE', 'CONTENT_LENGTH')
+        }
+        environ.update({
+            'REQUEST_METHOD': str(entry.get('method', 'GET')).upper(),
+            'PATH_INFO': path,
+            'SCRIPT_NAME': '',
+            'QUERY_STRING': query_string,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+            'wsgi.url_scheme': parent.scheme,
+        })
+        sub_request = WSGIRequest(environ)
+
+        # Authenticate once: read by BatchCallerAuthentication
+        sub_request.batch_parent = request
+        # Share the request-scoped caches (project membership, ...)
+        sub_request._membership_cache = parent._membership_cache
+        return sub_request
+
+
+_batch_views = {}
+
+
+def batch_view(func):
+    """The view function of a DRF view or viewset, authenticating with BatchCallerAuthentication"""
+    if not hasattr(func, 'cls'):
+        # Plain Django view: nothing to authenticate
+        return func
+    view = _batch_views.get(func)
+    if view is None:
+        cls, initkwargs = func.cls, {**func.initkwargs, 'authentication_classes': [BatchCallerAuthentication]}
+        actions = getattr(func, 'actions', None)
+        view = _batch_views[func] = cls.as_view(actions, **initkwargs) if actions else cls.as_view(**initkwargs)
+    return view
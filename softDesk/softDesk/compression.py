@@ -0,0 +1,169 @@
+"""
+Negotiated response compression.
+
+``CompressionMiddleware`` picks the best encoding the client accepts among
+the codecs of the standard library (zstd on Python 3.14+, gzip) and
+compresses responses of at least ``COMPRESSION_MIN_SIZE`` bytes. Streaming
+responses such as GDPR export downloads are compressed chunk by chunk
+without being loaded in memory.
+
+Compressed bodies of ``COMPRESSION_CACHE_MIN_SIZE`` bytes or more are kept in
+the Django cache under a digest of the uncompressed body, so a list polled
+again without changes is served from the stored compressed bytes instead of
+being compressed once more.
+
+Against BREACH, like Django's GZipMiddleware, every compressed body gets up
+to ``COMPRESSION_MAX_RANDOM_BYTES`` random bytes the decoder ignores (a gzip
+file name, a zstd skippable frame), added after the cache. Responses of the
+``COMPRESSION_EXCLUDED_ROUTES``, which carry JWTs, are never compressed.
+"""
+import gzip
+import hashlib
+import secrets
+import string
+import struct
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+
+try:
+    from compression import zstd
+except ImportError:  # Python < 3.14
+    zstd = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+
+
+def _gzip_stream():
+    # gzip container written by zlib itself (wbits 16 + MAX_WBITS)
+    return zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+# Content-Encoding -> (compress(bytes), new streaming compressor), by server preference
+CODECS = {}
+if zstd is not None:
+    CODECS['zstd'] = (zstd.compress, zstd.ZstdCompressor)
+CODECS['gzip'] = (lambda data: gzip.compress(data, compresslevel=6, mtime=0), _gzip_stream)
+
+
+# Start of a zstd skippable frame, which decoders ignore
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+
+def pad(coding, compressed):
+    """Add a random number of ignored bytes to the start of a compressed body"""
+    max_random_bytes = getattr(settings, 'COMPRESSION_MAX_RANDOM_BYTES', 100)
+    if not max_random_bytes:
+        return compressed
+    padding = ''.join(
+        secrets.choice(string.ascii_letters) for _ in range(secrets.randbelow(max_random_bytes) + 1)
+    ).encode()
+    if coding == 'gzip':
+        # A random FNAME field right after the 10-byte header, as Django does
+        header = bytearray(compressed[:10])
+        header[3] |= gzip.FNAME
+        return bytes(header) + padding + b'\0' + compressed[10:]
+    return struct.pack('<II', ZSTD_SKIPPABLE_MAGIC, len(padding)) + padding + compressed
+
+
+def parse_accept_encoding(header):
+    """Map of the codings listed in an Accept-Encoding header to their q-value"""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate(header):
+    """Best supported encoding for an Accept-Encoding header, None for identity"""
+    accepted = parse_accept_encoding(header or '')
+    best, best_quality = None, 0.0
+    for coding in CODECS:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(coding, content):
+    """Compressed ``content``, reusing the cached copy of large bodies"""
+    compress_bytes = CODECS[coding][0]
+    if len(content) < getattr(settings, 'COMPRESSION_CACHE_MIN_SIZE', 16384):
+        return compress_bytes(content)
+    key = f'compressed:{coding}:{hashlib.blake2b(content, digest_size=20).hexdigest()}'
+    compressed = cache.get(key)
+    metrics.record_cache('compression', compressed is not None)
+    if compressed is None:
+        compressed = compress_bytes(content)
+        cache.set(key, compressed, getattr(settings, 'COMPRESSION_CACHE_TIMEOUT', 300))
+    return compressed
+
+
+def compress_stream(coding, chunks):
+    """Compress an iterable of chunks lazily"""
+    compressor = CODECS[coding][1]()
+    padded = False
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            # The first output holds the whole gzip header
+            yield data if padded else pad(coding, data)
+            padded = True
+    data = compressor.flush()
+    yield data if padded else pad(coding, data)
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding accepted by the client"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not response.streaming and len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+        if response.has_header('Content-Encoding') or getattr(response, 'is_async', False):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        if metrics.route_name(request) in getattr(settings, 'COMPRESSION_EXCLUDED_ROUTES', ()):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            # FileResponse keeps closing its file through its resource closers
+            response.streaming_content = compress_stream(coding, response.streaming_content)
+            del response['Content-Length']
+        else:
+            content = pad(coding, compress(coding, response.content))
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        # The representation changed: a strong validator no longer matches
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = coding
+        return response
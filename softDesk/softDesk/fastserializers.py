@@ -0,0 +1,115 @@
+"""
+Read-only serializers rendering list pages straight from ``.values()`` rows.
+
+A ``ValuesSerializer`` declares the output keys of an existing DRF serializer
+with the ``values()`` lookup that produces each of them. The lookups are
+resolved against the model once per process into a list of
+``(key, lookup, convert)`` accessors, so rendering a page is a loop over
+dicts: no model instances, no per-request field introspection. The output is
+the same as the DRF serializer's ``.data`` for the same rows; keep both in
+sync when fields change (see tests/test_fast_serializers.py).
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+_datetime_field = serializers.DateTimeField()
+
+
+# Model field type -> conversion of non-null values, matching the DRF field
+# ModelSerializer picks for it
+CONVERTERS = {
+    'DateTimeField': _datetime_field.to_representation,
+    'UUIDField': str,
+}
+
+
+def _converter(model, lookup):
+    """Conversion for the value of ``lookup``, identity for plain values and annotations"""
+    field = None
+    for part in lookup.split('__'):
+        if model is None:
+            return None
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    if field.is_relation:
+        field = field.target_field
+    return CONVERTERS.get(field.get_internal_type())
+
+
+class ValuesSerializer:
+    """
+    Base class of the fast-path list serializers.
+
+    ``fields`` is a sequence of ``(key, lookup)`` pairs in output order.
+    Keys listed in ``optional`` are left out when their value is None, as DRF
+    does for a dotted ``source`` crossing a null foreign key. ``constants`` are
+    appended unchanged to every row.
+    """
+    model = None
+    fields = ()
+    optional = ()
+    constants = {}
+
+    @classmethod
+    def compile(cls):
+        """Accessors of this class, resolved on first use"""
+        compiled = cls.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = [
+                (key, lookup, _converter(cls.model, lookup), key in cls.optional)
+                for key, lookup in cls.fields
+            ]
+            cls._compiled = compiled
+        return compiled
+
+    @classmethod
+    def lookups(cls):
+        """Arguments to pass to ``QuerySet.values()``"""
+        return list(dict.fromkeys(lookup for _, lookup, _, _ in cls.compile()))
+
+    @classmethod
+    def serialize(cls, rows):
+        """Render an iterable of ``values()`` rows"""
+        accessors = cls.compile()
+        constants = list(cls.constants.items())
+        data = []
+        for row in rows:
+            item = {}
+            for key, lookup, convert, optional in accessors:
+                value = row[lookup]
+                if value is None:
+                    if optional:
+                        continue
+                elif convert is not None:
+                    value = convert(value)
+                item[key] = value
+            for key, value in constants:
+                item[key] = value
+            data.append(item)
+        return data
+
+
+class FastListMixin:
+    """
+    Serve ``list`` with ``fast_serializer_class`` when ``use_fast_list()``
+    allows it, falling back to the regular serializer otherwise (e.g. when
+    related resources are embedded).
+    """
+    fast_serializer_class = None
+
+    def use_fast_list(self):
+        return self.fast_serializer_class is not None
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list():
+            return super().list(request, *args, **kwargs)
+        fast = self.fast_serializer_class
+        queryset = self.filter_queryset(self.get_queryset()).values(*fast.lookups())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(queryset))
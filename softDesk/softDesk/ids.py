@@ -0,0 +1,59 @@
+"""
+Time-ordered UUIDs (RFC 9562 version 7) for primary keys.
+
+The first 48 bits are the Unix time in milliseconds, so new keys are appended
+at the end of the primary key index instead of landing on a random page like
+uuid4 keys, and sorting by key follows creation order. Within a millisecond
+the 12-bit ``rand_a`` field is used as a counter to keep keys monotonic.
+"""
+import os
+import threading
+import time
+import uuid
+
+
+class UUID7Generator:
+    """Monotonic uuid7 source; use one instance per ordered sequence of keys"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def __call__(self, timestamp_ms=None):
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if timestamp_ms <= self._last_ms:
+                # Same millisecond (or the clock went back): keep counting
+                timestamp_ms = self._last_ms
+                self._counter += 1
+                if self._counter > 0xFFF:
+                    timestamp_ms += 1
+                    self._counter = 0
+            else:
+                # Random start, leaving room to count up within the millisecond
+                self._counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+            self._last_ms = timestamp_ms
+            counter = self._counter
+        random_bits = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+        return uuid.UUID(int=(
+            (timestamp_ms & ((1 << 48) - 1)) << 80
+            | 0x7 << 76
+            | counter << 64
+            | 0b10 << 62
+            | random_bits
+        ))
+
+
+_generator = UUID7Generator()
+
+
+def uuid7():
+    """Return a new time-ordered UUID (model field default)"""
+    return _generator()
+
+
+def uuid7_time(value):
+    """Unix time in milliseconds encoded in a uuid7"""
+    return value.int >> 80
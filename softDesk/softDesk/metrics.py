@@ -0,0 +1,361 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format.
+
+Each worker process keeps its own counters and histograms in memory. When
+``METRICS_MULTIPROCESS_DIR`` is set, every process periodically writes a
+snapshot of its values to ``<dir>/metrics-<pid>.json`` and the ``/metrics``
+view merges all snapshot files, so a scrape sees the totals of every worker
+regardless of which one answered it. Snapshots of processes that are no
+longer running are folded into ``<dir>/metrics-accumulated.json`` and
+removed, under a lock on the directory, so the totals never go down (which
+Prometheus would read as a counter reset) when a worker exits.
+
+The view answers only clients presenting ``METRICS_TOKEN`` as a Bearer token
+or connecting from ``METRICS_ALLOWED_IPS``; with neither configured, nobody.
+"""
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Snapshot holding the values of the processes that exited
+ACCUMULATED = 'metrics-accumulated.json'
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def dump(self):
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    @staticmethod
+    def merge(target, value):
+        return (target or 0) + value
+
+    def render(self, values):
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(zip(self.labelnames, key))} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(float(bound) for bound in buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        # Per-bucket (non cumulative) counts, followed by the sum and the count
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 3)
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def get(self, **labels):
+        """Return ``(sum, count)`` for the given labels"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        state = self._values.get(key)
+        return (state[-2], state[-1]) if state else (0, 0)
+
+    def dump(self):
+        with self._lock:
+            return [[list(key), list(state)] for key, state in self._values.items()]
+
+    @staticmethod
+    def merge(target, value):
+        if target is None:
+            return list(value)
+        return [a + b for a, b in zip(target, value)]
+
+    def render(self, values):
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        for key, state in sorted(values.items()):
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(labels + [('le', bound)])} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(state[-2])}"
+            yield f"{self.name}_count{_format_labels(labels)} {state[-1]}"
+
+
+class Registry:
+    """Collection of metrics with optional shared-file aggregation"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        return {name: metric.dump() for name, metric in self._metrics.items()}
+
+    @property
+    def multiprocess_dir(self):
+        return getattr(settings, 'METRICS_MULTIPROCESS_DIR', None)
+
+    def flush(self):
+        """Atomically write this process' snapshot to the shared directory"""
+        directory = self.multiprocess_dir
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        _write(os.path.join(directory, f'metrics-{os.getpid()}.json'), self.snapshot())
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        """Flush at most once every ``METRICS_FLUSH_INTERVAL`` seconds"""
+        if not self.multiprocess_dir:
+            return
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+        if time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def collect(self):
+        """Return merged values per metric name across every known process"""
+        directory = self.multiprocess_dir
+        if not directory:
+            return self.merge([self.snapshot()])
+        self.flush()
+        with _locked(directory):
+            snapshots, accumulated, dead = [], [], []
+            for filename in os.listdir(directory):
+                if not (filename.startswith('metrics-') and filename.endswith('.json')):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    with open(path) as handle:
+                        snapshots.append(json.load(handle))
+                except (OSError, ValueError):
+                    # A snapshot being replaced concurrently is picked up on the next scrape
+                    continue
+                if filename == ACCUMULATED:
+                    accumulated.append(snapshots[-1])
+                elif not _process_alive(filename[len('metrics-'):-len('.json')]):
+                    accumulated.append(snapshots[-1])
+                    dead.append(path)
+            merged = self.merge(snapshots)
+            if dead:
+                # Fold the exited processes into the accumulated snapshot before
+                # removing theirs, so their counts stay in the totals
+                _write(os.path.join(directory, ACCUMULATED), {
+                    name: [[list(key), value] for key, value in values.items()]
+                    for name, values in self.merge(accumulated).items()
+                })
+                for path in dead:
+                    _remove(path)
+        return merged
+
+    def merge(self, snapshots):
+        """Values per metric name summed over some snapshots"""
+        merged = {name: {} for name in self._metrics}
+        for snapshot in snapshots:
+            for name, entries in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in entries:
+                    key = tuple(key)
+                    merged[name][key] = metric.merge(merged[name].get(key), value)
+        return merged
+
+    def render(self):
+        lines = []
+        for name, values in self.collect().items():
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            lines.extend(metric.render(values))
+        return '\n'.join(lines) + '\n'
+
+
+def _process_alive(pid):
+    """Whether the process that wrote a snapshot is still running on this host"""
+    try:
+        pid = int(pid)
+    except ValueError:
+        return False
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running under another user
+        pass
+    return True
+
+
+@contextmanager
+def _locked(directory):
+    """Exclusive lock on the shared directory, across processes"""
+    with open(os.path.join(directory, '.metrics.lock'), 'a+') as handle:
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write(path, snapshot):
+    """Replace a snapshot file atomically, so readers never see it half written"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.metrics-', suffix='.tmp')
+    with os.fdopen(fd, 'w') as handle:
+        json.dump(snapshot, handle)
+    os.replace(tmp_path, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        # Pruned by another worker's scrape
+        pass
+
+
+def _format_labels(pairs):
+    pairs = list(pairs)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'softdesk_http_requests_total',
+    'HTTP requests by route name, method and status code.',
+    ('route', 'method', 'status'),
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    'softdesk_http_request_duration_seconds',
+    'HTTP request latency by route name and method.',
+    ('route', 'method'),
+))
+DB_QUERY_LATENCY = REGISTRY.register(Histogram(
+    'softdesk_db_query_duration_seconds',
+    'Database query latency by route name.',
+    ('route',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+))
+DB_QUERIES_PER_REQUEST = REGISTRY.register(Histogram(
+    'softdesk_db_queries_per_request',
+    'Number of database queries issued per request by route name.',
+    ('route',),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'softdesk_cache_requests_total',
+    'Cache lookups by cache name and result (hit or miss).',
+    ('cache', 'result'),
+))
+JWT_REFRESH = REGISTRY.register(Counter(
+    'softdesk_jwt_refresh_total',
+    'Successful JWT refresh token exchanges.',
+))
+JWT_BLACKLIST = REGISTRY.register(Counter(
+    'softdesk_jwt_blacklist_total',
+    'Refresh tokens blacklisted, by reason (logout or rotation).',
+    ('reason',),
+))
+PAGINATION_DEPTH = REGISTRY.register(Histogram(
+    'softdesk_pagination_page_number',
+    'Requested page number on paginated list endpoints by route name.',
+    ('route',),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+))
+
+
+def record_cache(cache, hit):
+    """Count a lookup in a named cache so hit ratios can be derived"""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def route_name(request):
+    """Return the URL pattern name of a request, used as the route label"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.url_name:
+        return 'unmatched'
+    return match.url_name
+
+
+def scrape_allowed(request):
+    """The request carries ``METRICS_TOKEN`` or comes from ``METRICS_ALLOWED_IPS``"""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and hmac.compare_digest(
+        request.META.get('HTTP_AUTHORIZATION', '').encode(), f'Bearer {token}'.encode()
+    ):
+        return True
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ())
+
+
+def metrics_view(request):
+    """Expose every registered metric in the Prometheus text format"""
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        raise Http404
+    if not scrape_allowed(request):
+        raise PermissionDenied
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,45 @@
+import time
+
+from django.db import connection
+
+from . import metrics
+
+
+class MetricsMiddleware:
+    """
+    Record request latency, status codes and database query timings per route name.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return record_request(request, self.get_response)
+
+
+def record_request(request, get_response):
+    """Call ``get_response(request)`` and record its metrics under the route of the request"""
+    query_timings = []
+
+    def time_query(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            query_timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with connection.execute_wrapper(time_query):
+        response = get_response(request)
+    duration = time.perf_counter() - start
+
+    # resolver_match is only available once the URL has been resolved
+    route = metrics.route_name(request)
+    metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    metrics.HTTP_LATENCY.observe(duration, route=route, method=request.method)
+    metrics.DB_QUERIES_PER_REQUEST.observe(len(query_timings), route=route)
+    for timing in query_timings:
+        metrics.DB_QUERY_LATENCY.observe(timing, route=route)
+    metrics.REGISTRY.maybe_flush()
+
+    return response
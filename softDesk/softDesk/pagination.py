@@ -0,0 +1,104 @@
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from . import metrics
+
+
+class MetricsPageNumberPagination(PageNumberPagination):
+    """Page number pagination that records how deep clients page into lists"""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        results = super().paginate_queryset(queryset, request, view)
+        if results is not None:
+            metrics.PAGINATION_DEPTH.observe(self.page.number, route=metrics.route_name(request))
+        return results
+
+
+class CreatedTimeCursorPagination(CursorPagination):
+    """
+    Keyset pagination on created_time, newest first.
+    Each page is an index range scan instead of an OFFSET over previous pages.
+    """
+    ordering = ('-created_time', '-id')
+
+
+class UsernameCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the lower-cased username, walking the
+    user_username_lower_idx index; expects a ``username_lower`` annotation.
+
+    Usernames are only unique case-sensitively ("Bob" and "bob"), so the
+    cursor holds the (username_lower, id) pair. DRF's own cursor keeps the
+    first ordering field only and tells ties apart by offsets, which skip or
+    repeat rows when paging back across case variants.
+    """
+    ordering = ('username_lower', 'id')
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+
+        if reverse:
+            queryset = queryset.order_by('-username_lower', '-id')
+        else:
+            queryset = queryset.order_by('username_lower', 'id')
+        if position is not None:
+            try:
+                username, pk = json.loads(position)
+            except (TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            # The range on username_lower walks the index; the pair settles ties
+            if reverse:
+                queryset = queryset.filter(
+                    Q(username_lower__lt=username) | Q(id__lt=pk), username_lower__lte=username
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(username_lower__gt=username) | Q(id__gt=pk), username_lower__gte=username
+                )
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = position is not None, position
+            self.has_previous, self.previous_position = following is not None, following
+        else:
+            self.has_next, self.next_position = following is not None, following
+            self.has_previous, self.previous_position = position is not None, position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        return json.dumps([instance.username_lower, instance.pk])
+
+
+class ThreadCursorPagination(CursorPagination):
+    """
+    Keyset pagination of the replies of a comment thread in id order, which
+    is creation order for uuid7 ids: each page is a range of the (thread, id) index.
+    """
+    ordering = 'id'
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
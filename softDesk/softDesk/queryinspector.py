@@ -0,0 +1,230 @@
+"""
+SQL instrumentation used to detect N+1 query patterns.
+
+Queries are fingerprinted by their shape (literals and ``IN`` lists collapsed),
+so the same lazy relation access repeated for every row of a page shows up as
+one fingerprint executed many times.
+"""
+import json
+import logging
+import os
+import re
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+# Frames from these packages are skipped when looking for the code that triggered a query
+_LIBRARY_PATHS = ('/django/', '/rest_framework/', '/rest_framework_simplejwt/', __file__)
+
+
+class NPlusOneError(AssertionError):
+    """Raised when a request repeats the same query shape too many times"""
+
+
+def fingerprint(sql):
+    """Return the shape of a SQL statement, independent of its parameters"""
+    shape = _STRING_RE.sub('?', sql)
+    shape = _NUMBER_RE.sub('?', shape)
+    shape = _IN_LIST_RE.sub('IN (...)', shape)
+    return _SPACE_RE.sub(' ', shape).strip()
+
+
+def _caller():
+    """Return 'file:line in function' of the first application frame"""
+    for frame in reversed(traceback.extract_stack()):
+        if not any(path in frame.filename for path in _LIBRARY_PATHS):
+            return f"{frame.filename}:{frame.lineno} in {frame.name}"
+    return 'unknown'
+
+
+def explain(sql, params=()):
+    """Return the SQLite EXPLAIN QUERY PLAN details of a statement, one string per step"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    """Return the steps of a query plan that scan a whole table or sort in a temporary B-tree"""
+    return [
+        step for step in plan
+        if (step.startswith('SCAN ') and 'COVERING INDEX' not in step and 'CONSTANT ROW' not in step)
+        or 'TEMP B-TREE' in step
+    ]
+
+
+class QueryInspector:
+    """Collect the SQL executed on the default connection, grouped by fingerprint"""
+
+    def __init__(self, capture_origin=True):
+        self.capture_origin = capture_origin
+        self.queries = []
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = fingerprint(sql)
+        self.queries.append(shape)
+        if self.capture_origin and shape not in self.origins:
+            self.origins[shape] = _caller()
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def capture(self):
+        with connection.execute_wrapper(self):
+            yield self
+
+    def __len__(self):
+        return len(self.queries)
+
+    def repeated(self, threshold=None):
+        """Return ``(fingerprint, count, origin)`` for shapes executed at least ``threshold`` times"""
+        if threshold is None:
+            threshold = getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+        return [
+            (shape, count, self.origins.get(shape, 'unknown'))
+            for shape, count in Counter(self.queries).most_common()
+            if count >= threshold
+        ]
+
+
+def capture_plans(func):
+    """
+    Call ``func`` and return the statements it executed as
+    ``{'sql': fingerprint, 'plan': [steps]}`` dicts, in execution order. Only
+    reads are explained, once ``func`` has returned.
+    """
+    executed = []
+
+    def record(execute, sql, params, many, context):
+        executed.append((sql, params, many))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        func()
+    return [
+        {
+            'sql': fingerprint(sql),
+            'plan': explain(sql, params) if not many and sql.lstrip()[:6].upper() in ('SELECT', 'WITH') else [],
+        }
+        for sql, params, many in executed
+    ]
+
+
+class QueryInspectionMiddleware:
+    """
+    Flag requests that repeat an identical query shape, which is the signature
+    of a lazy relation being loaded once per row.
+
+    ``NPLUSONE_DETECTION`` selects the mode: ``'log'`` emits a warning,
+    ``'raise'`` raises NPlusOneError and any other value disables the middleware.
+    """
+
+    def __init__(self, get_response):
+        self.mode = getattr(settings, 'NPLUSONE_DETECTION', None)
+        if self.mode not in ('log', 'raise'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        inspector = QueryInspector()
+        with inspector.capture():
+            response = self.get_response(request)
+
+        response['X-Query-Count'] = str(len(inspector))
+        for shape, count, origin in inspector.repeated():
+            message = f"Possible N+1 on {request.method} {request.path}: {count} x {shape} (from {origin})"
+            if self.mode == 'raise':
+                raise NPlusOneError(message)
+            logger.warning(message)
+        return response
+
+
+class QueryScalingAssertionsMixin:
+    """TestCase mixin failing when an endpoint's query count depends on its page size"""
+
+    def assertQueryCountStable(self, url, add_rows, client=None):
+        """
+        Request ``url``, call ``add_rows()`` to grow the underlying data and
+        request it again: both responses must have issued the same number of queries.
+        """
+        client = client or self.client
+        counts = []
+        for step in range(2):
+            if step:
+                add_rows()
+            inspector = QueryInspector()
+            with inspector.capture():
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, f"GET {url} returned {response.status_code}")
+            counts.append(inspector)
+
+        small, large = counts
+        if len(large) != len(small):
+            grown = [
+                f"{shape} (from {origin})"
+                for shape, count, origin in large.repeated(threshold=2)
+            ]
+            self.fail(
+                f"GET {url} issued {len(small)} queries, then {len(large)} after adding rows. "
+                f"Repeated shapes: {grown}"
+            )
+
+
+class QueryPlanAssertionsMixin:
+    """
+    TestCase mixin comparing the statements of a request with a golden file.
+
+    Golden files are JSON files named after each check in ``query_plans_dir``
+    holding the query count and the plan of every statement. A request fails
+    when it issues more queries than recorded or when its plans contain a full
+    table scan or a temporary B-tree the golden plans did not have. Run the
+    tests with ``SOFTDESK_UPDATE_QUERY_PLANS=1`` to (re)record the files.
+    """
+    query_plans_dir = None
+
+    def assertQueryPlansUnchanged(self, name, url, client=None):
+        client = client or self.client
+        responses = []
+        statements = capture_plans(lambda: responses.append(client.get(url)))
+        self.assertEqual(responses[0].status_code, 200, f"GET {url} returned {responses[0].status_code}")
+
+        path = Path(self.query_plans_dir) / f'{name}.json'
+        current = {'queries': len(statements), 'statements': statements}
+        if os.environ.get('SOFTDESK_UPDATE_QUERY_PLANS'):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(current, indent=2) + '\n')
+            return
+        if not path.exists():
+            self.fail(f"No golden plans for {name}: record them with SOFTDESK_UPDATE_QUERY_PLANS=1")
+        golden = json.loads(path.read_text())
+
+        problems = []
+        if current['queries'] > golden['queries']:
+            known = {statement['sql'] for statement in golden['statements']}
+            added = [statement['sql'] for statement in statements if statement['sql'] not in known]
+            problems.append(
+                f"{current['queries']} queries instead of {golden['queries']}"
+                + (f", new statements: {added}" if added else "")
+            )
+        # Compared as a multiset of steps, so rewording a statement is not a regression
+        allowed = Counter(step for statement in golden['statements'] for step in full_scans(statement['plan']))
+        for statement in statements:
+            for step in full_scans(statement['plan']):
+                if allowed[step]:
+                    allowed[step] -= 1
+                else:
+                    problems.append(f"{step} in {statement['sql']}")
+        if problems:
+            self.fail(f"GET {url} regressed against {path.name}:\n  " + "\n  ".join(problems))
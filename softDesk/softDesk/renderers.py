@@ -0,0 +1,92 @@
+"""
+JSON renderer and parser backed by orjson.
+
+Drop-in replacements for DRF's JSONRenderer and JSONParser, selected in
+``REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']`` and
+``REST_FRAMEWORK['DEFAULT_PARSER_CLASSES']``. The output matches DRF's
+default compact mode for the data the API serializes: UTC datetimes end
+with ``Z``, UUIDs (e.g. ``Comment.id``) are strings, and U+2028/U+2029 are
+escaped. Anything orjson has no native encoding for goes through DRF's
+encoder, and data orjson rejects (integers beyond 64 bits, ...) is rendered
+by DRF. orjson would parse such integers as floats: bodies with a number of
+20 digits or more are parsed by DRF. One difference remains: NaN and infinite floats render as ``null``
+where DRF's strict mode raises ``ValueError``.
+
+orjson is optional: without it, and in the cases DRF handles specially
+(``; indent=`` media types, the browsable API, ASCII-only or non-strict
+JSON settings, non UTF-8 bodies), the classes behave exactly like their
+DRF parents.
+"""
+import io
+import re
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+else:
+    OPTIONS = 0
+
+_fallback_encoder = JSONEncoder()
+
+# 2 ** 64 has 20 digits: shorter integers fit orjson's 64-bit ones. Runs inside
+# strings or fractions also match and merely take the slower path
+_LONG_DIGITS = re.compile(rb'\d{20,}')
+
+
+def _default(obj):
+    # Lazy translations, timedeltas, decimals, querysets, generators...
+    return _fallback_encoder.default(obj)
+
+
+def dumps(data):
+    """Serialize ``data`` to JSON bytes as DRF's compact JSONRenderer would"""
+    content = orjson.dumps(data, default=_default, option=OPTIONS)
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        # Keep the output a strict JavaScript subset, like DRF
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer using orjson for the compact, UTF-8 case"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None or self.ensure_ascii or not self.compact or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return dumps(data)
+        except TypeError:
+            # orjson.JSONEncodeError, e.g. an integer beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser using orjson for UTF-8 bodies"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if _LONG_DIGITS.search(body):
+            # Possibly an integer beyond 64 bits, which orjson turns into a float
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
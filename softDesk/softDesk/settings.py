@@ -10,6 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
+from datetime import timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -25,6 +28,9 @@ SECRET_KEY = 'django-insecure-$st(fo_wc)d^3m)udxm#e5!yo0a=l&f*z01%@5beex&o@m)6)l
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# True when running the test suite (python manage.py test)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
 ALLOWED_HOSTS = []
 
 
@@ -45,14 +51,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'softDesk.middleware.MetricsMiddleware',
+    'softDesk.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'accounts.middleware.AgeValidationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'softDesk.queryinspector.QueryInspectionMiddleware',
 ]
 
 ROOT_URLCONF = 'softDesk.urls'
@@ -105,6 +113,34 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing profiles, selected with SOFTDESK_PASSWORD_HASHER_PROFILE.
+# 'fast' uses MD5 for new hashes and must never be used in production: it exists
+# so the test suite does not spend its time in PBKDF2.
+PASSWORD_HASHER_PROFILES = {
+    'default': [
+        'accounts.hashers.TunablePBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+}
+PASSWORD_HASHER_PROFILES['fast'] = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+] + PASSWORD_HASHER_PROFILES['default']
+
+PASSWORD_HASHER_PROFILE = os.environ.get(
+    'SOFTDESK_PASSWORD_HASHER_PROFILE', 'fast' if TESTING else 'default'
+)
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+# PBKDF2 iterations for new hashes, None keeps Django's default
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('SOFTDESK_PBKDF2_ITERATIONS', 0)) or None
+
+# Minimum delay in seconds between two last_login writes for the same user
+LAST_LOGIN_UPDATE_INTERVAL = 60
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -130,6 +166,11 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
+# Test runner restoring a migrated copy of the test database kept in this
+# directory instead of migrating on every run (None always migrates)
+TEST_RUNNER = 'softDesk.testing.FastTestRunner'
+TEST_TEMPLATE_DIR = BASE_DIR / '.test-templates'
+
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -140,19 +181,41 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
+    # orjson-backed drop-ins for DRF's JSONRenderer / JSONParser (same output)
+    'DEFAULT_RENDERER_CLASSES': [
+        'softDesk.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'softDesk.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'softDesk.pagination.MetricsPageNumberPagination',
+    'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'softDesk.throttling.WriteRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '10/min',     # Per IP on /api/auth/login/
+        'register': '5/min',   # Per IP on /api/auth/register/ and POST /api/users/
+        'write': '120/min',    # Per user on POST, PUT, PATCH and DELETE
+    },
 }
 
-# JWT Configuration
-from datetime import timedelta
+# Sliding-window throttle counters, shared by every worker through this SQLite file.
+# None keeps them in memory for the current process only.
+THROTTLE_STORE_PATH = BASE_DIR / 'throttle.sqlite3'
+# Throttling is off in the test suite; throttle tests enable it explicitly
+THROTTLE_ENABLED = not TESTING
 
+# JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
-    'UPDATE_LAST_LOGIN': True,
+    'UPDATE_LAST_LOGIN': False,  # Coalesced by accounts.backends.touch_last_login
     
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -169,3 +232,86 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
+
+# Metrics exposed at /metrics in the Prometheus text format
+METRICS_ENABLED = True
+# Bearer token the scraper must send to read /metrics (None: no token access)
+METRICS_TOKEN = os.environ.get('SOFTDESK_METRICS_TOKEN') or None
+# Client addresses allowed to read /metrics without the token. Behind a
+# reverse proxy REMOTE_ADDR is the proxy's address: use the token there
+METRICS_ALLOWED_IPS = [
+    address.strip() for address in os.environ.get('SOFTDESK_METRICS_ALLOWED_IPS', '').split(',') if address.strip()
+]
+# Directory shared by the worker processes of one host; None keeps metrics per process
+METRICS_MULTIPROCESS_DIR = None
+# Minimum delay in seconds between two snapshot writes of a worker
+METRICS_FLUSH_INTERVAL = 5
+
+# N+1 query detection: 'log' warns, 'raise' fails the request, None disables it
+NPLUSONE_DETECTION = 'log' if DEBUG else None
+# Number of executions of the same query shape within one request that is reported
+NPLUSONE_THRESHOLD = 5
+
+# Batch endpoint: maximum sub-requests per call and threads used for reads
+BATCH_MAX_REQUESTS = 20
+
+BATCH_MAX_WORKERS = 4
+
+# GDPR jobs run by `manage.py process_privacy_jobs`: rows per transaction and export location
+PRIVACY_JOB_BATCH_SIZE = 500
+
+PRIVACY_EXPORT_DIR = BASE_DIR / 'exports'
+
+# Seconds without a heartbeat after which a running job, whose worker is
+# assumed to have stopped, is taken over by the next worker
+PRIVACY_JOB_CLAIM_TIMEOUT = 600
+
+# Archival by `manage.py archive_issues`: finished issues unchanged for this many days
+ISSUE_ARCHIVE_AFTER_DAYS = 90
+
+ISSUE_ARCHIVE_BATCH_SIZE = 500
+
+# Notifications sent by `manage.py send_notifications`: the pending notifications
+# of a recipient go out as one digest once the oldest has waited this many seconds
+NOTIFICATION_DIGEST_DELAY = 300
+
+NOTIFICATION_BATCH_SIZE = 500
+
+# Seconds after which notifications claimed by a worker that died before
+# sending them are taken over by the next run
+NOTIFICATION_CLAIM_TIMEOUT = 600
+
+# A digest that fails (e.g. a recipient refused by the SMTP server) is retried
+# after NOTIFICATION_RETRY_DELAY seconds, doubled after each failure, and given
+# up after NOTIFICATION_MAX_ATTEMPTS; the other recipients are not held back
+NOTIFICATION_RETRY_DELAY = 300
+
+NOTIFICATION_MAX_ATTEMPTS = 5
+
+# Class sending the digests; EmailTransport uses EMAIL_BACKEND
+NOTIFICATION_TRANSPORT = 'projects.notifications.EmailTransport'
+
+# Files in EMAIL_FILE_PATH by default; in production set
+# SOFTDESK_EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend and the
+# SOFTDESK_EMAIL_HOST, _PORT, _HOST_USER, _HOST_PASSWORD and _USE_TLS variables
+EMAIL_BACKEND = os.environ.get('SOFTDESK_EMAIL_BACKEND', 'django.core.mail.backends.filebased.EmailBackend')
+
+EMAIL_FILE_PATH = BASE_DIR / 'outbox'
+
+EMAIL_HOST = os.environ.get('SOFTDESK_EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('SOFTDESK_EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('SOFTDESK_EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('SOFTDESK_EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('SOFTDESK_EMAIL_USE_TLS', '') == '1'
+
+DEFAULT_FROM_EMAIL = 'SoftDesk <notifications@softdesk.local>'
+
+# Response compression: smallest body compressed, and smallest body whose
+# compressed copy is cached (keyed by a digest of the body) for this many seconds
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CACHE_MIN_SIZE = 16384
+COMPRESSION_CACHE_TIMEOUT = 300
+# BREACH mitigation: up to this many random bytes added to each compressed body
+COMPRESSION_MAX_RANDOM_BYTES = 100
+# Routes whose responses carry JWTs, never compressed
+COMPRESSION_EXCLUDED_ROUTES = ['token_obtain_pair', 'token_refresh', 'register']
@@ -0,0 +1,55 @@
+"""
+API-only deployment profile.
+
+Serves ``/api/`` (and ``/metrics``) for clients authenticating with JWT
+Bearer tokens only: no sessions, CSRF, messages or clickjacking middleware,
+no session/basic authentication and no browsable API. The admin is neither
+loaded nor routed here and keeps running on the full stack of
+``softDesk.settings``; ``manage.py profile_imports`` compares the start-up
+cost of both profiles.
+
+Run with ``DJANGO_SETTINGS_MODULE=softDesk.settings_api`` (see
+``softDesk/wsgi_api.py``). This profile only serves requests: management
+commands and workers (``migrate``, ``process_privacy_jobs``,
+``send_notifications``, ...) must run on ``softDesk.settings``. Without the
+admin app, its LogEntry rows are unknown to the delete collector and deleting
+a user who has some fails on the foreign key, so ``process_privacy_jobs``
+refuses to start here.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, REST_FRAMEWORK, TEMPLATES
+
+ROOT_URLCONF = 'softDesk.urls_api'
+WSGI_APPLICATION = 'softDesk.wsgi_api.application'
+
+# Lean boot: the admin (with the sessions and messages it needs) and static
+# files are only served by the full profile, so their apps are not loaded.
+# Run migrations with the full profile.
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)]
+
+MIDDLEWARE = [
+    'softDesk.middleware.MetricsMiddleware',
+    'softDesk.compression.CompressionMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'softDesk.queryinspector.QueryInspectionMiddleware',
+]
+
+TEMPLATES = [
+    {**TEMPLATES[0], 'OPTIONS': {'context_processors': ['django.template.context_processors.request']}},
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'softDesk.renderers.FastJSONRenderer',
+    ],
+}
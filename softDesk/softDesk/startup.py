@@ -0,0 +1,72 @@
+"""
+Worker start-up measurements.
+
+``profile_boot`` starts a fresh interpreter with ``-X importtime``, boots
+Django with a given settings module, loads the WSGI application and,
+optionally, resolves a first URL (which imports the URL conf, views and
+serializers). It returns the wall-clock durations measured inside the child
+and every module import with its own and cumulative time. Modules loaded
+with ``importlib.import_module`` (app packages, URL confs, middleware) are
+not listed by ``-X importtime``, only the modules they import.
+"""
+import json
+import os
+import subprocess
+import sys
+from collections import Counter, namedtuple
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+BOOT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+wsgi = time.perf_counter()
+if sys.argv[1]:
+    from django.urls import resolve
+    resolve(sys.argv[1])
+print(json.dumps({
+    'setup': setup - start, 'wsgi': wsgi - setup, 'first_request': time.perf_counter() - wsgi,
+}))
+"""
+
+ModuleImport = namedtuple('ModuleImport', 'name self_us cumulative_us depth')
+Boot = namedtuple('Boot', 'timings imports')
+
+
+def parse_importtime(output):
+    """ModuleImports from the ``-X importtime`` lines of a stderr output"""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append(ModuleImport(name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def profile_boot(settings_module, path=None, importtime=True):
+    """Boot Django in a new process, return its Boot timings (seconds) and imports"""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', BOOT_SCRIPT, path or '']
+    result = subprocess.run(
+        command, capture_output=True, text=True, check=True, cwd=BASE_DIR,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module},
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return Boot(timings, parse_importtime(result.stderr) if importtime else [])
+
+
+def by_package(imports):
+    """Own import time in microseconds summed per top-level package"""
+    totals = Counter()
+    for module in imports:
+        totals[module.name.split('.')[0]] += module.self_us
+    return totals
@@ -0,0 +1,112 @@
+"""
+Test runner of the suite (``TEST_RUNNER``).
+
+Migrating the in-memory SQLite test database is the largest fixed cost of a
+run. ``FastTestRunner`` keeps a copy of the migrated database in
+``TEST_TEMPLATE_DIR``, keyed by a digest of every migration file, and restores
+it with SQLite's backup API instead of migrating again; the template is
+rebuilt whenever a migration changes. With ``--parallel`` each forked worker
+starts from a copy of that database.
+
+``--parallel`` defaults to ``SOFTDESK_TEST_PARALLEL`` (e.g. ``auto``) so CI
+can run the suite on every core without changing the command line.
+"""
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.test.runner import DiscoverRunner, get_max_test_processes, parallel_type
+
+
+def migrations_digest():
+    """Digest of the Django version and the migration files of every installed app"""
+    digest = hashlib.sha1(django.get_version().encode())
+    for app_config in sorted(apps.get_app_configs(), key=lambda app_config: app_config.label):
+        for path in sorted(Path(app_config.path, 'migrations').glob('*.py')):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class TemplateDatabase:
+    """Migrated copy of an in-memory SQLite test database, stored on disk"""
+
+    def __init__(self, connection, directory, digest):
+        self.connection = connection
+        self.path = Path(directory) / f'{connection.alias}-{digest}.sqlite3'
+
+    def wrap(self):
+        """Make the connection's create_test_db() restore or save the template"""
+        creation = self.connection.creation
+        create_test_db = creation.create_test_db
+        test_settings = self.connection.settings_dict.setdefault('TEST', {})
+        template = self
+
+        def create_from_template(*args, **kwargs):
+            exists = template.path.exists()
+            migrate = test_settings.get('MIGRATE', True)
+            if exists:
+                # Create the tables from the models (fast), then overwrite
+                # them with the migrated schema and data of the template
+                test_settings['MIGRATE'] = False
+            try:
+                name = create_test_db(*args, **kwargs)
+            finally:
+                test_settings['MIGRATE'] = migrate
+            if exists:
+                template.restore()
+            else:
+                template.save()
+            return name
+
+        creation.create_test_db = create_from_template
+
+    def restore(self):
+        source = sqlite3.connect(self.path)
+        try:
+            self.connection.ensure_connection()
+            source.backup(self.connection.connection)
+        finally:
+            source.close()
+        if hasattr(self.connection, '_test_serialized_contents'):
+            # Serialized for TransactionTestCase.serialized_rollback before the restore
+            self.connection._test_serialized_contents = self.connection.creation.serialize_db_to_string()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in self.path.parent.glob(f'{self.connection.alias}-*.sqlite3'):
+            stale.unlink()
+        partial = self.path.with_suffix('.partial')
+        target = sqlite3.connect(partial)
+        try:
+            self.connection.connection.backup(target)
+        finally:
+            target.close()
+        os.replace(partial, self.path)
+
+
+class FastTestRunner(DiscoverRunner):
+    """DiscoverRunner restoring migrated SQLite templates, parallel by default on CI"""
+
+    def __init__(self, parallel=0, **kwargs):
+        if not parallel and os.environ.get('SOFTDESK_TEST_PARALLEL'):
+            parallel = parallel_type(os.environ['SOFTDESK_TEST_PARALLEL'])
+            if parallel == 'auto':
+                parallel = get_max_test_processes()
+        super().__init__(parallel=parallel, **kwargs)
+
+    def setup_databases(self, **kwargs):
+        directory = getattr(settings, 'TEST_TEMPLATE_DIR', None)
+        if directory:
+            digest = migrations_digest()
+            for connection in connections.all():
+                if connection.vendor == 'sqlite' and connection.creation.is_in_memory_db(
+                    connection.creation._get_test_db_name()
+                ):
+                    TemplateDatabase(connection, directory, digest).wrap()
+        return super().setup_databases(**kwargs)
@@ -0,0 +1,199 @@
+"""
+DRF throttles backed by a local SQLite counter store.
+
+Limits use a sliding-window counter: each key keeps the request count of the
+current and previous fixed windows, and the previous count is weighted by the
+part of it still covered by the sliding window. A check is one primary-key
+lookup and one upsert, and the SQLite file (``THROTTLE_STORE_PATH``) is shared
+by every worker process on the host, so no external Redis is needed.
+"""
+import math
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+class SlidingWindowStore:
+    """Per-key counters for the current and previous window in a SQLite file"""
+
+    # Number of checks between two purges of keys idle for more than a window
+    PURGE_EVERY = 1000
+
+    # Used without a path: shared by the threads of one process only
+    MEMORY_URI = 'file:softdesk-throttle?mode=memory&cache=shared'
+
+    def __init__(self, path=None):
+        self.path = str(path) if path else None
+        self._local = threading.local()
+        self._checks = 0
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            if self.path is None:
+                connection = sqlite3.connect(self.MEMORY_URI, uri=True, isolation_level=None)
+            else:
+                connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS throttle_counter ('
+                ' key TEXT PRIMARY KEY, window INTEGER NOT NULL,'
+                ' current INTEGER NOT NULL, previous INTEGER NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+
+    def hit(self, key, limit, duration, now=None):
+        """
+        Count a request for ``key`` if it stays within ``limit`` per ``duration``.
+
+        Returns ``(allowed, wait)`` where ``wait`` is the number of seconds
+        before a request would be allowed again (0 when allowed).
+        """
+        now = time.time() if now is None else now
+        window = int(now // duration)
+        elapsed = (now % duration) / duration
+
+        connection = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent workers
+        # cannot both read the same count and increment it
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT window, current, previous FROM throttle_counter WHERE key = ?', (key,)
+            ).fetchone()
+            current, previous = _roll(row, window)
+            estimate = previous * (1 - elapsed) + current
+            allowed = estimate < limit
+            if allowed:
+                connection.execute(
+                    'INSERT INTO throttle_counter (key, window, current, previous) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET window = excluded.window, '
+                    'current = excluded.current, previous = excluded.previous',
+                    (key, window, current + 1, previous)
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+        self._checks += 1
+        if self._checks % self.PURGE_EVERY == 0:
+            self.purge(window)
+
+        if allowed:
+            return True, 0
+        return False, _wait(current, previous, elapsed, limit, duration)
+
+    def purge(self, window):
+        """Delete keys that saw no request during the current or previous window"""
+        self._connection().execute('DELETE FROM throttle_counter WHERE window < ?', (window - 1,))
+
+    def clear(self):
+        self._connection().execute('DELETE FROM throttle_counter')
+
+
+def _roll(row, window):
+    """Return ``(current, previous)`` counts of a stored row as seen from ``window``"""
+    if row is None:
+        return 0, 0
+    stored_window, current, previous = row
+    if stored_window == window:
+        return current, previous
+    if stored_window == window - 1:
+        return 0, current
+    return 0, 0
+
+
+def _wait(current, previous, elapsed, limit, duration):
+    """Seconds until the weighted count drops below ``limit``"""
+    if previous:
+        # Solve previous * (1 - t) + current < limit for the window fraction t
+        fraction = 1 - (limit - current) / previous
+        if elapsed < fraction <= 1:
+            return math.ceil((fraction - elapsed) * duration)
+    return math.ceil((1 - elapsed) * duration)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide store for ``THROTTLE_STORE_PATH``"""
+    global _store
+    path = getattr(settings, 'THROTTLE_STORE_PATH', None)
+    path = str(path) if path else None
+    if _store is None or _store.path != path:
+        with _store_lock:
+            _store = SlidingWindowStore(path)
+    return _store
+
+
+class SlidingWindowRateThrottle(BaseThrottle):
+    """
+    Base throttle reading its rate from ``DEFAULT_THROTTLE_RATES[scope]``.
+
+    Subclasses set ``scope`` and implement ``get_cache_key``; returning None
+    skips throttling for that request.
+    """
+    scope = None
+
+    def __init__(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.num_requests, self.duration = SimpleRateThrottle.parse_rate(self, rate)
+        self._wait = None
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError('.get_cache_key() must be overridden')
+
+    def allow_request(self, request, view):
+        if not getattr(settings, 'THROTTLE_ENABLED', True) or self.num_requests is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        allowed, self._wait = get_store().hit(f'{self.scope}:{key}', self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class IPRateThrottle(SlidingWindowRateThrottle):
+    """Limit requests per client IP address"""
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UserRateThrottle(SlidingWindowRateThrottle):
+    """Limit requests per authenticated user, falling back to the client IP"""
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return f'ip-{self.get_ident(request)}'
+
+
+class LoginRateThrottle(IPRateThrottle):
+    scope = 'login'
+
+
+class RegisterRateThrottle(IPRateThrottle):
+    scope = 'register'
+
+
+class WriteRateThrottle(UserRateThrottle):
+    """Limit unsafe methods (POST, PUT, PATCH, DELETE) per user"""
+    scope = 'write'
+
+    def get_cache_key(self, request, view):
+        if request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return None
+        return super().get_cache_key(request, view)
@@ -0,0 +1,15 @@
+"""
+URL configuration of the API-only profile (softDesk.settings_api).
+
+Same API routes as softDesk.urls, without the admin and the browsable API login.
+"""
+from django.urls import path, include
+from .batch import BatchView
+from .metrics import metrics_view
+
+urlpatterns = [
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/', include('accounts.urls')),
+    path('api/', include('projects.urls')),
+    path('metrics', metrics_view, name='metrics'),
+]
@@ -0,0 +1,72 @@
+"""
+Shared test data builders.
+
+Use them from ``setUpTestData`` so a test class builds its dataset once and
+every test runs against it inside a transaction. Users share one password
+hash computed per process, so creating them never runs the password hasher,
+whatever the hasher profile.
+"""
+import functools
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from accounts.models import Contributor
+from projects import stats
+from projects.models import Project, Issue, Comment
+
+User = get_user_model()
+
+PASSWORD = 'securepass123'
+
+
+@functools.lru_cache(maxsize=None)
+def _password_hash(password, hashers):
+    return make_password(password)
+
+
+def password_hash(password=PASSWORD):
+    """Hash of ``password`` with the preferred hasher, computed once per process"""
+    return _password_hash(password, tuple(settings.PASSWORD_HASHERS))
+
+
+def create_user(username, password=PASSWORD, **fields):
+    """A user that can log in with ``password``, created without hashing it"""
+    fields.setdefault('email', f'{username}@test.com')
+    return User.objects.create(username=username, password=password_hash(password), **fields)
+
+
+def create_users(usernames, password=PASSWORD, **fields):
+    """Users sharing the same fields, inserted with one query"""
+    return User.objects.bulk_create(
+        User(username=username, email=f'{username}@test.com', password=password_hash(password), **fields)
+        for username in usernames
+    )
+
+
+def create_project(author, contributors=(), issues=0, comments_per_issue=0, **fields):
+    """
+    A project of ``author`` with ``contributors`` and bulk-created issues and
+    comments for scale tests. Bulk-created issues have no history entries;
+    their statistics are rebuilt.
+    """
+    fields.setdefault('name', 'Test Project')
+    fields.setdefault('type', 'BACK_END')
+    project = Project.objects.create(author=author, **fields)
+    Contributor.objects.bulk_create(
+        Contributor(user=user, project=project, role='CONTRIBUTOR') for user in contributors
+    )
+    if issues:
+        created = Issue.objects.bulk_create(
+            Issue(
+                title=f'Issue {index}', description='Test', tag='BUG', priority='LOW',
+                project=project, author=author
+            )
+            for index in range(issues)
+        )
+        Comment.objects.bulk_create(
+            Comment(description=f'Comment {index}', issue=issue, author=author)
+            for issue in created for index in range(comments_per_issue)
+        )
+        stats.rebuild([project.id])
+    return project
@@ -7,6 +7,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from accounts.models import Contributor
 from projects.models import Project, Issue, Comment
+from tests.fixtures import create_user
 
 User = get_user_model()
 
@@ -14,38 +15,40 @@ User = get_user_model()
 class SoftDeskAPIComplianceTestCase(TestCase):
     """Complete compliance tests with SoftDesk requirements"""
     
-    def setUp(self):
-        """Initial setup"""
-        self.client = APIClient()
-        
+    @classmethod
+    def setUpTestData(cls):
+        """Data shared by every test of the class"""
         # Users
-        self.author = User.objects.create_user(
+        cls.author = create_user(
             username='author', email='author@test.com', password='securepass123', age=25
         )
-        self.contributor = User.objects.create_user(
+        cls.contributor = create_user(
             username='contributor', email='contrib@test.com', password='securepass123', age=30
         )
-        self.outsider = User.objects.create_user(
+        cls.outsider = create_user(
             username='outsider', email='outsider@test.com', password='securepass123', age=28
         )
         
         # Project
-        self.project = Project.objects.create(
-            name='Test Project', description='Test', type='BACK_END', author=self.author
+        cls.project = Project.objects.create(
+            name='Test Project', description='Test', type='BACK_END', author=cls.author
         )
-        Contributor.objects.create(user=self.contributor, project=self.project, role='CONTRIBUTOR')
+        Contributor.objects.create(user=cls.contributor, project=cls.project, role='CONTRIBUTOR')
         
         # Issue
-        self.issue = Issue.objects.create(
+        cls.issue = Issue.objects.create(
             title='Test Issue', description='Test', tag='BUG', priority='MEDIUM',
-            project=self.project, author=self.author, assignee=self.contributor
+            project=cls.project, author=cls.author, assignee=cls.contributor
         )
         
         # Comment
-        self.comment = Comment.objects.create(
-            description='Test comment', issue=self.issue, author=self.contributor
+        cls.comment = Comment.objects.create(
+            description='Test comment', issue=cls.issue, author=cls.contributor
         )
     
+    def setUp(self):
+        self.client = APIClient()
+    
     def test_complete_project_workflow(self):
         """Complete test of project workflow according to specifications"""
         
@@ -154,6 +157,18 @@ class SoftDeskAPIComplianceTestCase(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
+    def test_rgpd_age_gate_json_body(self):
+        """Test GDPR age gate on JSON bodies for both registration endpoints"""
+        
+        for url in ['/api/auth/register/', '/api/users/']:
+            response = self.client.post(url, {
+                'username': 'young', 'email': 'young@test.com', 'password': 'securepass123', 'age': 14
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['error'], 'RGPD Compliance Error')
+        
+        self.assertFalse(User.objects.filter(username='young').exists())
+    
     def test_contributor_management_authorization(self):
         """Test contributor management according to specifications"""
         
@@ -0,0 +1,88 @@
+"""
+Tests for the API-only deployment profile (softDesk.settings_api)
+"""
+import base64
+import os
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.core.management import CommandError, call_command
+from django.test import TestCase, modify_settings, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from accounts import privacy
+from softDesk import settings_api
+
+User = get_user_model()
+
+
+@override_settings(
+    ROOT_URLCONF=settings_api.ROOT_URLCONF,
+    MIDDLEWARE=settings_api.MIDDLEWARE,
+    REST_FRAMEWORK=settings_api.REST_FRAMEWORK,
+)
+class APIProfileTestCase(TestCase):
+    """The API profile only accepts JWT Bearer tokens and does not route the admin"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='api', password='securepass123')
+
+    def test_jwt_requests(self):
+        response = self.client.post('/api/auth/login/', {'username': 'api', 'password': 'securepass123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Set-Cookie', response)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        response = self.client.post('/api/projects/', {'name': 'Api', 'type': 'BACK_END'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get('/api/projects/').json()['count'], 1)
+
+    def test_profile_loads_jwt_only_authentication(self):
+        # DRF reads its defaults when the views are imported: check them in a fresh process
+        script = (
+            'import django; django.setup(); '
+            'from rest_framework.views import APIView; '
+            'print([c.__name__ for c in APIView.authentication_classes + APIView.renderer_classes])'
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'softDesk.settings_api'},
+        ).stdout
+        self.assertEqual(output.strip(), "['JWTAuthentication', 'FastJSONRenderer']")
+
+    @mock.patch.object(APIView, 'authentication_classes', [JWTAuthentication])
+    def test_session_and_basic_authentication_are_not_accepted(self):
+        self.client.login(username='api', password='securepass123')
+        self.assertEqual(self.client.get('/api/projects/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.logout()
+        credentials = base64.b64encode(b'api:securepass123').decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        self.assertEqual(self.client.get('/api/projects/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_admin_is_not_routed(self):
+        self.assertEqual(self.client.get('/admin/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_privacy_worker_requires_the_full_profile(self):
+        removed = [app for app in settings.INSTALLED_APPS if app not in settings_api.INSTALLED_APPS]
+        with modify_settings(INSTALLED_APPS={'remove': removed}):
+            with self.assertRaisesMessage(CommandError, 'DJANGO_SETTINGS_MODULE=softDesk.settings'):
+                call_command('process_privacy_jobs', stdout=StringIO())
+
+        # On the full profile, erasure also deletes the user's admin log entries
+        LogEntry.objects.create(user=self.user, action_flag=ADDITION, object_repr='api')
+        job = privacy.schedule(self.user, 'ERASURE')
+        call_command('process_privacy_jobs', stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'DONE')
+        self.assertFalse(LogEntry.objects.exists())
@@ -0,0 +1,111 @@
+"""
+Tests for the archival of finished issues
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects import archive, notifications
+from projects.models import Project, Issue, Comment, IssueChange, ArchivedIssue, ArchivedComment, Notification
+
+User = get_user_model()
+
+
+class ArchiveTestCase(TestCase):
+    """Tests for the archive_issues command and ?archived=true"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.project = Project.objects.create(name='Archive', type='BACK_END', author=self.author)
+        self.old = self.create_issue(status='FINISHED', days_ago=200)
+        self.comment = Comment.objects.create(description='Done', issue=self.old, author=self.author)
+        self.recent = self.create_issue(status='FINISHED', days_ago=10)
+        self.open = self.create_issue(status='TO_DO', days_ago=200)
+        self.client.force_authenticate(user=self.author)
+        self.issues_url = f'/api/projects/{self.project.id}/issues/'
+
+    def create_issue(self, status, days_ago):
+        issue = Issue.objects.create(
+            title=f'{status} {days_ago}', description='Test', tag='BUG', priority='LOW', status=status,
+            project=self.project, author=self.author
+        )
+        # Backdate the issue and its history
+        past = timezone.now() - timedelta(days=days_ago)
+        Issue.objects.filter(pk=issue.pk).update(created_time=past)
+        IssueChange.objects.filter(issue=issue).update(changed_time=past)
+        return issue
+
+    def archive(self):
+        call_command('archive_issues', '--older-than-days=90', stdout=StringIO())
+
+    def test_only_old_finished_issues_are_moved(self):
+        self.archive()
+        self.assertEqual(list(ArchivedIssue.objects.values_list('pk', flat=True)), [self.old.pk])
+        self.assertEqual(list(ArchivedComment.objects.values_list('pk', flat=True)), [self.comment.pk])
+        self.assertFalse(Issue.objects.filter(pk=self.old.pk).exists())
+        self.assertFalse(Comment.objects.filter(pk=self.comment.pk).exists())
+
+        response = self.client.get(f'/api/projects/{self.project.id}/stats/')
+        self.assertEqual(response.data['by_status']['FINISHED'], 1)
+
+    def test_recent_changes_postpone_archival(self):
+        IssueChange.objects.create(issue=self.old, project=self.project, changed_time=timezone.now(), delta='pH')
+        self.archive()
+        self.assertFalse(ArchivedIssue.objects.exists())
+
+    def test_issues_changed_after_being_picked_are_kept(self):
+        cutoff = timezone.now() - timedelta(days=90)
+        pks = list(archive.candidates(self.project.id, cutoff).values_list('pk', flat=True))
+        self.assertEqual(pks, [self.old.pk])
+        # Reopened between the candidate query and the batch
+        Issue.objects.filter(pk=self.old.pk).update(status='IN_PROGRESS')
+
+        self.assertEqual(archive.archive_batch(pks, archive.candidates(self.project.id, cutoff)), 0)
+        self.assertFalse(ArchivedIssue.objects.exists())
+        self.assertEqual(Issue.objects.get(pk=self.old.pk).status, 'IN_PROGRESS')
+        self.assertTrue(Comment.objects.filter(pk=self.comment.pk).exists())
+
+    def test_pending_notifications_postpone_archival(self):
+        member = User.objects.create_user(username='member', password='securepass123', can_be_contacted=True)
+        Contributor.objects.create(user=member, project=self.project)
+        notifications.record_comment(self.comment)
+        self.archive()
+        self.assertFalse(ArchivedIssue.objects.exists())
+
+        notifications.fan_out()
+        self.assertEqual(Notification.objects.filter(recipient=member, sent_time=None).count(), 1)
+        self.archive()
+        self.assertFalse(ArchivedIssue.objects.exists())
+
+        Notification.objects.update(sent_time=timezone.now())
+        self.archive()
+        self.assertEqual(list(ArchivedIssue.objects.values_list('pk', flat=True)), [self.old.pk])
+
+    def test_archived_issues_are_served_on_request(self):
+        self.archive()
+        response = self.client.get(self.issues_url)
+        self.assertNotIn(self.old.id, [issue['id'] for issue in response.data['results']])
+
+        response = self.client.get(self.issues_url + '?archived=true&include=comments')
+        self.assertEqual([issue['id'] for issue in response.data['results']], [self.old.id])
+        self.assertEqual(response.data['results'][0]['comments'][0]['description'], 'Done')
+
+        response = self.client.get(
+            f'{self.issues_url}{self.old.id}/comments/{self.comment.id}/?archived=true'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(f'{self.issues_url}{self.old.id}/history/?archived=true')
+        self.assertEqual(response.data['changes'][0]['changes']['status']['to'], 'FINISHED')
+
+    def test_archived_issues_are_read_only(self):
+        self.archive()
+        response = self.client.patch(f'{self.issues_url}{self.old.id}/?archived=true', {'title': 'New'})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,81 @@
+"""
+Tests for the cross-project "my work" endpoint
+"""
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects.models import Project, Issue
+
+User = get_user_model()
+
+
+class AssignedIssuesTestCase(TestCase):
+    """Tests for GET /api/issues/assigned/"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.worker = User.objects.create_user(username='worker', password='securepass123')
+        self.projects = [
+            Project.objects.create(name=f'Project {i}', type='BACK_END', author=self.author)
+            for i in range(2)
+        ]
+        for project in self.projects:
+            Contributor.objects.create(user=self.worker, project=project)
+        self.client.force_authenticate(user=self.worker)
+
+    def create_issue(self, project, **kwargs):
+        fields = {'title': 'Issue', 'description': 'Test', 'tag': 'BUG', 'priority': 'LOW', 'assignee': self.worker}
+        fields.update(kwargs)
+        return Issue.objects.create(project=project, author=self.author, **fields)
+
+    def test_lists_assigned_issues_across_projects(self):
+        mine = [self.create_issue(project) for project in self.projects]
+        self.create_issue(self.projects[0], assignee=self.author)
+
+        response = self.client.get('/api/issues/assigned/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({issue['id'] for issue in response.data['results']}, {issue.id for issue in mine})
+
+    def test_status_and_priority_filters(self):
+        expected = self.create_issue(self.projects[0], status='IN_PROGRESS', priority='HIGH')
+        self.create_issue(self.projects[0], status='IN_PROGRESS', priority='LOW')
+        self.create_issue(self.projects[1], status='FINISHED', priority='HIGH')
+
+        response = self.client.get('/api/issues/assigned/?status=TO_DO,IN_PROGRESS&priority=HIGH')
+        self.assertEqual([issue['id'] for issue in response.data['results']], [expected.id])
+
+        response = self.client.get('/api/issues/assigned/?status=DONE')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_issues_of_left_projects_are_hidden(self):
+        self.create_issue(self.projects[1])
+        Contributor.objects.filter(user=self.worker, project=self.projects[1]).delete()
+
+        response = self.client.get('/api/issues/assigned/')
+        self.assertEqual(response.data['results'], [])
+
+    def test_cursor_pagination(self):
+        for _ in range(25):
+            self.create_issue(self.projects[0])
+
+        response = self.client.get('/api/issues/assigned/')
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIn('cursor=', response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+
+    def test_query_uses_assignee_index(self):
+        queryset = Issue.objects.filter(
+            assignee=self.worker, status='TO_DO', project__contributors__user=self.worker
+        ).order_by('-created_time')
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('issue_assignee_status_idx', plan)
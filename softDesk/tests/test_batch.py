@@ -0,0 +1,95 @@
+"""
+Tests for the batch endpoint
+"""
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects.models import Project, Issue
+from softDesk import metrics
+
+User = get_user_model()
+
+
+class BatchTestCase(TestCase):
+    """Tests for POST /api/batch/"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.outsider = User.objects.create_user(username='outsider', password='securepass123')
+        self.project = Project.objects.create(name='Batch', type='BACK_END', author=self.author)
+        self.issue = Issue.objects.create(
+            title='Issue', description='Test', tag='BUG', priority='LOW', project=self.project, author=self.author
+        )
+        self.client.force_authenticate(user=self.author)
+
+    def batch(self, *requests):
+        return self.client.post('/api/batch/', {'requests': list(requests)}, format='json')
+
+    def test_results_are_returned_in_order(self):
+        response = self.batch(
+            {'id': 'projects', 'method': 'GET', 'path': '/api/projects/'},
+            {'id': 'issue', 'method': 'GET', 'path': f'/api/projects/{self.project.id}/issues/{self.issue.id}/'},
+            {'id': 'missing', 'method': 'GET', 'path': '/api/nowhere/'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        responses = response.data['responses']
+        self.assertEqual([r['id'] for r in responses], ['projects', 'issue', 'missing'])
+        self.assertEqual([r['status'] for r in responses], [200, 200, 404])
+        self.assertEqual(responses[0]['body']['results'][0]['name'], 'Batch')
+        self.assertEqual(responses[1]['body']['title'], 'Issue')
+
+    def test_writes_are_applied_before_following_reads(self):
+        response = self.batch(
+            {'method': 'POST', 'path': f'/api/projects/{self.project.id}/issues/',
+             'body': {'title': 'New', 'description': 'Test', 'tag': 'TASK', 'priority': 'HIGH'}},
+            {'method': 'GET', 'path': f'/api/projects/{self.project.id}/issues/?priority=HIGH'},
+        )
+        created, listed = response.data['responses']
+        self.assertEqual(created['status'], status.HTTP_201_CREATED)
+        self.assertEqual([issue['id'] for issue in listed['body']['results']], [created['body']['id']])
+
+    def test_sub_requests_use_the_caller_permissions(self):
+        self.client.force_authenticate(user=self.outsider)
+        response = self.batch({'method': 'GET', 'path': f'/api/projects/{self.project.id}/issues/'})
+        self.assertEqual(response.data['responses'][0]['status'], status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=None)
+        response = self.batch({'method': 'GET', 'path': '/api/projects/'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_membership_is_checked_once_per_batch(self):
+        Contributor.objects.create(user=self.outsider, project=self.project)
+        self.client.force_authenticate(user=self.outsider)
+        misses = metrics.CACHE_REQUESTS.get(cache='membership', result='miss')
+        response = self.batch(*[
+            {'method': 'GET', 'path': f'/api/projects/{self.project.id}/issues/'} for _ in range(3)
+        ])
+        self.assertEqual([r['status'] for r in response.data['responses']], [200, 200, 200])
+        self.assertEqual(metrics.CACHE_REQUESTS.get(cache='membership', result='miss'), misses + 1)
+
+    def test_sub_requests_reuse_the_caller_token_and_record_metrics(self):
+        self.client.force_authenticate(user=None)
+        login = self.client.post('/api/auth/login/', {'username': 'author', 'password': 'securepass123'})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access']}")
+        before = metrics.HTTP_REQUESTS.get(route='project-issues-list', method='GET', status=200)
+
+        response = self.batch(*[
+            {'method': 'GET', 'path': f'/api/projects/{self.project.id}/issues/'} for _ in range(2)
+        ])
+        self.assertEqual([r['status'] for r in response.data['responses']], [200, 200])
+        self.assertEqual(metrics.HTTP_REQUESTS.get(route='project-issues-list', method='GET', status=200), before + 2)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_invalid_batches_are_rejected(self):
+        response = self.batch(*[{'method': 'GET', 'path': '/api/projects/'}] * 3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.batch(
+            {'method': 'GET', 'path': '/api/batch/'},
+            {'method': 'TRACE', 'path': '/admin/'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data['errors']), {0, 1})
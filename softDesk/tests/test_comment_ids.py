@@ -0,0 +1,62 @@
+"""
+Tests for the time-ordered comment identifiers
+"""
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from projects.models import Project, Issue, Comment
+from softDesk.ids import UUID7Generator, uuid7, uuid7_time
+
+User = get_user_model()
+
+
+class CommentIdTestCase(TestCase):
+    """Tests for uuid7 comment primary keys"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.project = Project.objects.create(name='Ids', type='BACK_END', author=self.author)
+        self.issue = Issue.objects.create(
+            title='Issue', description='Test', tag='BUG', priority='LOW', project=self.project, author=self.author
+        )
+        self.client.force_authenticate(user=self.author)
+        self.url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+
+    def test_uuid7_layout_and_order(self):
+        ids = [uuid7() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertTrue(all(value.version == 7 and value.variant == uuid.RFC_4122 for value in ids))
+        self.assertAlmostEqual(uuid7_time(ids[0]) / 1000, timezone.now().timestamp(), delta=5)
+
+    def test_same_millisecond_keys_stay_ordered(self):
+        generator = UUID7Generator()
+        ids = [generator(1_700_000_000_000) for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_comments_get_time_ordered_ids_and_keep_their_route(self):
+        response = self.client.post(self.url, {'description': 'Hello'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(uuid.UUID(str(response.data['id'])).version, 7)
+
+        response = self.client.get(f"{self.url}{response.data['id']}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_rekey_existing_comments(self):
+        now = timezone.now()
+        for minutes in (30, 20, 10):
+            comment = Comment.objects.create(id=uuid.uuid4(), description=f'{minutes}', issue=self.issue, author=self.author)
+            Comment.objects.filter(pk=comment.pk).update(created_time=now - timedelta(minutes=minutes))
+
+        call_command('rekey_comments', stdout=StringIO())
+        comments = list(Comment.objects.order_by('id'))
+        self.assertEqual([c.description for c in comments], ['30', '20', '10'])
+        self.assertTrue(all(c.id.version == 7 for c in comments))
@@ -0,0 +1,107 @@
+"""
+Tests for the negotiated response compression
+"""
+import gzip
+import io
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import FileResponse, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from projects.models import Project, Issue
+from softDesk import compression
+from softDesk.compression import CompressionMiddleware, negotiate
+
+User = get_user_model()
+
+
+class CompressionTestCase(TestCase):
+    """Tests for CompressionMiddleware"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.project = Project.objects.create(name='Gzip', type='BACK_END', author=self.author)
+        Issue.objects.bulk_create(
+            Issue(title=f'Issue {index}', description='Long description ' * 20, tag='BUG', priority='LOW',
+                  project=self.project, author=self.author)
+            for index in range(20)
+        )
+        self.client.force_authenticate(user=self.author)
+        self.url = f'/api/projects/{self.project.id}/issues/'
+
+    def test_negotiation(self):
+        self.assertEqual(negotiate('gzip, deflate, br'), 'gzip')
+        self.assertEqual(negotiate('*'), next(iter(compression.CODECS)))
+        self.assertIsNone(negotiate('gzip;q=0, br'))
+        self.assertIsNone(negotiate(''))
+
+    def test_large_responses_are_compressed(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(plain['Vary'].split(', ')[-1], 'Accept-Encoding')
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content), len(plain.content) / 4)
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_compressed_bodies_are_randomly_padded(self):
+        lengths = set()
+        for _ in range(5):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(gzip.decompress(response.content), self.client.get(self.url).content)
+            lengths.add(len(response.content))
+        self.assertGreater(len(lengths), 1)
+
+        body = b'{"a": 1}' * 100
+        self.assertEqual(gzip.decompress(compression.pad('gzip', compression.compress('gzip', body))), body)
+        if compression.zstd is not None:
+            padded = compression.pad('zstd', compression.compress('zstd', body))
+            self.assertEqual(compression.zstd.decompress(padded), body)
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_responses_carrying_tokens_are_not_compressed(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(
+            '/api/auth/login/', {'username': 'author', 'password': 'securepass123'}, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertIn('access', response.json())
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_small_responses_are_left_alone(self):
+        response = self.client.get(f'/api/projects/{self.project.id}/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_compressed_bodies_are_cached(self):
+        with mock.patch.dict(compression.CODECS, {'gzip': (mock.Mock(return_value=b'z'), None)}):
+            compress_bytes = compression.CODECS['gzip'][0]
+            body = b'x' * 20000
+            self.assertEqual(compression.compress('gzip', body), b'z')
+            self.assertEqual(compression.compress('gzip', body), b'z')
+            compression.compress('gzip', body + b'y')
+        self.assertEqual(compress_bytes.call_count, 2)
+
+    def test_streaming_responses_are_compressed_lazily(self):
+        content = json.dumps([{'row': index} for index in range(5000)]).encode()
+        request = RequestFactory().get('/api/users/privacy-jobs/1/download/', HTTP_ACCEPT_ENCODING='gzip')
+        middleware = CompressionMiddleware(lambda request: FileResponse(
+            io.BytesIO(content), as_attachment=True, filename='export.json', content_type='application/json'
+        ))
+        response = middleware(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), content)
+
+    def test_already_encoded_or_binary_responses_are_skipped(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        for response in (
+            HttpResponse(b'x' * 5000, content_type='image/png'),
+            HttpResponse(b'x' * 5000, content_type='application/json', headers={'Content-Encoding': 'br'}),
+        ):
+            self.assertEqual(CompressionMiddleware(lambda request: response)(request).content, response.content)
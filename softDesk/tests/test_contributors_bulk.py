@@ -0,0 +1,94 @@
+"""
+Tests for bulk contributor management
+"""
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts import membership
+from accounts.models import Contributor
+from projects.models import Project
+
+User = get_user_model()
+
+
+class ContributorBulkTestCase(TestCase):
+    """Tests for POST /api/projects/{id}/users/bulk/"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.project = Project.objects.create(name='Team', type='BACK_END', author=self.author)
+        self.users = [
+            User.objects.create_user(username=f'member{i}', password='securepass123') for i in range(5)
+        ]
+        self.url = f'/api/projects/{self.project.id}/users/bulk/'
+        self.client.force_authenticate(user=self.author)
+
+    def member_ids(self):
+        return set(Contributor.objects.filter(project=self.project).values_list('user_id', flat=True))
+
+    def test_bulk_add_uses_a_fixed_number_of_queries(self):
+        ids = [user.id for user in self.users]
+        # Project, user validation, then the rows already present and one
+        # insert inside the transaction
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, {'add': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['added'], ids)
+        self.assertEqual(self.member_ids(), set(ids) | {self.author.id})
+
+    def test_existing_contributors_are_reported_not_duplicated(self):
+        Contributor.objects.create(user=self.users[0], project=self.project)
+        response = self.client.post(self.url, {'add': [self.users[0].id, self.users[1].id]}, format='json')
+        self.assertEqual(response.data['added'], [self.users[1].id])
+        self.assertEqual(response.data['already_contributors'], [self.users[0].id])
+
+    def test_rows_added_concurrently_are_not_reported_as_added(self):
+        check_users = membership.check_users
+
+        def racing_check_users(project, user_ids):
+            result = check_users(project, user_ids)
+            # Another request adds users[0] between the check and the insert
+            Contributor.objects.create(user=self.users[0], project=project)
+            return result
+
+        with mock.patch.object(membership, 'check_users', racing_check_users):
+            response = self.client.post(self.url, {'add': [self.users[0].id, self.users[1].id]}, format='json')
+        self.assertEqual(response.data['added'], [self.users[1].id])
+        self.assertEqual(response.data['already_contributors'], [self.users[0].id])
+
+    def test_unknown_users_reject_the_whole_request(self):
+        response = self.client.post(self.url, {'add': [self.users[0].id, 999999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('999999', response.data['add'])
+        self.assertEqual(self.member_ids(), {self.author.id})
+
+    def test_bulk_remove_keeps_the_author(self):
+        for user in self.users[:2]:
+            Contributor.objects.create(user=user, project=self.project)
+        response = self.client.post(
+            self.url, {'remove': [self.users[0].id, self.author.id, self.users[4].id]}, format='json'
+        )
+        self.assertEqual(response.data['removed'], [self.users[0].id])
+        self.assertEqual(response.data['not_removed'], [self.author.id, self.users[4].id])
+        self.assertEqual(self.member_ids(), {self.author.id, self.users[1].id})
+
+    def test_only_the_project_author_can_manage_contributors(self):
+        Contributor.objects.create(user=self.users[0], project=self.project)
+        self.client.force_authenticate(user=self.users[0])
+        response = self.client.post(self.url, {'add': [self.users[1].id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_memberships_are_visible_to_later_batch_requests(self):
+        member = self.users[0]
+        response = self.client.post('/api/batch/', {'requests': [
+            {'method': 'POST', 'path': self.url, 'body': {'add': [member.id]}},
+        ]}, format='json')
+        self.assertEqual(response.data['responses'][0]['status'], status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=member)
+        response = self.client.get(f'/api/projects/{self.project.id}/issues/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
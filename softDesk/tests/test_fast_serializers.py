@@ -0,0 +1,65 @@
+"""
+Tests for the values()-based fast-path list serializers
+"""
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from accounts.views import ContributorViewSet
+from projects.models import Project, Issue, Comment
+from projects.serializers import IssueListSerializer
+from projects.views import ProjectViewSet, IssueViewSet, AssignedIssueViewSet, CommentViewSet
+
+User = get_user_model()
+
+
+class FastListTestCase(TestCase):
+    """The fast path must render exactly what the regular serializers render"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.member = User.objects.create_user(username='member', password='securepass123')
+        self.project = Project.objects.create(name='Fast', description='Déjà ✓', type='BACK_END', author=self.author)
+        Project.objects.create(name='Other', type='IOS', author=self.author)
+        Contributor.objects.create(user=self.member, project=self.project, role='CONTRIBUTOR')
+        for index in range(4):
+            issue = Issue.objects.create(
+                title=f'Issue {index}', description='Test', tag='BUG', priority='LOW', project=self.project,
+                author=self.author, assignee=self.author if index % 2 else None
+            )
+            Comment.objects.create(description=f'Comment {index}', issue=issue, author=self.member)
+        self.issue = issue
+        self.client.force_authenticate(user=self.author)
+
+    def assertSameList(self, viewset, url):
+        fast = self.client.get(url)
+        with mock.patch.object(viewset, 'use_fast_list', return_value=False):
+            regular = self.client.get(url)
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast.content, regular.content)
+        return fast.json()
+
+    def test_lists_match_regular_serializers(self):
+        base = f'/api/projects/{self.project.id}'
+        self.assertSameList(ProjectViewSet, '/api/projects/')
+        data = self.assertSameList(IssueViewSet, f'{base}/issues/?ordering=created_time')
+        self.assertNotIn('assignee_username', data['results'][0])
+        self.assertSameList(IssueViewSet, f'{base}/issues/?status=TO_DO&page=1')
+        data = self.assertSameList(AssignedIssueViewSet, '/api/issues/assigned/')
+        self.assertEqual(len(data['results']), 2)
+        self.assertSameList(CommentViewSet, f'{base}/issues/{self.issue.id}/comments/')
+        data = self.assertSameList(ContributorViewSet, f'{base}/users/')
+        self.assertEqual(data['results'][-1]['username'], 'member')
+
+    def test_fast_path_is_used_for_plain_lists_only(self):
+        url = f'/api/projects/{self.project.id}/issues/'
+        with mock.patch.object(IssueListSerializer, 'serialize', wraps=IssueListSerializer.serialize) as serialize:
+            self.client.get(url + '?include=comments')
+            self.client.get(url + '?archived=true')
+            serialize.assert_not_called()
+            self.client.get(url)
+            serialize.assert_called_once()
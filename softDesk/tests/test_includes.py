@@ -0,0 +1,65 @@
+"""
+Tests for compound documents requested with ?include=
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects.models import Project, Issue, Comment
+from softDesk.queryinspector import QueryScalingAssertionsMixin
+
+User = get_user_model()
+
+
+class IncludeTestCase(QueryScalingAssertionsMixin, TestCase):
+    """Tests for ?include=comments,contributors"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.project = Project.objects.create(name='Include', type='BACK_END', author=self.author)
+        self.issue = self.create_issue()
+        Comment.objects.create(description='First', issue=self.issue, author=self.author)
+        self.client.force_authenticate(user=self.author)
+
+    def create_issue(self):
+        return Issue.objects.create(
+            title='Issue', description='Test', tag='BUG', priority='LOW', project=self.project, author=self.author
+        )
+
+    def add_rows(self):
+        for i in range(3):
+            user = User.objects.create_user(username=f'user{User.objects.count()}', password='securepass123')
+            Contributor.objects.create(user=user, project=self.project)
+            issue = self.create_issue()
+            Comment.objects.create(description=f'Comment {i}', issue=issue, author=user)
+            Comment.objects.create(description=f'Reply {i}', issue=self.issue, author=user)
+
+    def test_issue_detail_embeds_comments_and_contributors(self):
+        response = self.client.get(
+            f'/api/projects/{self.project.id}/issues/{self.issue.id}/?include=comments,contributors'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c['description'] for c in response.data['comments']], ['First'])
+        self.assertEqual(response.data['contributors'][0]['username'], 'author')
+        self.assertEqual(response.data['contributors'][0]['role'], 'AUTHOR')
+
+    def test_nothing_is_embedded_by_default(self):
+        response = self.client.get(f'/api/projects/{self.project.id}/issues/{self.issue.id}/')
+        self.assertNotIn('comments', response.data)
+        self.assertNotIn('contributors', response.data)
+
+    def test_project_embeds_contributors(self):
+        response = self.client.get(f'/api/projects/{self.project.id}/?include=contributors')
+        self.assertEqual([c['username'] for c in response.data['contributors']], ['author'])
+
+    def test_unknown_include_is_rejected(self):
+        response = self.client.get(f'/api/projects/{self.project.id}/?include=comments')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_is_fixed(self):
+        self.assertQueryCountStable(
+            f'/api/projects/{self.project.id}/issues/?include=comments,contributors', self.add_rows
+        )
+        self.assertQueryCountStable('/api/projects/?include=contributors', self.add_rows)
@@ -0,0 +1,99 @@
+"""
+Tests for issue filtering and ordering, including their query plans
+"""
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects.models import Project, Issue
+from softDesk.queryinspector import explain, full_scans
+
+User = get_user_model()
+
+
+class IssueFilterTestCase(TestCase):
+    """Tests for the filters and orderings of the project issues list"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.contributor = User.objects.create_user(username='contributor', password='securepass123')
+        self.project = Project.objects.create(name='Filters', type='BACK_END', author=self.author)
+        Contributor.objects.create(user=self.contributor, project=self.project)
+        self.bug = self.create_issue(tag='BUG', priority='HIGH', assignee=self.contributor)
+        self.task = self.create_issue(tag='TASK', priority='LOW', status='IN_PROGRESS', author=self.contributor)
+        self.client.force_authenticate(user=self.author)
+        self.url = f'/api/projects/{self.project.id}/issues/'
+
+    def create_issue(self, **kwargs):
+        fields = {'title': 'Issue', 'description': 'Test', 'tag': 'BUG', 'priority': 'LOW', 'author': self.author}
+        fields.update(kwargs)
+        return Issue.objects.create(project=self.project, **fields)
+
+    def ids(self, query):
+        response = self.client.get(self.url + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return [issue['id'] for issue in response.data['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.ids('?tag=BUG'), [self.bug.id])
+        self.assertEqual(self.ids('?priority=LOW,MEDIUM'), [self.task.id])
+        self.assertEqual(self.ids('?status=IN_PROGRESS'), [self.task.id])
+        self.assertEqual(self.ids(f'?assignee={self.contributor.id}'), [self.bug.id])
+        self.assertEqual(self.ids('?assignee=none'), [self.task.id])
+        self.assertEqual(self.ids(f'?author={self.contributor.id}'), [self.task.id])
+
+    def test_created_time_range(self):
+        Issue.objects.filter(pk=self.bug.pk).update(created_time=timezone.now() - timedelta(days=10))
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual(self.ids(f'?created_after={since}'), [self.task.id])
+        self.assertEqual(self.ids(f'?created_before={since}'), [self.bug.id])
+
+    def test_invalid_filters_are_rejected(self):
+        for query in ('?status=DONE', '?assignee=me', '?created_after=yesterday'):
+            response = self.client.get(self.url + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_ordering_is_whitelisted(self):
+        self.assertEqual(self.ids('?ordering=tag'), [self.bug.id, self.task.id])
+        self.assertEqual(self.ids('?ordering=-tag'), [self.task.id, self.bug.id])
+        # Unknown fields are ignored and the default ordering applies
+        self.assertEqual(self.ids('?ordering=description'), [self.task.id, self.bug.id])
+
+    def test_ties_are_broken_by_creation_time_and_id(self):
+        Issue.objects.bulk_create([
+            Issue(title=f'Tie {index}', description='Test', tag='BUG', priority='LOW', project=self.project, author=self.author)
+            for index in range(30)
+        ])
+        Issue.objects.update(created_time=timezone.now())
+        ties = list(Issue.objects.filter(title__startswith='Tie').order_by('-id').values_list('id', flat=True))
+        # Descending orderings read the index backwards, ties included
+        for ordering, expected in (('status', ties), ('-priority', ties[::-1])):
+            query = f'?ordering={ordering}&status=TO_DO&priority=LOW'
+            self.assertEqual(self.ids(query) + self.ids(query + '&page=2'), expected, ordering)
+
+    def test_query_plans_use_indexes(self):
+        expected_index = {
+            '': 'issue_project_created_idx',
+            '?status=TO_DO': 'issue_project_status_idx',
+            '?priority=HIGH': 'issue_project_priority_idx',
+            '?tag=BUG': 'issue_project_tag_idx',
+            f'?assignee={self.contributor.id}': 'issue_project_assignee_idx',
+            f'?author={self.author.id}': 'issue_project_author_idx',
+            '?created_after=2020-01-01': 'issue_project_created_idx',
+            '?ordering=status': 'issue_project_status_idx',
+            '?ordering=-priority': 'issue_project_priority_idx',
+        }
+        for query, index in expected_index.items():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(self.url + query)
+            sql = [q['sql'] for q in queries.captured_queries if 'projects_issue' in q['sql']][-1]
+            plan = explain(sql)
+            self.assertTrue(any(index in step for step in plan), f"{query}: {plan}")
+            self.assertEqual(full_scans(plan), [], query)
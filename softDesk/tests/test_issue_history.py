@@ -0,0 +1,94 @@
+"""
+Tests for the append-only issue history
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects import history
+from projects.models import Project, Issue, IssueChange
+from softDesk.queryinspector import explain, full_scans
+
+User = get_user_model()
+
+
+class IssueHistoryTestCase(TestCase):
+    """Tests for IssueChange, the history endpoint and time in status"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.contributor = User.objects.create_user(username='contributor', password='securepass123')
+        self.project = Project.objects.create(name='History', type='BACK_END', author=self.author)
+        Contributor.objects.create(user=self.contributor, project=self.project)
+        self.issue = Issue.objects.create(
+            title='Issue', description='Test', tag='BUG', priority='LOW', project=self.project, author=self.author
+        )
+        self.client.force_authenticate(user=self.author)
+        self.url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/'
+
+    def test_encoding_round_trip(self):
+        changes = {'status': 'IN_PROGRESS', 'priority': 'HIGH', 'assignee_id': 17}
+        self.assertEqual(history.encode(changes), 'sP;pH;a17')
+        self.assertEqual(history.decode('sP;pH;a17'), changes)
+        self.assertEqual(history.decode(history.encode({'assignee_id': None})), {'assignee_id': None})
+
+    def test_only_changed_fields_are_stored(self):
+        self.client.patch(self.url, {'status': 'IN_PROGRESS', 'assignee': self.contributor.id})
+        self.client.patch(self.url, {'title': 'Renamed'})
+        self.client.patch(self.url, {'status': 'IN_PROGRESS'})
+        self.assertEqual(
+            list(self.issue.changes.order_by('changed_time', 'id').values_list('delta', flat=True)),
+            ['sT;pL;a', f'sP;a{self.contributor.id}']
+        )
+
+    def test_history_endpoint(self):
+        self.client.patch(self.url, {'status': 'FINISHED'})
+        response = self.client.get(self.url + 'history/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        created, finished = response.data['changes']
+        self.assertEqual(created['changes']['status'], {'from': None, 'to': 'TO_DO'})
+        self.assertEqual(finished['changes'], {'status': {'from': 'TO_DO', 'to': 'FINISHED'}})
+        self.assertEqual(finished['actor_id'], self.author.id)
+        self.assertEqual(set(response.data['time_in_status']), {'TO_DO', 'IN_PROGRESS', 'FINISHED'})
+
+    def test_history_is_restricted_to_contributors(self):
+        outsider = User.objects.create_user(username='outsider', password='securepass123')
+        self.client.force_authenticate(user=outsider)
+        response = self.client.get(self.url + 'history/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_time_in_status(self):
+        start = timezone.now() - timedelta(hours=10)
+        other = Issue.objects.create(
+            title='Other', description='Test', tag='BUG', priority='LOW', project=self.project, author=self.author
+        )
+        IssueChange.objects.all().delete()
+        for issue, hours, delta in (
+            (self.issue, 0, 'sT;pL;a'), (self.issue, 2, 'sP'), (self.issue, 3, 'pH'), (self.issue, 6, 'sF'),
+            (other, 4, 'sT;pL;a'),
+        ):
+            IssueChange.objects.create(
+                issue=issue, project=self.project, changed_time=start + timedelta(hours=hours), delta=delta
+            )
+
+        summary = history.project_time_in_status(self.project, now=start + timedelta(hours=10))
+        self.assertEqual(summary['TO_DO'], {'total_seconds': 8 * 3600, 'issues': 2, 'average_seconds': 4 * 3600})
+        self.assertEqual(summary['IN_PROGRESS']['total_seconds'], 4 * 3600)
+        self.assertEqual(summary['FINISHED']['issues'], 1)
+
+        response = self.client.get(f'/api/projects/{self.project.id}/time-in-status/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['IN_PROGRESS']['issues'], 1)
+
+    def test_time_in_status_is_one_index_scan(self):
+        queryset = IssueChange.objects.filter(project=self.project).order_by(
+            'issue_id', 'changed_time', 'id'
+        ).values_list('issue_id', 'changed_time', 'delta')
+        plan = explain(*queryset.query.sql_with_params())
+        self.assertIn('issue_change_project_idx', ' '.join(plan))
+        self.assertEqual(full_scans(plan), [])
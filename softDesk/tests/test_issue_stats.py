@@ -0,0 +1,104 @@
+"""
+Tests for the pre-aggregated issue statistics
+"""
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects.models import Project, Issue, IssueStatistic
+
+User = get_user_model()
+
+
+class IssueStatisticsTestCase(TestCase):
+    """Tests for IssueStatistic maintenance and the stats endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.contributor = User.objects.create_user(username='contributor', password='securepass123')
+        self.outsider = User.objects.create_user(username='outsider', password='securepass123')
+        self.project = Project.objects.create(name='Stats', type='BACK_END', author=self.author)
+        Contributor.objects.create(user=self.contributor, project=self.project)
+
+    def create_issue(self, **kwargs):
+        fields = {
+            'title': 'Issue', 'description': 'Test', 'tag': 'BUG', 'priority': 'LOW',
+            'project': self.project, 'author': self.author,
+        }
+        fields.update(kwargs)
+        return Issue.objects.create(**fields)
+
+    def snapshot(self):
+        return sorted(
+            IssueStatistic.objects.filter(count__gt=0).values_list(
+                'project_id', 'assignee_id', 'status', 'priority', 'tag', 'count'
+            )
+        )
+
+    def test_counts_follow_create_update_and_delete(self):
+        issue = self.create_issue(assignee=self.contributor)
+        self.create_issue(tag='FEATURE', priority='HIGH')
+
+        issue = Issue.objects.get(pk=issue.pk)
+        issue.status = 'IN_PROGRESS'
+        issue.save()
+        Issue.objects.get(pk=issue.pk).delete()
+
+        incremental = self.snapshot()
+        call_command('rebuild_issue_stats', stdout=open('/dev/null', 'w'))
+        self.assertEqual(incremental, self.snapshot())
+        self.assertEqual(incremental, [(self.project.id, None, 'TO_DO', 'HIGH', 'FEATURE', 1)])
+
+    def test_status_transition_through_the_api(self):
+        issue = self.create_issue(assignee=self.contributor)
+        self.client.force_authenticate(user=self.author)
+        response = self.client.patch(
+            f'/api/projects/{self.project.id}/issues/{issue.id}/', {'status': 'FINISHED'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(f'/api/projects/{self.project.id}/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 1)
+        self.assertEqual(response.data['by_status'], {'TO_DO': 0, 'IN_PROGRESS': 0, 'FINISHED': 1})
+        self.assertEqual(response.data['by_assignee'][0]['open'], 0)
+
+    def test_stats_are_restricted_to_contributors(self):
+        self.client.force_authenticate(user=self.outsider)
+        response = self.client.get(f'/api/projects/{self.project.id}/stats/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_assigned_stats(self):
+        self.create_issue(assignee=self.contributor)
+        self.create_issue(assignee=self.contributor, status='IN_PROGRESS')
+        self.create_issue(assignee=self.contributor, status='FINISHED')
+        self.create_issue(assignee=self.author)
+
+        self.client.force_authenticate(user=self.contributor)
+        response = self.client.get('/api/projects/assigned-stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['open'], 2)
+        self.assertEqual(response.data['projects'][0]['by_status'], {'TO_DO': 1, 'IN_PROGRESS': 1})
+
+    def test_stats_query_count_does_not_depend_on_issue_count(self):
+        self.client.force_authenticate(user=self.author)
+        url = f'/api/projects/{self.project.id}/stats/'
+        self.create_issue()
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        for _ in range(20):
+            self.create_issue()
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    def test_deleting_a_user_keeps_statistics_consistent(self):
+        self.create_issue(assignee=self.contributor)
+        self.create_issue(author=self.contributor)
+        self.contributor.delete()
+
+        incremental = self.snapshot()
+        call_command('rebuild_issue_stats', stdout=open('/dev/null', 'w'))
+        self.assertEqual(incremental, self.snapshot())
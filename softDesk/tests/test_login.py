@@ -0,0 +1,63 @@
+"""
+Tests for the login pipeline: hashing, password checks and last_login updates
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+
+User = get_user_model()
+
+
+class LoginPipelineTestCase(TestCase):
+    """Tests for registration and login costs"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='login', email='login@test.com', password='securepass123', age=25
+        )
+
+    def login(self, password='securepass123'):
+        return self.client.post('/api/auth/login/', {'username': 'login', 'password': password})
+
+    def test_registration_hashes_password_once(self):
+        # UserManager and AbstractBaseUser.set_password each import make_password
+        with mock.patch('django.contrib.auth.models.make_password', wraps=make_password) as manager, \
+                mock.patch('django.contrib.auth.base_user.make_password', wraps=make_password) as setter:
+            response = self.client.post('/api/auth/register/', {
+                'username': 'newcomer', 'email': 'new@test.com', 'password': 'securepass123', 'age': 20
+            })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(manager.call_count + setter.call_count, 1)
+        self.assertTrue(User.objects.get(username='newcomer').check_password('securepass123'))
+
+    def test_every_login_checks_the_password(self):
+        for _ in range(2):
+            with mock.patch.object(User, 'check_password', autospec=True, return_value=True) as check_password:
+                self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            check_password.assert_called_once()
+        self.assertEqual(self.login('wrongpass').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_applies_to_the_next_login(self):
+        self.login()
+        self.user.set_password('anotherpass456')
+        self.user.save()
+        self.assertEqual(self.login().status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.login('anotherpass456').status_code, status.HTTP_200_OK)
+
+    @override_settings(LAST_LOGIN_UPDATE_INTERVAL=60)
+    def test_last_login_updates_are_coalesced(self):
+        self.login()
+        self.user.refresh_from_db()
+        first = self.user.last_login
+        self.assertIsNotNone(first)
+
+        self.login()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, first)
@@ -0,0 +1,129 @@
+"""
+Tests for the Prometheus metrics endpoint
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from projects.models import Project
+from softDesk import metrics
+
+User = get_user_model()
+
+
+class MetricsTestCase(TestCase):
+    """Tests for the metrics registry and the /metrics endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='metrics', email='metrics@test.com', password='securepass123', age=25
+        )
+        self.project = Project.objects.create(
+            name='Metrics Project', description='Test', type='BACK_END', author=self.user
+        )
+
+    def test_requests_are_counted_per_route_name(self):
+        self.client.force_authenticate(user=self.user)
+        before = metrics.HTTP_REQUESTS.get(route='project-issues-list', method='GET', status=200)
+        _, pages_before = metrics.PAGINATION_DEPTH.get(route='project-issues-list')
+
+        response = self.client.get(f'/api/projects/{self.project.id}/issues/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            metrics.HTTP_REQUESTS.get(route='project-issues-list', method='GET', status=200),
+            before + 1
+        )
+        self.assertEqual(metrics.PAGINATION_DEPTH.get(route='project-issues-list')[1], pages_before + 1)
+
+    def test_jwt_refresh_is_counted(self):
+        login = self.client.post('/api/auth/login/', {'username': 'metrics', 'password': 'securepass123'})
+        refreshes = metrics.JWT_REFRESH.get()
+
+        response = self.client.post('/api/auth/refresh/', {'refresh': login.data['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(metrics.JWT_REFRESH.get(), refreshes + 1)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get('/api/projects/')
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('# TYPE softdesk_http_request_duration_seconds histogram', body)
+        self.assertIn('softdesk_http_requests_total{route="project-list",method="GET",status="200"}', body)
+
+    @override_settings(METRICS_TOKEN=None, METRICS_ALLOWED_IPS=[])
+    def test_metrics_endpoint_is_closed_by_default(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='scrape-secret', METRICS_ALLOWED_IPS=['10.0.0.5'])
+    def test_metrics_endpoint_requires_the_token_or_an_allowed_address(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.0.6').status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get('/metrics', REMOTE_ADDR='10.0.0.6', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_multiprocess_snapshots_are_merged(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+                # Simulate another worker that already wrote its snapshot
+                counter = metrics.Counter('softdesk_jwt_refresh_total', '')
+                counter.inc(41)
+                other = {'softdesk_jwt_refresh_total': counter.dump()}
+                with open(os.path.join(directory, f'metrics-{os.getppid()}.json'), 'w') as handle:
+                    json.dump(other, handle)
+
+                merged = metrics.REGISTRY.collect()
+
+        self.assertEqual(merged['softdesk_jwt_refresh_total'][()], metrics.JWT_REFRESH.get() + 41)
+
+    def test_exited_workers_are_folded_into_the_accumulated_snapshot(self):
+        exited = [subprocess.Popen([sys.executable, '-c', '']) for _ in range(2)]
+        for process in exited:
+            process.wait()
+        counter = metrics.Counter('softdesk_jwt_refresh_total', '')
+        counter.inc(41)
+        histogram = metrics.Histogram(
+            'softdesk_db_queries_per_request', '', ('route',), buckets=metrics.DB_QUERIES_PER_REQUEST.buckets
+        )
+        histogram.observe(2, route='batch')
+        snapshot = {'softdesk_jwt_refresh_total': counter.dump(), 'softdesk_db_queries_per_request': histogram.dump()}
+
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+                stale = [os.path.join(directory, f'metrics-{process.pid}.json') for process in exited]
+                with open(stale[0], 'w') as handle:
+                    json.dump(snapshot, handle)
+                before = metrics.REGISTRY.collect()
+                self.assertFalse(os.path.exists(stale[0]))
+
+                # A second worker exits: both stay in the totals
+                with open(stale[1], 'w') as handle:
+                    json.dump(snapshot, handle)
+                after = metrics.REGISTRY.collect()
+                self.assertEqual(
+                    sorted(name for name in os.listdir(directory) if not name.startswith('.')),
+                    sorted([metrics.ACCUMULATED, f'metrics-{os.getpid()}.json'])
+                )
+                self.assertEqual(metrics.REGISTRY.collect(), after)
+
+        refreshes = metrics.JWT_REFRESH.get()
+        self.assertEqual(before['softdesk_jwt_refresh_total'][()], refreshes + 41)
+        self.assertEqual(after['softdesk_jwt_refresh_total'][()], refreshes + 82)
+        own = dict((tuple(key), state) for key, state in metrics.DB_QUERIES_PER_REQUEST.dump()).get(('batch',))
+        exited_state = [2 * count for count in histogram.dump()[0][1]]
+        self.assertEqual(
+            after['softdesk_db_queries_per_request'][('batch',)], metrics.Histogram.merge(own, exited_state)
+        )
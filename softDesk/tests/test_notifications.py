@@ -0,0 +1,191 @@
+"""
+Tests for assignment and comment notifications
+"""
+import smtplib
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from projects import notifications
+from projects.models import Issue, Notification, NotificationEvent
+from tests.fixtures import create_project, create_user
+
+
+@override_settings(NOTIFICATION_DIGEST_DELAY=300, NOTIFICATION_TRANSPORT='projects.notifications.EmailTransport')
+class NotificationTestCase(TestCase):
+    """Events are recorded on the request path, fanned out and sent as digests by the worker"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author', can_be_contacted=True)
+        cls.alice = create_user('alice', can_be_contacted=True)
+        cls.bob = create_user('bob', can_be_contacted=True)
+        cls.quiet = create_user('quiet', can_be_contacted=False)
+        cls.project = create_project(cls.author, contributors=[cls.alice, cls.bob, cls.quiet], name='Desk')
+        cls.issue = Issue.objects.create(
+            title='Crash on login', description='Test', tag='BUG', priority='HIGH',
+            project=cls.project, author=cls.author
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.author)
+        self.comments_url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+
+    def later(self, seconds=301):
+        return timezone.now() + timedelta(seconds=seconds)
+
+    def test_requests_only_record_events(self):
+        response = self.client.patch(
+            f'/api/projects/{self.project.id}/issues/{self.issue.id}/', {'assignee': self.alice.id}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(self.comments_url, {'description': 'Looking into it'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        events = list(NotificationEvent.objects.values_list('kind', 'actor_id', 'assignee_id', 'fanned_out'))
+        self.assertEqual(events, [
+            ('ASSIGNED', self.author.id, self.alice.id, False),
+            ('COMMENTED', self.author.id, None, False),
+        ])
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_assignment_events(self):
+        Issue.objects.create(
+            title='New', description='Test', tag='TASK', priority='LOW',
+            project=self.project, author=self.author, assignee=self.bob
+        )
+        self.issue._changed_by = self.alice
+        self.issue.assignee = self.alice
+        self.issue.save()  # self-assignment
+        self.issue.priority = 'LOW'
+        self.issue.save()  # assignee unchanged
+        self.assertEqual(list(NotificationEvent.objects.values_list('kind', 'assignee_id')), [('ASSIGNED', self.bob.id)])
+
+    def test_fan_out_to_opted_in_contributors_except_the_actor(self):
+        self.client.post(self.comments_url, {'description': 'First'}, format='json')
+        self.issue.assignee = self.quiet
+        self.issue.save()
+        self.assertEqual(notifications.fan_out(), 2)
+        self.assertEqual(notifications.fan_out(), 0)
+
+        recipients = sorted(Notification.objects.values_list('recipient__username', flat=True))
+        self.assertEqual(recipients, ['alice', 'bob'])
+        self.assertFalse(NotificationEvent.objects.filter(fanned_out=False).exists())
+
+    def test_bursts_are_coalesced_into_one_digest(self):
+        for text in ['First', 'Second', 'Third']:
+            self.client.post(self.comments_url, {'description': text}, format='json')
+        self.client.force_authenticate(user=self.alice)
+        self.client.post(self.comments_url, {'description': 'Reply ' + 'x' * 200}, format='json')
+        notifications.fan_out()
+
+        self.assertEqual(notifications.deliver(), 0)
+        self.assertEqual(notifications.deliver(now=self.later()), 3)
+        self.assertEqual(notifications.deliver(now=self.later()), 0)
+
+        messages = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(sorted(messages), ['alice@test.com', 'author@test.com', 'bob@test.com'])
+        bob = messages['bob@test.com']
+        self.assertEqual(bob.subject, 'SoftDesk: 4 new notifications')
+        self.assertIn('author commented on "Crash on login" (Desk): Second', bob.body)
+        self.assertIn('alice commented on "Crash on login" (Desk): Reply xxx', bob.body)
+        self.assertIn('…', bob.body)
+        self.assertEqual(messages['author@test.com'].subject, 'SoftDesk: 1 new notification')
+        self.assertFalse(Notification.objects.filter(sent_time__isnull=True).exists())
+
+    def test_failed_transport_keeps_notifications_pending(self):
+        self.client.post(self.comments_url, {'description': 'First'}, format='json')
+        notifications.fan_out()
+        with mock.patch.object(notifications.EmailTransport, 'send', side_effect=ConnectionError), \
+                self.assertLogs('projects.notifications', 'ERROR'):
+            self.assertEqual(notifications.deliver(now=self.later()), 0)
+        self.assertEqual(Notification.objects.filter(sent_time__isnull=True).count(), 2)
+
+        # Retried after NOTIFICATION_RETRY_DELAY
+        self.assertEqual(notifications.deliver(now=self.later()), 0)
+        self.assertEqual(notifications.deliver(now=self.later(301 + 300)), 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_failing_recipient_does_not_hold_back_the_others(self):
+        self.client.post(self.comments_url, {'description': 'First'}, format='json')
+        notifications.fan_out()
+        send = notifications.EmailTransport.send
+        refused = []
+
+        def refuse_alice(transport, digest):
+            if digest.recipient == self.alice:
+                refused.append(digest)
+                raise smtplib.SMTPRecipientsRefused({'alice@test.com': (550, b'No such user')})
+            send(transport, digest)
+
+        now = self.later()
+        with mock.patch.object(notifications.EmailTransport, 'send', refuse_alice), \
+                self.assertLogs('projects.notifications', 'WARNING') as logs:
+            # Alice comes first in the batch
+            self.assertEqual(notifications.deliver(now=now), 1)
+            for attempt in range(1, 5):
+                # Retried after 300 s, then 600 s, 1200 s and 2400 s
+                delay = timedelta(seconds=300 * 2 ** (attempt - 1))
+                self.assertEqual(notifications.deliver(now=now + delay - timedelta(seconds=1)), 0)
+                self.assertEqual(len(refused), attempt)
+                now += delay
+                self.assertEqual(notifications.deliver(now=now), 0)
+            self.assertEqual(notifications.deliver(now=now + timedelta(days=1)), 0)
+        self.assertEqual(len(refused), 5)
+        self.assertIn('Giving up the notification digest of user', logs.output[-1])
+        self.assertEqual([message.to[0] for message in mail.outbox], ['bob@test.com'])
+        self.assertEqual(
+            list(Notification.objects.filter(sent_time=None).values_list('recipient__username', 'attempts')),
+            [('alice', 5)]
+        )
+
+    def test_partial_failure_resends_only_the_unsent_digests(self):
+        self.client.post(self.comments_url, {'description': 'First'}, format='json')
+        notifications.fan_out()
+        send = notifications.EmailTransport.send
+        calls = []
+
+        def fail_second(transport, digest):
+            calls.append(digest.recipient.username)
+            if len(calls) == 2:
+                raise ConnectionError
+            send(transport, digest)
+
+        with mock.patch.object(notifications.EmailTransport, 'send', fail_second), \
+                self.assertLogs('projects.notifications', 'ERROR'):
+            self.assertEqual(notifications.deliver(now=self.later()), 1)
+        self.assertEqual([message.to[0] for message in mail.outbox], [f'{calls[0]}@test.com'])
+        self.assertFalse(Notification.objects.exclude(sent_time=None).exclude(recipient__username=calls[0]).exists())
+        self.assertFalse(Notification.objects.exclude(claimed_time=None).exists())
+
+        self.assertEqual(notifications.deliver(now=self.later(301 + 300)), 1)
+        self.assertEqual([message.to[0] for message in mail.outbox], [f'{name}@test.com' for name in calls])
+
+    @override_settings(NOTIFICATION_CLAIM_TIMEOUT=600)
+    def test_claims_of_a_dead_worker_are_taken_over(self):
+        self.client.post(self.comments_url, {'description': 'First'}, format='json')
+        notifications.fan_out()
+        # A worker claimed the digests, then died before sending them
+        notifications.claim(notifications.due_digests(now=self.later()), self.later())
+        self.assertFalse(Notification.objects.filter(claimed_time=None).exists())
+
+        self.assertEqual(notifications.deliver(now=self.later()), 0)
+        self.assertEqual(notifications.deliver(now=self.later(301 + 600)), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(Notification.objects.filter(sent_time=None).exists())
+
+    @override_settings(NOTIFICATION_DIGEST_DELAY=0)
+    def test_command(self):
+        self.client.post(self.comments_url, {'description': 'First'}, format='json')
+        out = StringIO()
+        call_command('send_notifications', stdout=out)
+        self.assertIn('1 event(s) fanned out, 2 digest(s) sent', out.getvalue())
+        self.assertEqual(len(mail.outbox), 2)
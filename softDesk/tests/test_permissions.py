@@ -7,6 +7,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from accounts.models import Contributor
 from projects.models import Project, Issue, Comment
+from tests.fixtures import create_user
 
 User = get_user_model()
 
@@ -14,12 +15,11 @@ User = get_user_model()
 class PermissionTestCase(TestCase):
     """Tests pour les permissions selon le cahier des charges"""
     
-    def setUp(self):
-        """Configuration initiale pour les tests"""
-        self.client = APIClient()
-        
+    @classmethod
+    def setUpTestData(cls):
+        """Données partagées par tous les tests de la classe"""
         # Create test users
-        self.author_user = User.objects.create_user(
+        cls.author_user = create_user(
             username='author',
             email='author@test.com',
             password='testpass123',
@@ -28,7 +28,7 @@ class PermissionTestCase(TestCase):
             can_data_be_shared=False
         )
         
-        self.contributor_user = User.objects.create_user(
+        cls.contributor_user = create_user(
             username='contributor', 
             email='contributor@test.com',
             password='testpass123',
@@ -37,7 +37,7 @@ class PermissionTestCase(TestCase):
             can_data_be_shared=True
         )
         
-        self.other_user = User.objects.create_user(
+        cls.other_user = create_user(
             username='other',
             email='other@test.com', 
             password='testpass123',
@@ -47,40 +47,43 @@ class PermissionTestCase(TestCase):
         )
         
         # Create a test project
-        self.project = Project.objects.create(
+        cls.project = Project.objects.create(
             name='Test Project',
             description='A test project',
             type='BACK_END',
-            author=self.author_user
+            author=cls.author_user
         )
         # Note: The AUTHOR contributor is automatically created by Project.save()
         
         # Create additional contributor
         Contributor.objects.create(
-            user=self.contributor_user,
-            project=self.project,
+            user=cls.contributor_user,
+            project=cls.project,
             role='CONTRIBUTOR'
         )
         
         # Create a test issue
-        self.issue = Issue.objects.create(
+        cls.issue = Issue.objects.create(
             title='Test Issue',
             description='A test issue',
             tag='BUG',
             priority='MEDIUM',
             status='TO_DO',
-            project=self.project,
-            author=self.author_user,
-            assignee=self.contributor_user
+            project=cls.project,
+            author=cls.author_user,
+            assignee=cls.contributor_user
         )
         
         # Create a test comment
-        self.comment = Comment.objects.create(
+        cls.comment = Comment.objects.create(
             description='Test comment',
-            issue=self.issue,
-            author=self.contributor_user
+            issue=cls.issue,
+            author=cls.contributor_user
         )
     
+    def setUp(self):
+        self.client = APIClient()
+    
     def test_age_validation_rgpd(self):
         """Test: GDPR age validation (minimum 15 years)"""
         data = {
@@ -0,0 +1,150 @@
+"""
+Tests for the GDPR erasure and data export jobs
+"""
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts import privacy
+from accounts.models import Contributor, PrivacyJob
+from projects.models import Project, Issue, Comment, IssueStatistic
+
+User = get_user_model()
+
+
+@override_settings(PRIVACY_EXPORT_DIR=tempfile.mkdtemp(), PRIVACY_JOB_BATCH_SIZE=2)
+class PrivacyJobTestCase(TestCase):
+    """Tests for DELETE /api/users/{id}/, POST /api/users/{id}/export/ and /api/privacy-jobs/"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.heavy = User.objects.create_user(username='heavy', password='securepass123')
+        self.other = User.objects.create_user(username='other', password='securepass123')
+        self.own_project = Project.objects.create(name='Own', type='BACK_END', author=self.heavy)
+        self.other_project = Project.objects.create(name='Other', type='BACK_END', author=self.other)
+        Contributor.objects.create(user=self.heavy, project=self.other_project)
+        Contributor.objects.create(user=self.other, project=self.own_project)
+
+        for i in range(3):
+            issue = self.create_issue(self.own_project, self.other)
+            Comment.objects.create(description=f'Own {i}', issue=issue, author=self.other)
+            issue = self.create_issue(self.other_project, self.heavy)
+            Comment.objects.create(description=f'Mine {i}', issue=issue, author=self.heavy)
+        self.kept = self.create_issue(self.other_project, self.other, assignee=self.heavy)
+        Comment.objects.create(description='Kept', issue=self.kept, author=self.other)
+        self.client.force_authenticate(user=self.heavy)
+
+    def create_issue(self, project, author, **kwargs):
+        return Issue.objects.create(
+            title='Issue', description='Test', tag='BUG', priority='LOW', project=project, author=author, **kwargs
+        )
+
+    def process_jobs(self):
+        call_command('process_privacy_jobs', stdout=StringIO())
+
+    def test_erasure_runs_off_the_request_path(self):
+        response = self.client.delete(f'/api/users/{self.heavy.id}/')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'PENDING')
+        self.assertTrue(User.objects.filter(pk=self.heavy.pk).exists())
+
+        self.process_jobs()
+        job = PrivacyJob.objects.get(pk=response.data['id'])
+        self.assertEqual((job.status, job.user), ('DONE', None))
+        self.assertEqual(job.processed, job.total)
+
+        self.assertFalse(User.objects.filter(pk=self.heavy.pk).exists())
+        self.assertFalse(Project.objects.filter(pk=self.own_project.pk).exists())
+        self.assertEqual(list(Issue.objects.values_list('pk', flat=True)), [self.kept.pk])
+        self.assertEqual(list(Comment.objects.values_list('description', flat=True)), ['Kept'])
+        self.assertEqual(
+            list(IssueStatistic.objects.filter(count__gt=0).values_list('project_id', 'assignee_id', 'count')),
+            [(self.other_project.pk, None, 1)]
+        )
+
+    def test_job_of_a_stopped_worker_is_taken_over(self):
+        privacy.schedule(self.heavy, 'ERASURE')
+        crashed = timezone.now() - timedelta(seconds=601)
+        # A worker claims the job, erases one batch and dies
+        job = privacy.claim_next(now=crashed)
+        with transaction.atomic():
+            privacy._erase_batch(privacy.erasure_steps(self.heavy)[3][0], 'delete', 2)
+        self.assertEqual(privacy.schedule(self.heavy, 'ERASURE'), job)
+        self.assertIsNone(privacy.claim_next(now=crashed + timedelta(seconds=599)))
+
+        with self.assertLogs('accounts.privacy', 'WARNING'):
+            self.process_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.user, job.processed), ('DONE', None, job.total))
+        self.assertFalse(User.objects.filter(pk=self.heavy.pk).exists())
+        self.assertEqual(list(Comment.objects.values_list('description', flat=True)), ['Kept'])
+
+    def test_heartbeat_keeps_a_running_job_claimed(self):
+        privacy.schedule(self.heavy, 'EXPORT')
+        job = privacy.claim_next(now=timezone.now() - timedelta(seconds=601))
+        privacy._report(job, 1)
+        self.assertIsNone(privacy.claim_next())
+
+    def test_export_taken_over_replaces_the_partial_file(self):
+        privacy.schedule(self.heavy, 'EXPORT')
+        job = privacy.claim_next(now=timezone.now() - timedelta(seconds=601))
+        job.file_name = f'export-{job.pk}-partial.json'
+        job.save(update_fields=['file_name'])
+        with open(privacy.export_path(job), 'w') as output:
+            output.write('{"user": ')
+
+        with self.assertLogs('accounts.privacy', 'WARNING'):
+            self.process_jobs()
+        self.assertFalse(os.path.exists(privacy.export_path(job)))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'DONE')
+        with open(privacy.export_path(job)) as output:
+            self.assertEqual(json.load(output)['user']['username'], 'heavy')
+
+    def test_only_the_owner_can_request_erasure(self):
+        response = self.client.delete(f'/api/users/{self.other.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(PrivacyJob.objects.exists())
+
+    def test_export_streams_personal_data(self):
+        response = self.client.post(f'/api/users/{self.heavy.id}/export/')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_url = f"/api/privacy-jobs/{response.data['id']}/"
+        self.assertIsNone(response.data['download_url'])
+        self.assertEqual(self.client.get(job_url + 'download/').status_code, status.HTTP_409_CONFLICT)
+
+        self.process_jobs()
+        response = self.client.get(job_url)
+        self.assertEqual((response.data['status'], response.data['progress']), ('DONE', 100))
+
+        response = self.client.get(job_url + 'download/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(data['user']['username'], 'heavy')
+        self.assertEqual(len(data['issues']), 3)
+        self.assertEqual(sorted(c['description'] for c in data['comments']), ['Mine 0', 'Mine 1', 'Mine 2'])
+        self.assertEqual(data['assigned_issues'], [self.kept.pk])
+
+    def test_download_of_a_removed_export_is_gone(self):
+        response = self.client.post(f'/api/users/{self.heavy.id}/export/')
+        self.process_jobs()
+        os.remove(privacy.export_path(PrivacyJob.objects.get(pk=response.data['id'])))
+
+        response = self.client.get(f"/api/privacy-jobs/{response.data['id']}/download/")
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual(response.data['detail'], 'Export file is no longer available.')
+
+    def test_jobs_are_private(self):
+        response = self.client.post(f'/api/users/{self.heavy.id}/export/')
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get(f"/api/privacy-jobs/{response.data['id']}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,85 @@
+"""
+Query-plan regression tests of every viewset's list and retrieve endpoints.
+
+The golden plans live in tests/query_plans/. After an intended change to a
+queryset, re-record them with:
+
+    SOFTDESK_UPDATE_QUERY_PLANS=1 python manage.py test tests.test_query_plans
+"""
+import os
+from pathlib import Path
+from unittest import mock, skipIf
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import Contributor, PrivacyJob
+from projects.models import Comment
+from projects.views import IssueViewSet
+from softDesk.queryinspector import QueryPlanAssertionsMixin
+from tests.fixtures import create_project, create_user
+
+
+class QueryPlanTestCase(QueryPlanAssertionsMixin, TestCase):
+    """SQL plans of the read endpoints must not gain full scans or queries"""
+    query_plans_dir = Path(__file__).resolve().parent / 'query_plans'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author', age=30)
+        cls.member = create_user('member', age=30)
+        cls.project = create_project(cls.author, contributors=[cls.member], issues=3, comments_per_issue=2)
+        cls.issue = cls.project.issues.first()
+        cls.issue.assignee = cls.author
+        cls.issue.save()
+        cls.comment = Comment.objects.filter(issue=cls.issue).first()
+        Comment.objects.create(description='Reply', issue=cls.issue, author=cls.member, parent=cls.comment)
+        cls.contributor = Contributor.objects.get(project=cls.project, user=cls.member)
+        cls.job = PrivacyJob.objects.create(user=cls.author, kind='EXPORT')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.author)
+
+    def test_projects(self):
+        self.assertQueryPlansUnchanged('project-list', '/api/projects/')
+        self.assertQueryPlansUnchanged('project-retrieve', f'/api/projects/{self.project.id}/')
+
+    def test_issues(self):
+        url = f'/api/projects/{self.project.id}/issues/'
+        self.assertQueryPlansUnchanged('issue-list', url)
+        self.assertQueryPlansUnchanged('issue-list-include', f'{url}?include=comments,contributors')
+        self.assertQueryPlansUnchanged('issue-retrieve', f'{url}{self.issue.id}/')
+        self.assertQueryPlansUnchanged('issue-history', f'{url}{self.issue.id}/history/')
+        self.assertQueryPlansUnchanged('assigned-issue-list', '/api/issues/assigned/')
+
+    def test_comments(self):
+        url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+        self.assertQueryPlansUnchanged('comment-list', url)
+        self.assertQueryPlansUnchanged('comment-retrieve', f'{url}{self.comment.id}/')
+        self.assertQueryPlansUnchanged('comment-replies', f'{url}{self.comment.id}/replies/')
+
+    def test_contributors(self):
+        url = f'/api/projects/{self.project.id}/users/'
+        self.assertQueryPlansUnchanged('contributor-list', url)
+        self.assertQueryPlansUnchanged('contributor-retrieve', f'{url}{self.contributor.id}/')
+
+    def test_users(self):
+        self.assertQueryPlansUnchanged('user-list', '/api/users/')
+        self.assertQueryPlansUnchanged('user-retrieve', f'/api/users/{self.member.id}/')
+        self.assertQueryPlansUnchanged('user-directory', '/api/users/directory/')
+
+    def test_privacy_jobs(self):
+        self.assertQueryPlansUnchanged('privacy-job-list', '/api/privacy-jobs/')
+        self.assertQueryPlansUnchanged('privacy-job-retrieve', f'/api/privacy-jobs/{self.job.id}/')
+
+    @skipIf(os.environ.get('SOFTDESK_UPDATE_QUERY_PLANS'), 'would record the regressed plans')
+    def test_dropped_select_related_is_reported(self):
+        get_queryset = IssueViewSet.get_queryset
+
+        def without_select_related(view):
+            return get_queryset(view).select_related(None)
+
+        with mock.patch.object(IssueViewSet, 'get_queryset', without_select_related), \
+                mock.patch.object(IssueViewSet, 'use_fast_list', return_value=False):
+            with self.assertRaisesMessage(AssertionError, 'queries instead of'):
+                self.assertQueryPlansUnchanged('issue-list', f'/api/projects/{self.project.id}/issues/')
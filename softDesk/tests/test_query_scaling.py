@@ -0,0 +1,78 @@
+"""
+Tests checking that list endpoints issue a constant number of queries
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from accounts.models import Contributor
+from projects.models import Project, Issue, Comment
+from softDesk.queryinspector import QueryScalingAssertionsMixin, fingerprint
+from tests.fixtures import create_users
+
+User = get_user_model()
+
+
+class QueryScalingTestCase(QueryScalingAssertionsMixin, TestCase):
+    """Query count of list endpoints must not grow with the number of rows"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(
+            username='author', email='author@test.com', password='securepass123', age=25
+        )
+        self.project = Project.objects.create(
+            name='Scaling Project', description='Test', type='BACK_END', author=self.author
+        )
+        self.issue = Issue.objects.create(
+            title='Scaling Issue', description='Test', tag='BUG', priority='LOW',
+            project=self.project, author=self.author
+        )
+        # Every list starts non-empty so both requests run the same statements
+        Comment.objects.create(description='Test', issue=self.issue, author=self.author)
+        self.client.force_authenticate(user=self.author)
+
+    def _add_users(self, count):
+        start = User.objects.count()
+        return create_users(f'user{start + i}' for i in range(count))
+
+    def test_project_list(self):
+        def add_rows():
+            for i in range(5):
+                project = Project.objects.create(name=f'P{i}', type='IOS', author=self.author)
+                for user in self._add_users(2):
+                    Contributor.objects.create(user=user, project=project)
+
+        self.assertQueryCountStable('/api/projects/', add_rows)
+
+    def test_issue_list(self):
+        def add_rows():
+            for i, user in enumerate(self._add_users(5)):
+                Contributor.objects.create(user=user, project=self.project)
+                Issue.objects.create(
+                    title=f'I{i}', description='Test', tag='TASK', priority='HIGH',
+                    project=self.project, author=user, assignee=user
+                )
+
+        self.assertQueryCountStable(f'/api/projects/{self.project.id}/issues/', add_rows)
+
+    def test_comment_list(self):
+        def add_rows():
+            for user in self._add_users(5):
+                Comment.objects.create(description='Test', issue=self.issue, author=user)
+
+        self.assertQueryCountStable(
+            f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/', add_rows
+        )
+
+    def test_contributor_list(self):
+        def add_rows():
+            for user in self._add_users(5):
+                Contributor.objects.create(user=user, project=self.project)
+
+        self.assertQueryCountStable(f'/api/projects/{self.project.id}/users/', add_rows)
+
+    def test_fingerprint_ignores_parameters(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a' AND x IN (%s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'b''c' AND x IN (%s)"),
+        )
@@ -0,0 +1,93 @@
+"""
+Tests for the orjson-backed JSON renderer and parser
+"""
+import datetime
+import decimal
+import io
+import uuid
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from projects.models import Project, Issue, Comment
+from projects.serializers import IssueSerializer, CommentSerializer
+from softDesk.renderers import FastJSONParser, FastJSONRenderer
+
+User = get_user_model()
+
+
+class FastJSONTestCase(TestCase):
+    """FastJSONRenderer output must match DRF's JSONRenderer byte for byte"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='securepass123')
+        self.project = Project.objects.create(name='Jsön ✓', type='BACK_END', author=self.author)
+        self.issue = Issue.objects.create(
+            title='Issue', description='Line separator', tag='BUG', priority='LOW',
+            project=self.project, author=self.author
+        )
+        self.comment = Comment.objects.create(description='Comment', issue=self.issue, author=self.author)
+
+    def assertSameRendering(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_serializer_output(self):
+        self.assertSameRendering(IssueSerializer([self.issue], many=True).data)
+        self.assertSameRendering(CommentSerializer(self.comment).data)
+
+    def test_raw_python_values(self):
+        self.assertSameRendering({
+            'created_time': self.comment.created_time,
+            'naive': datetime.datetime(2025, 1, 2, 3, 4, 5, 6),
+            'day': datetime.date(2025, 1, 2),
+            'id': self.comment.id,
+            'uuid': uuid.UUID(int=1),
+            'duration': datetime.timedelta(minutes=90),
+            'amount': decimal.Decimal('1.5'),
+            'lazy': gettext_lazy('Not found.'),
+            'keys': {1: 'int key'},
+            'nested': [None, True, 1.5, 'é'],
+        })
+
+    def test_values_orjson_rejects_fall_back_to_drf(self):
+        self.assertSameRendering({'big': 2 ** 70, 'negative': -2 ** 64, 'nested': [{'big': 10 ** 30}]})
+
+    def test_integers_beyond_64_bits_are_parsed_by_drf(self):
+        body = b'{"big": 123456789012345678901234567890, "max": 18446744073709551615, "low": -18446744073709551616}'
+        parsed = FastJSONParser().parse(io.BytesIO(body))
+        self.assertEqual(parsed, JSONParser().parse(io.BytesIO(body)))
+        self.assertEqual(parsed, {'big': 123456789012345678901234567890, 'max': 2 ** 64 - 1, 'low': -2 ** 64})
+        self.assertIsInstance(parsed['big'], int)
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"big": 123456789012345678901234567890'))
+
+    def test_non_finite_floats_render_as_null(self):
+        # DRF's strict mode raises ValueError instead
+        self.assertEqual(FastJSONRenderer().render({'nan': float('nan'), 'inf': float('inf')}), b'{"nan":null,"inf":null}')
+
+    def test_indent_falls_back_to_drf(self):
+        rendered = FastJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO('{"title": "é", "n": 1}'.encode())), {'title': 'é', 'n': 1})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"title": '))
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"n": NaN}'))
+
+    def test_api_round_trip(self):
+        client = APIClient()
+        client.force_authenticate(user=self.author)
+        response = client.post(
+            f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/',
+            {'description': 'Créé ✓'}, format='json'
+        )
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['description'], 'Créé ✓')
+        self.assertTrue(response.json()['created_time'].endswith('Z'))
@@ -0,0 +1,41 @@
+"""
+Tests for the start-up profiling helpers and the profile_imports command
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from softDesk.startup import ModuleImport, by_package, parse_importtime, profile_boot
+
+
+class StartupProfileTestCase(SimpleTestCase):
+    """Tests for the -X importtime report"""
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     django.utils.version\n"
+            "import time:       300 |        420 |   django\n"
+            "unrelated line\n"
+            "import time:        80 |         80 | rest_framework.compat\n"
+        )
+        imports = parse_importtime(output)
+        self.assertEqual(imports[0], ModuleImport('django.utils.version', 120, 120, 2))
+        self.assertEqual(imports[1].depth, 1)
+        self.assertEqual(by_package(imports), {'django': 420, 'rest_framework': 80})
+
+    def test_command_profiles_the_api_profile(self):
+        out = StringIO()
+        call_command('profile_imports', profile='softDesk.settings_api', top=3, stdout=out)
+        report = out.getvalue()
+        self.assertIn('softDesk.settings_api: django.setup()', report)
+        self.assertIn('Import time per package:', report)
+
+    def test_lean_boot_skips_admin_sessions_and_static_files(self):
+        imports = {module.name for module in profile_boot('softDesk.settings_api', '/api/projects/').imports}
+        self.assertIn('projects.views', imports)
+        # Imported by the admin autodiscovery (auth/contenttypes admin modules) on the full stack
+        self.assertNotIn('django.contrib.auth.forms', imports)
+        self.assertFalse([
+            name for name in imports if name.startswith(('django.contrib.sessions', 'django.contrib.staticfiles'))
+        ])
@@ -0,0 +1,41 @@
+"""
+Tests for the test infrastructure (FastTestRunner and shared fixtures)
+"""
+import os
+from unittest import mock
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase
+from django.contrib.auth import authenticate
+from softDesk.testing import FastTestRunner
+from tests.fixtures import create_project, create_user, create_users
+
+
+class TestInfrastructureTestCase(TestCase):
+    """The restored template must be fully migrated and the fixtures usable"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author', age=30)
+        cls.members = create_users([f'member{index}' for index in range(50)], age=20)
+        cls.project = create_project(cls.author, cls.members, issues=200, comments_per_issue=2)
+
+    def test_database_is_fully_migrated(self):
+        executor = MigrationExecutor(connection)
+        self.assertEqual(executor.migration_plan(executor.loader.graph.leaf_nodes()), [])
+
+    def test_shared_fixtures(self):
+        self.assertEqual(authenticate(username='member7', password='securepass123'), self.members[7])
+        self.assertEqual(self.project.contributors.count(), 51)
+        self.assertEqual(self.project.issues.count(), 200)
+        self.client.force_login(self.author)
+        response = self.client.get(f'/api/projects/{self.project.id}/stats/')
+        self.assertEqual(response.json()['total'], 200)
+
+    def test_parallel_from_environment(self):
+        with mock.patch.dict(os.environ, {'SOFTDESK_TEST_PARALLEL': '3'}):
+            self.assertEqual(FastTestRunner().parallel, 3)
+            self.assertEqual(FastTestRunner(parallel=2).parallel, 2)
+        with mock.patch.dict(os.environ, {'SOFTDESK_TEST_PARALLEL': ''}):
+            self.assertEqual(FastTestRunner().parallel, 0)
@@ -0,0 +1,223 @@
+"""
+Tests for threaded comment replies
+"""
+import uuid
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from accounts import privacy
+from projects import archive, threads
+from projects.models import ArchivedComment, Comment, Issue, NotificationEvent
+from projects.views import CommentViewSet
+from tests.fixtures import create_project, create_user
+
+
+class ThreadTestCase(TestCase):
+    """Replies, descendant counts, per-thread pagination and the list envelope"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user('author', age=30)
+        cls.member = create_user('member', age=30)
+        cls.project = create_project(cls.author, contributors=[cls.member], name='Desk')
+        cls.issue = Issue.objects.create(
+            title='Crash', description='Test', tag='BUG', priority='LOW', project=cls.project, author=cls.author
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.author)
+        self.url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+
+    def post(self, description, parent=None):
+        data = {'description': description}
+        if parent is not None:
+            data['parent'] = str(parent)
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        return uuid.UUID(response.json()['id'])
+
+    def counts(self):
+        return {comment.description: comment.descendant_count for comment in Comment.objects.all()}
+
+    def build_thread(self):
+        """root <- a <- a1, a2 ; root <- b ; and a second top-level comment"""
+        root = self.post('root')
+        a = self.post('a', root)
+        self.post('a1', a)
+        self.post('a2', a)
+        self.post('b', root)
+        self.post('other')
+        return root, a
+
+    def test_replies_update_descendant_counts(self):
+        root, a = self.build_thread()
+        self.assertEqual(self.counts(), {'root': 4, 'a': 2, 'a1': 0, 'a2': 0, 'b': 0, 'other': 0})
+        a1 = Comment.objects.get(description='a1')
+        self.assertEqual((a1.parent_id, a1.thread_id, a1.path), (a, root, root.hex + a.hex))
+        self.assertEqual(threads.depth(a1), 2)
+
+        response = self.client.delete(f'{self.url}{a}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(), {'root': 3, 'a1': 0, 'a2': 0, 'b': 0, 'other': 0})
+        a1.refresh_from_db()
+        self.assertEqual((a1.parent_id, a1.thread_id, a1.path), (root, root, root.hex))
+
+    def test_deleted_top_level_comment_splits_its_thread(self):
+        root, a = self.build_thread()
+        response = self.client.delete(f'{self.url}{root}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(), {'a': 2, 'a1': 0, 'a2': 0, 'b': 0, 'other': 0})
+        a1 = Comment.objects.get(description='a1')
+        self.assertEqual((a1.parent_id, a1.thread_id, a1.path), (a, a, a.hex))
+
+        data = self.client.get(self.url).json()
+        self.assertEqual([row['description'] for row in data['results']], ['a', 'b', 'other'])
+        data = self.client.get(f'{self.url}{a}/replies/').json()
+        self.assertEqual([row['description'] for row in data['results']], ['a1', 'a2'])
+
+    def test_list_holds_top_level_comments_under_an_envelope(self):
+        root, _ = self.build_thread()
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['issue'], {'id': self.issue.id, 'title': 'Crash'})
+        self.assertEqual(data['project'], {'id': self.project.id, 'name': 'Desk'})
+        self.assertEqual([row['description'] for row in data['results']], ['root', 'other'])
+        self.assertEqual(
+            data['results'][0],
+            {**data['results'][0], 'id': str(root), 'parent': None, 'descendant_count': 4, 'author': 'author'}
+        )
+        self.assertNotIn('issue_title', data['results'][0])
+
+        with mock.patch.object(CommentViewSet, 'use_fast_list', return_value=False):
+            regular = self.client.get(self.url).content
+        self.assertEqual(self.client.get(self.url).content, regular)
+
+    def test_issue_of_another_project_is_not_found(self):
+        outsider = create_user('outsider', age=30)
+        own = create_project(outsider, name='Own project')
+        root = self.post('root')
+        self.client.force_authenticate(user=outsider)
+        url = f'/api/projects/{own.id}/issues/{self.issue.id}/comments/'
+        for path in (url, f'{url}?archived=true', f'{url}{root}/', f'{url}{root}/replies/'):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, path)
+            self.assertNotIn(b'Crash', response.content)
+            self.assertNotIn(b'Desk', response.content)
+        response = self.client.post(url, {'description': 'hi'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        archive.archive_batch([self.issue.id])
+        response = self.client.get(f'{url}?archived=true')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn(b'Crash', response.content)
+
+    def test_replies_are_paginated_per_thread(self):
+        root, a = self.build_thread()
+        response = self.client.get(f'{self.url}{root}/replies/?limit=3')
+        data = response.json()
+        self.assertEqual(data['issue']['title'], 'Crash')
+        self.assertEqual([row['description'] for row in data['results']], ['a', 'a1', 'a2'])
+        self.assertEqual(data['results'][1]['parent'], str(a))
+        self.assertIsNone(data['previous'])
+
+        following = self.client.get(data['next']).json()
+        self.assertEqual([row['description'] for row in following['results']], ['b'])
+        self.assertIsNone(following['next'])
+
+        data = self.client.get(f'{self.url}{a}/replies/').json()
+        self.assertEqual([row['description'] for row in data['results']], ['a1', 'a2'])
+
+        with mock.patch.object(CommentViewSet, 'use_fast_list', return_value=False):
+            regular = self.client.get(f'{self.url}{root}/replies/?limit=3').content
+        self.assertEqual(response.content, regular)
+
+    def test_invalid_parents_are_rejected(self):
+        other_issue = Issue.objects.create(
+            title='Other', description='Test', tag='BUG', priority='LOW', project=self.project, author=self.author
+        )
+        foreign = Comment.objects.create(description='elsewhere', issue=other_issue, author=self.author)
+        response = self.client.post(self.url, {'description': 'x', 'parent': str(foreign.id)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('parent', response.json())
+
+        parent = self.post('level 0')
+        for level in range(1, threads.MAX_DEPTH + 1):
+            parent = self.post(f'level {level}', parent)
+        response = self.client.post(self.url, {'description': 'too deep', 'parent': str(parent)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Comment.objects.get(description='level 0').descendant_count, threads.MAX_DEPTH)
+
+    def test_update_keeps_the_thread(self):
+        root = self.post('root')
+        reply = self.post('reply', root)
+        response = self.client.patch(f'{self.url}{reply}/', {'description': 'edited', 'parent': None}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Comment.objects.get(pk=reply).parent_id, root)
+
+    def test_archived_threads_keep_their_structure(self):
+        root, a = self.build_thread()
+        archive.archive_batch([self.issue.id])
+        self.assertEqual(ArchivedComment.objects.get(pk=root).descendant_count, 4)
+        data = self.client.get(f'{self.url}{a}/replies/?archived=true').json()
+        self.assertEqual([row['description'] for row in data['results']], ['a1', 'a2'])
+        data = self.client.get(f'{self.url}?archived=true').json()
+        self.assertEqual([row['description'] for row in data['results']], ['root', 'other'])
+
+    def test_erasure_recounts_threads(self):
+        root = self.post('root')
+        self.client.force_authenticate(user=self.member)
+        reply = self.post('reply', root)
+        self.client.force_authenticate(user=self.author)
+        self.post('answer', reply)
+        self.post('second', root)
+
+        privacy.run(privacy.schedule(self.member, 'ERASURE'))
+        self.assertEqual(self.counts(), {'root': 2, 'answer': 0, 'second': 0})
+        self.assertEqual(Comment.objects.get(description='answer').parent_id, root)
+
+    def test_erasure_keeps_replies_of_other_users(self):
+        self.client.force_authenticate(user=self.member)
+        root = self.post('root')
+        self.post('member reply', root)
+        self.client.force_authenticate(user=self.author)
+        a = self.post('a', root)
+        self.post('a1', a)
+        self.post('b', root)
+
+        job = privacy.schedule(self.member, 'ERASURE')
+        privacy.run(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.total), ('DONE', job.total, job.total))
+        self.assertEqual(self.counts(), {'a': 1, 'a1': 0, 'b': 0})
+        a1 = Comment.objects.get(description='a1')
+        self.assertEqual((a1.parent_id, a1.thread_id, a1.path), (a, a, a.hex))
+        data = self.client.get(self.url).json()
+        self.assertEqual([row['description'] for row in data['results']], ['a', 'b'])
+
+    def test_rekey_follows_replies(self):
+        root = self.post('root')
+        reply = self.post('reply', root)
+        self.post('answer', reply)
+        legacy = {root: uuid.uuid4(), reply: uuid.uuid4()}
+        for old, new in legacy.items():
+            Comment.objects.filter(pk=old).update(id=new)
+            Comment.objects.filter(parent_id=old).update(parent_id=new)
+            Comment.objects.filter(thread_id=old).update(thread_id=new)
+            NotificationEvent.objects.filter(comment_id=old).update(comment_id=new)
+        for comment in Comment.objects.exclude(parent=None):
+            comment.path = comment.path.replace(root.hex, legacy[root].hex).replace(reply.hex, legacy[reply].hex)
+            comment.save(update_fields=['path'])
+
+        call_command('rekey_comments', stdout=StringIO())
+        answer = Comment.objects.get(description='answer')
+        new_root, new_reply = Comment.objects.get(description='root'), Comment.objects.get(description='reply')
+        self.assertEqual(new_root.id.version, 7)
+        self.assertEqual((answer.parent_id, answer.thread_id), (new_reply.id, new_root.id))
+        self.assertEqual(answer.path, new_root.id.hex + new_reply.id.hex)
+        self.assertEqual(NotificationEvent.objects.filter(comment__description='root').count(), 1)
+        data = self.client.get(f'{self.url}{new_root.id}/replies/').json()
+        self.assertEqual([row['description'] for row in data['results']], ['reply', 'answer'])
@@ -0,0 +1,77 @@
+"""
+Tests for the sliding-window throttles
+"""
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from softDesk.throttling import SlidingWindowStore, get_store
+
+User = get_user_model()
+
+
+class SlidingWindowStoreTestCase(TestCase):
+    """Tests for the SQLite counter store"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SlidingWindowStore(os.path.join(self.directory.name, 'throttle.sqlite3'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_limit_within_a_window(self):
+        for _ in range(3):
+            self.assertEqual(self.store.hit('k', 3, 60, now=600), (True, 0))
+        allowed, wait = self.store.hit('k', 3, 60, now=610)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(4):
+            self.store.hit('k', 4, 60, now=600)
+        # 15s into the next window, 75% of the previous 4 requests still count
+        self.assertTrue(self.store.hit('k', 4, 60, now=675)[0])
+        self.assertFalse(self.store.hit('k', 4, 60, now=675)[0])
+        # 45s in, only 25% of them do
+        self.assertTrue(self.store.hit('k', 4, 60, now=705)[0])
+
+    def test_store_is_shared_between_connections(self):
+        other = SlidingWindowStore(self.store.path)
+        self.store.hit('k', 2, 60, now=600)
+        other.hit('k', 2, 60, now=600)
+        self.assertFalse(self.store.hit('k', 2, 60, now=600)[0])
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_STORE_PATH=None)
+class ThrottleTestCase(TestCase):
+    """Tests for the throttles applied to the authentication endpoints"""
+
+    def setUp(self):
+        get_store().clear()
+        self.client = APIClient()
+        User.objects.create_user(username='throttled', password='securepass123')
+
+    def tearDown(self):
+        get_store().clear()
+
+    def test_login_is_throttled_per_ip(self):
+        credentials = {'username': 'throttled', 'password': 'wrongpass'}
+        for _ in range(10):
+            self.client.post('/api/auth/login/', credentials)
+        response = self.client.post('/api/auth/login/', credentials)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+        # Another client IP has its own budget
+        response = self.client.post('/api/auth/login/', credentials, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_reads_are_not_write_throttled(self):
+        self.client.force_authenticate(user=User.objects.get(username='throttled'))
+        for _ in range(130):
+            response = self.client.get('/api/projects/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,90 @@
+"""
+Tests for the lightweight user directory
+"""
+from django.db.models import Exists, OuterRef, Q, Value
+from django.db.models.functions import Lower
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from accounts.models import Contributor
+from projects.models import Project
+from softDesk.queryinspector import explain, full_scans
+
+User = get_user_model()
+
+
+class UserDirectoryTestCase(TestCase):
+    """Tests for GET /api/users/directory/"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.me = User.objects.create_user(username='me', password='securepass123')
+        self.project = Project.objects.create(name='Shared', type='BACK_END', author=self.me)
+        self.other_project = Project.objects.create(name='Other', type='BACK_END', author=self.me)
+        for name in ('Alice', 'alan', 'bob'):
+            user = User.objects.create_user(username=name, password='securepass123')
+            Contributor.objects.create(user=user, project=self.project)
+        carol = User.objects.create_user(username='carol', password='securepass123')
+        Contributor.objects.create(user=carol, project=self.other_project)
+        User.objects.create_user(username='albert', password='securepass123')
+        self.client.force_authenticate(user=self.me)
+
+    def usernames(self, response):
+        return [user['username'] for user in response.data['results']]
+
+    def test_lists_only_users_sharing_a_project(self):
+        response = self.client.get('/api/users/directory/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.usernames(response), ['alan', 'Alice', 'bob', 'carol', 'me'])
+        self.assertEqual(set(response.data['results'][0]), {'id', 'username'})
+
+    def test_case_insensitive_prefix_search(self):
+        response = self.client.get('/api/users/directory/?search=AL')
+        self.assertEqual(self.usernames(response), ['alan', 'Alice'])
+
+    def test_project_scope(self):
+        response = self.client.get(f'/api/users/directory/?project={self.other_project.id}')
+        self.assertEqual(self.usernames(response), ['carol', 'me'])
+
+        self.client.force_authenticate(user=User.objects.get(username='albert'))
+        response = self.client.get(f'/api/users/directory/?project={self.project.id}')
+        self.assertEqual(self.usernames(response), [])
+
+    def test_cursor_pagination(self):
+        response = self.client.get('/api/users/directory/?limit=2')
+        self.assertEqual(self.usernames(response), ['alan', 'Alice'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(self.usernames(response), ['bob', 'carol'])
+
+    def test_case_variants_straddling_a_page_boundary(self):
+        for name in ('BOB', 'Bob', 'bOb', 'boB'):
+            user = User.objects.create_user(username=name, password='securepass123')
+            Contributor.objects.create(user=user, project=self.project)
+        seen = []
+        url = '/api/users/directory/?limit=2'
+        while url:
+            response = self.client.get(url)
+            seen += self.usernames(response)
+            url = response.data['next']
+        self.assertEqual(seen, ['alan', 'Alice', 'bob', 'BOB', 'Bob', 'bOb', 'boB', 'carol', 'me'])
+
+        response = self.client.get('/api/users/directory/?limit=3&search=b')
+        response = self.client.get(response.data['next'])
+        self.assertEqual(self.usernames(response), ['bOb', 'boB'])
+        response = self.client.get(response.data['previous'])
+        self.assertEqual(self.usernames(response), ['bob', 'BOB', 'Bob'])
+
+    def test_prefix_search_walks_the_username_index(self):
+        projects = Contributor.objects.filter(user=self.me).values('project_id')
+        queryset = User.objects.annotate(username_lower=Lower('username')).filter(
+            Exists(Contributor.objects.filter(user_id=OuterRef('pk'), project_id__in=projects)),
+            username_lower__gte=Lower(Value('al')),
+            username_lower__lt=Lower(Value('al\U0010ffff')),
+        ).order_by('username_lower', 'id')
+        # First page, then a page after a ("alan", id) cursor
+        for page in (queryset, queryset.filter(Q(username_lower__gt='alan') | Q(id__gt=1), username_lower__gte='alan')):
+            plan = explain(*page[:21].query.sql_with_params())
+            self.assertIn('user_username_lower_idx', ' '.join(plan))
+            self.assertEqual(full_scans(plan), [])
+            self.assertNotIn('TEMP B-TREE', ' '.join(plan))